@@ -0,0 +1,6 @@
+"""
+Benchmarks - Performance measurements for the tamper framework
+
+Run the suite with:
+    python -m benchmarks.bench_framework
+"""
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+"""
+AST Nesting Benchmark - Builder scaling with parenthesis depth
+
+Builds ASTs for payloads whose parenthesis nesting grows with depth
+and reports time per token; a flat ns/token column means the builder
+scales linearly with nesting depth.
+
+Usage:
+    python -m benchmarks.bench_ast_nesting
+
+Author: Regaan
+License: GPL v2
+"""
+
+import os
+import sys
+import time
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tamper_framework.lexer import SQLLexer
+from tamper_framework.ast_builder import SQLASTBuilder, reconstruct_from_ast
+
+
+# Deeper trees hit the recursion limit in the recursive-descent parser
+DEPTHS = (25, 50, 100, 200)
+REPEAT = 5
+
+
+def wrapped_select(depth: int) -> str:
+    """Subquery wrapped in redundant parens: SELECT ((((SELECT ...))))"""
+    return "SELECT " + "(" * depth + "SELECT password FROM users" + ")" * depth
+
+
+def nested_subqueries(depth: int) -> str:
+    """Derived tables: SELECT * FROM (SELECT * FROM (...) x) x"""
+    sql = "SELECT id FROM users"
+    for _ in range(depth):
+        sql = f"SELECT * FROM ({sql}) x"
+    return sql
+
+
+def nested_expressions(depth: int) -> str:
+    """Parenthesised arithmetic: SELECT ((((1+1)+1)+1)...)"""
+    return "SELECT " + "(" * depth + "1" + "+1)" * depth
+
+
+def nested_functions(depth: int) -> str:
+    """Function calls: CONCAT(CONCAT(...),0x71)"""
+    return "SELECT " + "CONCAT(" * depth + "0x71" + ",0x71)" * depth
+
+
+SHAPES: Dict[str, Callable[[int], str]] = {
+    'wrapped_select': wrapped_select,
+    'nested_subqueries': nested_subqueries,
+    'nested_expressions': nested_expressions,
+    'nested_functions': nested_functions,
+}
+
+
+def time_build(tokens: list) -> float:
+    """Best-of-REPEAT seconds to build (and reconstruct) one AST"""
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        reconstruct_from_ast(SQLASTBuilder(tokens).build())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'shape':<20} {'depth':>6} {'tokens':>7} {'build µs':>10} {'ns/token':>9}")
+    print('-' * 56)
+
+    for name, shape in SHAPES.items():
+        for depth in DEPTHS:
+            tokens = SQLLexer(shape(depth)).tokenize()
+            seconds = time_build(tokens)
+            print(
+                f"{name:<20} {depth:>6} {len(tokens):>7} "
+                f"{seconds * 1e6:>10,.1f} {seconds * 1e9 / len(tokens):>9,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
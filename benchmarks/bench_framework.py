@@ -0,0 +1,342 @@
+#!/usr/bin/env python
+
+"""
+Framework Benchmarks - Throughput and allocation measurements
+
+Measures every stage of the pipeline (lexer, context tracker, AST
+builder/reconstruction), every transformation rule in isolation and
+every tamper script end to end over the payload corpus.
+
+Reported per benchmark and payload group:
+- payloads/sec (best of several passes)
+- ns/token (time per lexed token of the original payload)
+- alloc KiB (peak traced memory during one pass, via tracemalloc)
+
+Usage:
+    python -m benchmarks.bench_framework
+    python -m benchmarks.bench_framework --save-baseline
+    python -m benchmarks.bench_framework --compare --threshold 0.25
+
+Author: Regaan
+License: GPL v2
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tamper_framework.lexer import SQLLexer, clear_token_cache
+from tamper_framework.context import annotate_tokens_with_context
+from tamper_framework.ast_builder import SQLASTBuilder, reconstruct_from_ast
+from tamper_framework.transformer import TransformationState
+from tamper_framework.transformations import (
+    create_keyword_wrap_rule,
+    create_space_replace_rule,
+    create_case_alternate_rule,
+    create_value_encode_rule
+)
+from benchmarks.corpus import CORPUS
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(ROOT_DIR, 'tamper_scripts')
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Minimum wall time of one timed pass; short groups are looped to reach it
+MIN_PASS_TIME = 0.05
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass
+class Benchmark:
+    """
+    One measured operation
+
+    prepare turns a raw payload into the operation's input outside the
+    timed region; reset runs before every loop over the payloads so
+    that caches never turn the measurement into a lookup benchmark.
+    """
+    name: str
+    func: Callable[[Any], Any]
+    prepare: Callable[[str], Any] = lambda sql: sql
+    reset: Optional[Callable[[], None]] = None
+
+
+@dataclass
+class BenchResult:
+    """Measurement of one benchmark over one payload group"""
+    name: str
+    group: str
+    payloads: int
+    tokens: int
+    payloads_per_sec: float
+    ns_per_token: float
+    alloc_kib: float
+
+
+def _tokens(sql: str) -> list:
+    lexer = SQLLexer(sql)
+    lexer.tokenize()
+    return lexer.tokens
+
+
+def _rule_benchmark(name: str, factory: Callable) -> Benchmark:
+    rule = factory()
+
+    def run(annotated):
+        state = TransformationState()
+        for token, context in annotated:
+            rule.apply(token, context, state)
+
+    return Benchmark(
+        name=f'rule.{name}',
+        func=run,
+        prepare=lambda sql: annotate_tokens_with_context(_tokens(sql)),
+    )
+
+
+def load_tamper_scripts() -> Dict[str, Any]:
+    """Import every script in tamper_scripts/ by file path"""
+    scripts = {}
+
+    for filename in sorted(os.listdir(SCRIPTS_DIR)):
+        if not filename.endswith('.py') or filename.startswith('_'):
+            continue
+
+        name = filename[:-3]
+        spec = importlib.util.spec_from_file_location(
+            f'tamper_scripts.{name}', os.path.join(SCRIPTS_DIR, filename)
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        scripts[name] = module
+
+    return scripts
+
+
+def _script_benchmark(name: str, module) -> Benchmark:
+    # Scripts built on a shared SQLTransformer memoize results; measure
+    # the real work, not cache hits
+    transformer = getattr(module, '_TRANSFORMER', None)
+
+    def reset():
+        clear_token_cache()
+        if transformer is not None and transformer.cache is not None:
+            transformer.cache.clear()
+
+    return Benchmark(name=f'script.{name}', func=module.tamper, reset=reset)
+
+
+def build_benchmarks() -> List[Benchmark]:
+    """Get the full list of framework benchmarks"""
+    benchmarks = [
+        Benchmark(
+            name='lexer.tokenize',
+            func=lambda sql: SQLLexer(sql).tokenize(),
+        ),
+        Benchmark(
+            name='context.annotate',
+            func=annotate_tokens_with_context,
+            prepare=_tokens,
+        ),
+        Benchmark(
+            name='ast.build',
+            func=lambda tokens: SQLASTBuilder(tokens).build(),
+            prepare=_tokens,
+        ),
+        Benchmark(
+            name='ast.reconstruct',
+            func=reconstruct_from_ast,
+            prepare=lambda sql: SQLASTBuilder(_tokens(sql)).build(),
+        ),
+        _rule_benchmark('keyword_wrap', create_keyword_wrap_rule),
+        _rule_benchmark('space_replace', create_space_replace_rule),
+        _rule_benchmark('case_alternate', create_case_alternate_rule),
+        _rule_benchmark('value_encode', create_value_encode_rule),
+    ]
+
+    for name, module in load_tamper_scripts().items():
+        benchmarks.append(_script_benchmark(name, module))
+
+    return benchmarks
+
+
+def _run_pass(benchmark: Benchmark, inputs: list, loops: int) -> float:
+    func = benchmark.func
+    reset = benchmark.reset
+    start = time.perf_counter()
+
+    for _ in range(loops):
+        if reset is not None:
+            reset()
+        for item in inputs:
+            func(item)
+
+    return time.perf_counter() - start
+
+
+def measure(benchmark: Benchmark, group: str, payloads: List[str], repeat: int) -> BenchResult:
+    """Time one benchmark over one payload group"""
+    inputs = [benchmark.prepare(sql) for sql in payloads]
+    tokens = sum(len(_tokens(sql)) for sql in payloads)
+
+    # Calibrate loop count so each pass is long enough to time reliably
+    first = _run_pass(benchmark, inputs, 1)
+    loops = max(1, int(MIN_PASS_TIME / first) if first > 0 else 1)
+    best = min(_run_pass(benchmark, inputs, loops) for _ in range(repeat)) / loops
+
+    # Allocations of a single pass
+    if benchmark.reset is not None:
+        benchmark.reset()
+    tracemalloc.start()
+    try:
+        for item in inputs:
+            benchmark.func(item)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(
+        name=benchmark.name,
+        group=group,
+        payloads=len(payloads),
+        tokens=tokens,
+        payloads_per_sec=len(payloads) / best,
+        ns_per_token=best * 1e9 / tokens,
+        alloc_kib=peak / 1024,
+    )
+
+
+def run_benchmarks(
+    benchmarks: List[Benchmark],
+    corpus: Dict[str, List[str]] = CORPUS,
+    repeat: int = DEFAULT_REPEAT,
+    name_filter: Optional[str] = None
+) -> List[BenchResult]:
+    """Run benchmarks over every payload group of the corpus"""
+    results = []
+
+    for benchmark in benchmarks:
+        if name_filter and name_filter not in benchmark.name:
+            continue
+        for group, payloads in corpus.items():
+            results.append(measure(benchmark, group, payloads, repeat))
+
+    return results
+
+
+def print_results(results: List[BenchResult], baseline: Optional[Dict[str, dict]] = None):
+    """Print results as a table, with change vs baseline if given"""
+    header = f"{'benchmark':<26} {'group':<7} {'payloads/s':>12} {'ns/token':>10} {'alloc KiB':>10}"
+    if baseline is not None:
+        header += f" {'vs base':>8}"
+    print(header)
+    print('-' * len(header))
+
+    for result in results:
+        line = (
+            f"{result.name:<26} {result.group:<7} {result.payloads_per_sec:>12,.0f} "
+            f"{result.ns_per_token:>10,.0f} {result.alloc_kib:>10.1f}"
+        )
+        if baseline is not None:
+            base = baseline.get(_key(result))
+            if base:
+                change = result.payloads_per_sec / base['payloads_per_sec'] - 1
+                line += f" {change:>+8.1%}"
+            else:
+                line += f" {'new':>8}"
+        print(line)
+
+
+def _key(result: BenchResult) -> str:
+    return f'{result.name}/{result.group}'
+
+
+def save_baseline(results: List[BenchResult], path: str = BASELINE_PATH):
+    """Write results (plus machine info) as the baseline JSON"""
+    data = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {_key(result): asdict(result) for result in results},
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, dict]:
+    """Read baseline results keyed by 'name/group'"""
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def find_regressions(
+    results: List[BenchResult],
+    baseline: Dict[str, dict],
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[str]:
+    """Get descriptions of benchmarks slower than baseline by more than threshold"""
+    regressions = []
+
+    for result in results:
+        base = baseline.get(_key(result))
+        if not base:
+            continue
+        change = result.payloads_per_sec / base['payloads_per_sec'] - 1
+        if change < -threshold:
+            regressions.append(
+                f"{_key(result)}: {result.payloads_per_sec:,.0f} payloads/s "
+                f"vs {base['payloads_per_sec']:,.0f} ({change:+.1%})"
+            )
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='timed passes per benchmark (best is kept)')
+    parser.add_argument('--filter', dest='name_filter',
+                        help='only run benchmarks whose name contains this')
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help='baseline JSON path')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='write results to the baseline file')
+    parser.add_argument('--compare', action='store_true',
+                        help='compare against the baseline and fail on regressions')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown fraction in --compare mode (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline) if args.compare else None
+    results = run_benchmarks(build_benchmarks(), repeat=args.repeat, name_filter=args.name_filter)
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\n✓ No regressions beyond {args.threshold:.0%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
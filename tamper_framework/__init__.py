@@ -14,21 +14,69 @@ from tamper_framework.__version__ import (
     __description__
 )
 
-from tamper_framework.lexer import SQLLexer, Token, TokenType
-from tamper_framework.context import (
-    SQLContext,
-    SQLContextTracker,
-    ClauseType,
-    annotate_tokens_with_context
-)
-from tamper_framework.transformer import SQLTransformer, TransformationRule
-from tamper_framework.ast_builder import (
-    ASTNode,
-    NodeType,
-    SQLASTBuilder,
-    reconstruct_from_ast
-)
-from tamper_framework.ast_transformer import ASTTransformer, ASTTransformationRule
+import importlib
+
+# Public names, by defining module. Submodules are imported on first
+# attribute access (PEP 562), so `import tamper_framework` - and every
+# tamper script that only needs the token pipeline - stays cheap.
+_LAZY_MODULES = {
+    'tamper_framework.lexer': (
+        'SQLLexer',
+        'Token',
+        'TokenType',
+        'TokenStream',
+        'tokenize_cached',
+        'stream_tokens',
+        'configure_token_cache',
+        'token_cache_info',
+        'clear_token_cache',
+    ),
+    'tamper_framework.context': (
+        'SQLContext',
+        'SQLContextTracker',
+        'ClauseType',
+        'annotate_tokens_with_context',
+        'iter_tokens_with_context',
+        'intern_context',
+    ),
+    'tamper_framework.transformer': (
+        'SQLTransformer',
+        'TransformationRule',
+        'RuleSpec',
+        'register_transform',
+        'get_transform',
+    ),
+    'tamper_framework.cache': ('LRUCache', 'CacheInfo', 'ValueMemo', 'map_deduplicated'),
+    'tamper_framework.ast_builder': (
+        'ASTNode',
+        'NodeType',
+        'SQLASTBuilder',
+        'reconstruct_from_ast',
+    ),
+    'tamper_framework.ast_transformer': ('ASTTransformer', 'ASTTransformationRule'),
+    'tamper_framework.parallel': ('ParallelTransformer',),
+    'tamper_framework.scanner': ('SpanScanner', 'SpanType', 'Span'),
+}
+
+_LAZY_ATTRIBUTES = {
+    name: module
+    for module, names in _LAZY_MODULES.items()
+    for name in names
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 __all__ = [
     # Version info
@@ -41,16 +89,33 @@ __all__ = [
     'SQLLexer',
     'Token',
     'TokenType',
+    'TokenStream',
+    'tokenize_cached',
+    'stream_tokens',
+    'configure_token_cache',
+    'token_cache_info',
+    'clear_token_cache',
     
     # Context
     'SQLContext',
     'SQLContextTracker',
     'ClauseType',
     'annotate_tokens_with_context',
+    'iter_tokens_with_context',
+    'intern_context',
     
     # Transformer
     'SQLTransformer',
     'TransformationRule',
+    'RuleSpec',
+    'register_transform',
+    'get_transform',
+    
+    # Cache
+    'LRUCache',
+    'CacheInfo',
+    'ValueMemo',
+    'map_deduplicated',
     
     # AST
     'ASTNode',
@@ -59,4 +124,12 @@ __all__ = [
     'reconstruct_from_ast',
     'ASTTransformer',
     'ASTTransformationRule',
+    
+    # Parallel
+    'ParallelTransformer',
+    
+    # Scanner
+    'SpanScanner',
+    'SpanType',
+    'Span',
 ]
@@ -16,7 +16,7 @@ License: GPL v2
 
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from tamper_framework.lexer import Token, TokenType
 
 
@@ -34,6 +34,10 @@ class NodeType(Enum):
     KEYWORD = "KEYWORD"
 
 
+# One bit per node type, for ASTNode.ancestor_types
+NODE_TYPE_FLAGS = {node_type: 1 << index for index, node_type in enumerate(NodeType)}
+
+
 @dataclass
 class ASTNode:
     """
@@ -44,25 +48,41 @@ class ASTNode:
     - Tokens (the actual tokens that make up this node)
     - Children (nested nodes)
     - Parent (for traversal)
+    - Depth and ancestor node types (set by add_child)
     """
     type: NodeType
     tokens: List[Token] = field(default_factory=list)
     children: List['ASTNode'] = field(default_factory=list)
     parent: Optional['ASTNode'] = None
+    depth: int = 0
+    ancestor_types: int = 0  # NODE_TYPE_FLAGS of all ancestors, OR-ed
     
     def add_child(self, child: 'ASTNode'):
-        """Add a child node"""
+        """
+        Add a child node
+        
+        Sets depth and ancestor flags on the child and its subtree. The
+        builder attaches nodes before parsing their contents, so the
+        subtree is normally empty and this is O(1).
+        """
         child.parent = self
         self.children.append(child)
+        
+        stack = [child]
+        while stack:
+            node = stack.pop()
+            parent = node.parent
+            node.depth = parent.depth + 1
+            node.ancestor_types = parent.ancestor_types | NODE_TYPE_FLAGS[parent.type]
+            stack.extend(node.children)
     
     def get_depth(self) -> int:
         """Get nesting depth of this node"""
-        depth = 0
-        node = self.parent
-        while node:
-            depth += 1
-            node = node.parent
-        return depth
+        return self.depth
+    
+    def has_ancestor(self, node_type: NodeType) -> bool:
+        """Check if any enclosing node has the given type"""
+        return bool(self.ancestor_types & NODE_TYPE_FLAGS[node_type])
     
     def is_subquery(self) -> bool:
         """Check if this node is a subquery"""
@@ -87,6 +107,57 @@ class SQLASTBuilder:
         self.tokens = tokens
         self.position = 0
         self.root = ASTNode(type=NodeType.ROOT)
+        self._paren_index: Optional[Tuple[Dict[int, int], Set[int]]] = None
+    
+    @property
+    def paren_index(self) -> Tuple[Dict[int, int], Set[int]]:
+        """Paren matching index, built on first use (see _index_parens)"""
+        if self._paren_index is None:
+            self._paren_index = self._index_parens(self.tokens)
+        return self._paren_index
+    
+    @staticmethod
+    def _index_parens(tokens: List[Token]) -> Tuple[Dict[int, int], Set[int]]:
+        """
+        Match parentheses in one pass over the tokens
+        
+        Returns:
+        - {open index: matching close index} (unmatched opens are absent)
+        - Open indexes whose group contains a SELECT keyword
+        
+        Lets the parser classify and skip a parenthesised group in O(1)
+        instead of rescanning it at every nesting level.
+        """
+        match: Dict[int, int] = {}
+        select_parens: Set[int] = set()
+        stack: List[int] = []
+        
+        # Enum member lookups are slow; hoist them out of the loop
+        lparen = TokenType.LPAREN
+        rparen = TokenType.RPAREN
+        keyword = TokenType.KEYWORD
+        
+        for index, token in enumerate(tokens):
+            token_type = token.type
+            
+            if token_type == lparen:
+                stack.append(index)
+            elif token_type == rparen:
+                if stack:
+                    open_index = stack.pop()
+                    match[open_index] = index
+                    # A SELECT in this group is also inside the enclosing one
+                    if stack and open_index in select_parens:
+                        select_parens.add(stack[-1])
+            elif token_type == keyword and stack and token.value.upper() == 'SELECT':
+                select_parens.add(stack[-1])
+        
+        # Unmatched groups run to the end and so contain everything after them
+        for inner, outer in zip(reversed(stack), reversed(stack[:-1])):
+            if inner in select_parens:
+                select_parens.add(outer)
+        
+        return match, select_parens
     
     def current_token(self) -> Optional[Token]:
         """Get current token"""
@@ -114,14 +185,12 @@ class SQLASTBuilder:
         Returns the root node
         """
         while self.current_token() and self.current_token().type != TokenType.EOF:
-            node = self._parse_statement()
-            if node:
-                self.root.add_child(node)
+            self._parse_statement(self.root)
         
         return self.root
     
-    def _parse_statement(self) -> Optional[ASTNode]:
-        """Parse a SQL statement"""
+    def _parse_statement(self, parent: ASTNode) -> Optional[ASTNode]:
+        """Parse a SQL statement into parent"""
         token = self.current_token()
         
         if not token or token.type == TokenType.EOF:
@@ -129,14 +198,18 @@ class SQLASTBuilder:
         
         # Check for SELECT statement
         if token.type == TokenType.KEYWORD and token.value.upper() == 'SELECT':
-            return self._parse_select_statement()
+            return self._parse_select_statement(parent)
         
         # For now, treat everything else as a clause
-        return self._parse_clause()
+        node = self._parse_clause()
+        parent.add_child(node)
+        return node
     
-    def _parse_select_statement(self) -> ASTNode:
-        """Parse a SELECT statement"""
+    def _parse_select_statement(self, parent: ASTNode) -> ASTNode:
+        """Parse a SELECT statement into parent"""
         node = ASTNode(type=NodeType.SELECT_STATEMENT)
+        # Attach before parsing nested nodes so depth is set top-down
+        parent.add_child(node)
         
         # Parse until we hit EOF or a semicolon
         while self.current_token() and self.current_token().type != TokenType.EOF:
@@ -144,16 +217,12 @@ class SQLASTBuilder:
             
             # Check for subquery (SELECT inside parentheses)
             if token.type == TokenType.LPAREN:
-                subquery = self._parse_subquery()
-                if subquery:
-                    node.add_child(subquery)
+                self._parse_subquery(node)
                 continue
             
             # Check for function call (identifier followed by lparen)
             if token.type == TokenType.IDENTIFIER and self.peek_token() and self.peek_token().type == TokenType.LPAREN:
-                func = self._parse_function_call()
-                if func:
-                    node.add_child(func)
+                node.add_child(self._parse_function_call())
                 continue
             
             # Add token to current node
@@ -166,45 +235,29 @@ class SQLASTBuilder:
         
         return node
     
-    def _parse_subquery(self) -> Optional[ASTNode]:
-        """Parse a subquery (SELECT inside parentheses)"""
-        # Consume opening paren
-        lparen = self.advance()
-        
+    def _parse_subquery(self, parent: ASTNode) -> ASTNode:
+        """Parse a subquery (SELECT inside parentheses) into parent"""
         # Check if this is actually a subquery (contains SELECT)
-        saved_pos = self.position
-        is_subquery = False
-        depth = 1
+        _, select_parens = self.paren_index
+        is_subquery = self.position in select_parens
         
-        while self.current_token() and depth > 0:
-            token = self.current_token()
-            
-            if token.type == TokenType.LPAREN:
-                depth += 1
-            elif token.type == TokenType.RPAREN:
-                depth -= 1
-            elif token.type == TokenType.KEYWORD and token.value.upper() == 'SELECT':
-                is_subquery = True
-                break
-            
-            self.advance()
-        
-        # Restore position
-        self.position = saved_pos
+        # Consume opening paren
+        lparen = self.advance()
         
         if not is_subquery:
             # Not a subquery, just an expression in parentheses
             # Parse as expression
-            return self._parse_expression()
+            node = self._parse_expression()
+            parent.add_child(node)
+            return node
         
         # Parse the subquery
         node = ASTNode(type=NodeType.SUBQUERY)
+        parent.add_child(node)
         node.tokens.append(lparen)
         
         # Parse SELECT statement inside
-        select = self._parse_select_statement()
-        if select:
-            node.add_child(select)
+        self._parse_select_statement(node)
         
         # Consume closing paren
         if self.current_token() and self.current_token().type == TokenType.RPAREN:
@@ -223,20 +276,8 @@ class SQLASTBuilder:
         if self.current_token() and self.current_token().type == TokenType.LPAREN:
             node.tokens.append(self.advance())
         
-        # Parse arguments until closing paren
-        depth = 1
-        while self.current_token() and depth > 0:
-            token = self.current_token()
-            
-            if token.type == TokenType.LPAREN:
-                depth += 1
-            elif token.type == TokenType.RPAREN:
-                depth -= 1
-                if depth == 0:
-                    node.tokens.append(self.advance())
-                    break
-            
-            node.tokens.append(self.advance())
+        # Arguments up to the closing paren
+        self._consume_group(node, self.position - 1)
         
         return node
     
@@ -249,22 +290,18 @@ class SQLASTBuilder:
             node.tokens.append(self.advance())
         
         # Parse until closing paren
-        depth = 1
-        while self.current_token() and depth > 0:
-            token = self.current_token()
-            
-            if token.type == TokenType.LPAREN:
-                depth += 1
-            elif token.type == TokenType.RPAREN:
-                depth -= 1
-                if depth == 0:
-                    node.tokens.append(self.advance())
-                    break
-            
-            node.tokens.append(self.advance())
+        self._consume_group(node, self.position - 1)
         
         return node
     
+    def _consume_group(self, node: ASTNode, open_index: int):
+        """Append tokens up to and including the paren matching open_index"""
+        # Unmatched groups run to the end of the tokens
+        paren_match, _ = self.paren_index
+        end = paren_match.get(open_index, len(self.tokens) - 1)
+        node.tokens.extend(self.tokens[self.position:end + 1])
+        self.position = end + 1
+    
     def _parse_clause(self) -> ASTNode:
         """Parse a generic clause"""
         node = ASTNode(type=NodeType.CLAUSE)
@@ -291,28 +328,42 @@ def reconstruct_from_ast(node: ASTNode) -> str:
     
     CRITICAL: Must maintain proper order of tokens and children
     Children represent nested structures that were parsed out
+    
+    The builder appends a node's tokens and children in source order,
+    so each level is a single merge by position rather than a sort, and
+    the whole tree is written into one buffer.
     """
-    if not node.children:
-        # Leaf node - just return tokens
-        return ''.join(token.value for token in node.tokens)
+    parts: List[str] = []
+    _write_node(node, parts)
+    return ''.join(parts)
+
+
+def _write_node(node: ASTNode, parts: List[str]):
+    """Append a node's text to parts, interleaving children by position"""
+    tokens = node.tokens
     
-    # Node has children - need to interleave properly
-    # Strategy: Build a map of positions and reconstruct in order
-    items = []
+    if not node.children:
+        # Leaf node - just tokens
+        parts.extend(token.value for token in tokens)
+        return
     
-    # Add all tokens with their positions
-    for token in node.tokens:
-        items.append((token.position, token.value))
+    index = 0
+    count = len(tokens)
     
-    # Add all children with their first token's position
     for child in node.children:
-        if child.tokens:
-            first_pos = child.tokens[0].position
-            items.append((first_pos, reconstruct_from_ast(child)))
+        # Children without tokens have no position and are not emitted
+        if not child.tokens:
+            continue
+        
+        # Tokens at or before the child's first token come first
+        first_pos = child.tokens[0].position
+        while index < count and tokens[index].position <= first_pos:
+            parts.append(tokens[index].value)
+            index += 1
+        
+        _write_node(child, parts)
     
-    # Sort by position and concatenate
-    items.sort(key=lambda x: x[0])
-    return ''.join(item[1] for item in items)
+    parts.extend(token.value for token in tokens[index:])
 
 
 if __name__ == "__main__":
@@ -9,8 +9,9 @@ Author: Regaan
 License: GPL v2
 """
 
-from typing import List, Callable
-from tamper_framework.lexer import Token, TokenType, SQLLexer
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from tamper_framework.lexer import Token, TokenType, tokenize_cached
 from tamper_framework.ast_builder import ASTNode, NodeType, SQLASTBuilder, reconstruct_from_ast
 from tamper_framework.context import SQLContext, ClauseType
 
@@ -71,46 +72,179 @@ class ASTTransformer:
     - Knows nesting structure
     - Can transform based on parent/child relationships
     - Better handling of subqueries
+    
+    Profiling: enable_profiling() collects per-stage and per-rule timings
+    through a separate instrumented path (see tamper_framework.profiling).
     """
     
     def __init__(self):
         self.rules: List[ASTTransformationRule] = []
+        self._dispatch: Dict[NodeType, Tuple[ASTTransformationRule, ...]] = None
+        self.stats: Optional['PipelineStats'] = None  # Set by enable_profiling()
     
     def add_rule(self, rule: ASTTransformationRule):
         """Add transformation rule"""
         self.rules.append(rule)
+        self._dispatch = None  # Recompile on next transform
+    
+    def enable_profiling(self) -> 'PipelineStats':
+        """Start collecting per-stage and per-rule timings (returns the stats)"""
+        if self.stats is None:
+            from tamper_framework.profiling import PipelineStats
+            self.stats = PipelineStats()
+        return self.stats
+    
+    def disable_profiling(self) -> Optional['PipelineStats']:
+        """Stop collecting timings and return what was collected"""
+        stats, self.stats = self.stats, None
+        return stats
+    
+    def compile(self) -> Dict[NodeType, Tuple[ASTTransformationRule, ...]]:
+        """
+        Group the registered rules by the node types they can act on
+        
+        Each NodeType maps to its candidate rules in registration order,
+        so a rule restricted to subqueries is never looked at for the
+        tokens of any other node. Called automatically by transform().
+        """
+        self._dispatch = {
+            node_type: tuple(
+                rule for rule in self.rules
+                if not rule.target_node_types or node_type in rule.target_node_types
+            )
+            for node_type in NodeType
+        }
+        return self._dispatch
     
     def transform(self, sql: str) -> str:
         """Transform SQL using AST"""
-        # Tokenize
-        lexer = SQLLexer(sql)
-        tokens = lexer.tokenize()
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self.compile()
+        
+        stats = self.stats
+        if stats is not None:
+            return self._transform_profiled(sql, dispatch, stats)
+        
+        # Tokenize (shared token cache)
+        tokens = tokenize_cached(sql)
         
         # Build AST
         builder = SQLASTBuilder(tokens)
         ast = builder.build()
         
         # Transform AST
-        self._transform_node(ast)
+        self._transform_node(ast, dispatch)
         
         # Reconstruct
         return reconstruct_from_ast(ast)
     
-    def _transform_node(self, node: ASTNode):
+    def _transform_node(
+        self,
+        node: ASTNode,
+        dispatch: Dict[NodeType, Tuple[ASTTransformationRule, ...]]
+    ):
         """Recursively transform a node and its children"""
-        # Transform tokens in this node
-        transformed_tokens = []
-        for token in node.tokens:
-            new_token = token
-            for rule in self.rules:
-                new_token = rule.apply(new_token, node)
-            transformed_tokens.append(new_token)
+        # Node type and depth are the same for every token of the node,
+        # so filter on them once here
+        depth = node.depth
+        rules = [
+            rule for rule in dispatch[node.type]
+            if rule.max_depth is None or depth <= rule.max_depth
+        ]
         
-        node.tokens = transformed_tokens
+        # Transform tokens in this node
+        if rules:
+            transformed_tokens = []
+            for token in node.tokens:
+                new_token = token
+                for rule in rules:
+                    new_token = rule.apply(new_token, node)
+                transformed_tokens.append(new_token)
+            
+            node.tokens = transformed_tokens
         
         # Transform children
         for child in node.children:
-            self._transform_node(child)
+            self._transform_node(child, dispatch)
+    
+    def _transform_profiled(
+        self,
+        sql: str,
+        dispatch: Dict[NodeType, Tuple[ASTTransformationRule, ...]],
+        stats: 'PipelineStats'
+    ) -> str:
+        """Instrumented transform(), used while profiling (same output)"""
+        clock = time.perf_counter
+        
+        start = clock()
+        tokens = tokenize_cached(sql)
+        tokenized = clock()
+        ast = SQLASTBuilder(tokens).build()
+        built = clock()
+        
+        # rule -> [seconds, tokens touched, tokens applied, tokens rewritten,
+        #          memo hits, memo misses] (AST rules are not memoized)
+        counters = {rule: [0.0, 0, 0, 0, 0, 0] for rule in self.rules}
+        self._transform_node_profiled(ast, dispatch, counters)
+        transformed = clock()
+        
+        result = reconstruct_from_ast(ast)
+        finished = clock()
+        
+        stats.record(
+            len(tokens),
+            (
+                ('tokenize', tokenized - start),
+                ('build', built - tokenized),
+                ('rules', transformed - built),
+                ('reconstruct', finished - transformed),
+            ),
+            [(rule.name, *counts) for rule, counts in counters.items()]
+        )
+        return result
+    
+    def _transform_node_profiled(
+        self,
+        node: ASTNode,
+        dispatch: Dict[NodeType, Tuple[ASTTransformationRule, ...]],
+        counters: Dict[ASTTransformationRule, list]
+    ):
+        """_transform_node() with per-rule timing and token counts"""
+        clock = time.perf_counter
+        depth = node.depth
+        rules = [
+            rule for rule in dispatch[node.type]
+            if rule.max_depth is None or depth <= rule.max_depth
+        ]
+        
+        if rules:
+            transformed_tokens = []
+            for token in node.tokens:
+                new_token = token
+                for rule in rules:
+                    start = clock()
+                    if rule.should_transform(new_token, node):
+                        applied = 1
+                        result = rule.transform_func(new_token, node)
+                    else:
+                        applied = 0
+                        result = new_token
+                    counts = counters[rule]
+                    counts[0] += clock() - start
+                    counts[1] += 1
+                    counts[2] += applied
+                    if result is not new_token and (
+                        result.value != new_token.value or result.type is not new_token.type
+                    ):
+                        counts[3] += 1
+                    new_token = result
+                transformed_tokens.append(new_token)
+            
+            node.tokens = transformed_tokens
+        
+        for child in node.children:
+            self._transform_node_profiled(child, dispatch, counters)
 
 
 if __name__ == "__main__":
@@ -120,14 +254,7 @@ if __name__ == "__main__":
         """Wrap keywords, but only in top-level SELECT (not subqueries)"""
         if token.type == TokenType.KEYWORD and node.get_depth() == 1:
             new_value = f'/*!50000{token.value}*/'
-            return Token(
-                id=token.id,
-                type=token.type,
-                value=new_value,
-                position=token.position,
-                line=token.line,
-                column=token.column
-            )
+            return token.with_value(new_value)
         return token
     
     # Create rule that only transforms in top-level SELECT
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+"""
+Cache - Bounded LRU cache for memoizing transformations
+
+sqlmap re-sends many identical payloads (same boundary/prefix combos
+across parameters and retries). Caching lets those skip lexing and
+transformation entirely.
+
+ValueMemo is the per-token counterpart: an unlocked dict for pure rules,
+looked up once per token, where a locked LRU would cost more than the
+transform it saves. map_deduplicated() is the batch counterpart, used
+by the standalone scripts' tamper_many().
+
+Author: Regaan
+License: GPL v2
+"""
+
+from collections import OrderedDict, namedtuple
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional
+
+# Same shape as functools.lru_cache().cache_info()
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+# Distinct payloads remembered by batch transforms before their
+# duplicate table is reset (bounds memory on huge batches)
+BATCH_DEDUPE_SIZE = 65536
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with hit/miss counters
+
+    Features:
+    - Least recently used entry evicted once maxsize is reached
+    - Safe to share between threads (sqlmap --threads)
+    - functools-style cache_info()
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be at least 1, got {maxsize}")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get cached value (marks it most recently used)"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store value, evicting the least recently used entry if full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+class ValueMemo(dict):
+    """
+    Size-bounded memo of token values (value -> transformed value)
+
+    A plain dict, so lookups stay C-speed and are atomic under the GIL;
+    it is cleared when full instead of tracking recency. Meant for small
+    vocabularies such as keywords.
+    """
+
+    __slots__ = ('maxsize',)
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError(f"Memo size must be at least 1, got {maxsize}")
+
+        super().__init__()
+        self.maxsize = maxsize
+
+    def remember(self, value: str, result: str):
+        """Store a result, clearing the memo first if it is full"""
+        if len(self) >= self.maxsize:
+            self.clear()
+        self[value] = result
+
+
+def map_deduplicated(
+    func: Callable[..., Any],
+    items: Iterable[Hashable],
+    kwargs: Optional[Dict[str, Any]] = None
+) -> Iterator[Any]:
+    """
+    Lazily yield func(item, **kwargs) for each item, in input order
+
+    Identical items are computed once; up to BATCH_DEDUPE_SIZE distinct
+    items are remembered at a time.
+    """
+    kwargs = kwargs or {}
+    seen = {}
+
+    for item in items:
+        if item not in seen:
+            if len(seen) >= BATCH_DEDUPE_SIZE:
+                seen.clear()
+            seen[item] = func(item, **kwargs)
+        yield seen[item]
+
+
+if __name__ == "__main__":
+    cache = LRUCache(maxsize=2)
+    cache.put("SELECT 1", "sElEcT 1")
+    cache.put("SELECT 2", "sElEcT 2")
+    cache.get("SELECT 1")
+    cache.put("SELECT 3", "sElEcT 3")  # Evicts "SELECT 2"
+
+    print(f"Contains 'SELECT 2': {'SELECT 2' in cache}")
+    print(cache.cache_info())
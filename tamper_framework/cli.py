@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+
+"""
+Command Line Interface - Tamper payload files without sqlmap
+
+Reads payloads line by line from stdin or a file, runs them through a
+chain of framework rules and/or tamper scripts, and streams the results
+to stdout in input order.
+
+Usage:
+    sqlmap-tamper cloudflare2025 < payloads.txt > tampered.txt
+    sqlmap-tamper keyword_wrap,space_replace -i payloads.txt --stats
+    sqlmap-tamper cloudflare_space,case_alternate -i big.txt -j 8
+    sqlmap-tamper --list
+
+Chain elements are comma-separated and applied left to right. Each is:
+- a framework rule (keyword_wrap, space_replace, case_alternate,
+  value_encode); consecutive rules share a single pipeline pass
+- a script name from tamper_scripts/ (cloudflare2025, cloudflare_space...)
+- a path to any sqlmap-style tamper script (*.py defining tamper())
+
+Author: Regaan
+License: GPL v2
+"""
+
+import argparse
+import importlib.util
+import io
+import os
+import sys
+import time
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from tamper_framework.transformer import SQLTransformer, RuleSpec
+from tamper_framework.transformations import (
+    KEYWORD_WRAP_SPEC,
+    SPACE_REPLACE_SPEC,
+    CASE_ALTERNATE_SPEC,
+    VALUE_ENCODE_SPEC
+)
+from tamper_framework.parallel import ParallelTransformer, DEFAULT_CHUNK_SIZE
+
+
+def _find_scripts_dir() -> str:
+    """Get tamper_scripts/: installed in the package, else in the checkout"""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    installed = os.path.join(package_dir, 'tamper_scripts')
+    if os.path.isdir(installed):
+        return installed
+    return os.path.join(os.path.dirname(package_dir), 'tamper_scripts')
+
+
+SCRIPTS_DIR = _find_scripts_dir()
+
+# Framework rules usable in a chain, by name
+RULE_SPECS: Dict[str, RuleSpec] = {
+    spec.name: spec
+    for spec in (KEYWORD_WRAP_SPEC, SPACE_REPLACE_SPEC, CASE_ALTERNATE_SPEC, VALUE_ENCODE_SPEC)
+}
+
+# Output buffer size; results are written as they are produced
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Tamper scripts loaded so far, by absolute path
+_loaded_scripts: Dict[str, object] = {}
+
+
+def available_scripts() -> List[str]:
+    """Get the names of the scripts in tamper_scripts/"""
+    if not os.path.isdir(SCRIPTS_DIR):
+        return []
+    return sorted(
+        filename[:-3] for filename in os.listdir(SCRIPTS_DIR)
+        if filename.endswith('.py') and not filename.startswith('_')
+    )
+
+
+def resolve_script(name: str) -> Optional[str]:
+    """Get the path of a tamper script name or path (None if not found)"""
+    if name.endswith('.py'):
+        return os.path.abspath(name) if os.path.isfile(name) else None
+
+    path = os.path.join(SCRIPTS_DIR, f'{name}.py')
+    return path if os.path.isfile(path) else None
+
+
+def load_script(path: str):
+    """Import a tamper script by path (once per process)"""
+    module = _loaded_scripts.get(path)
+    if module is None:
+        name = os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(f'tamper_scripts.{name}', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _loaded_scripts[path] = module
+    return module
+
+
+def _script_many(module, payloads: Iterable[str]) -> Iterator[str]:
+    """Batch-apply a script, via tamper_many() when it has one"""
+    tamper_many = getattr(module, 'tamper_many', None)
+    if tamper_many is not None:
+        return tamper_many(payloads)
+    return (module.tamper(payload) for payload in payloads)
+
+
+class TamperChain:
+    """
+    Ordered chain of framework rules and tamper scripts
+
+    Holds only names, rule specs and script paths, so a chain can be
+    pickled and rebuilt in worker processes (see make_chain_factory).
+    Consecutive framework rules are fused into one SQLTransformer.
+    """
+
+    def __init__(self, names: Sequence[str]):
+        # Steps: ('rules', (RuleSpec, ...)) or ('script', path)
+        self.steps = []
+
+        for name in names:
+            spec = RULE_SPECS.get(name)
+            if spec is not None:
+                if self.steps and self.steps[-1][0] == 'rules':
+                    self.steps[-1] = ('rules', self.steps[-1][1] + (spec,))
+                else:
+                    self.steps.append(('rules', (spec,)))
+                continue
+
+            path = resolve_script(name)
+            if path is None:
+                raise ValueError(f"Unknown rule or tamper script: {name!r}")
+            self.steps.append(('script', path))
+
+        if not self.steps:
+            raise ValueError("Empty tamper chain")
+
+        self._stages = None
+
+    def __getstate__(self):
+        # Built pipelines and loaded modules stay in their own process
+        return {'steps': self.steps, '_stages': None}
+
+    def _build(self) -> list:
+        stages = []
+        for kind, value in self.steps:
+            if kind == 'rules':
+                stages.append(SQLTransformer.from_specs(value).transform_many)
+            else:
+                stages.append(partial(_script_many, load_script(value)))
+        return stages
+
+    def transform_many(self, payloads: Iterable[str]) -> Iterator[str]:
+        """Run payloads through every step, yielding results in input order"""
+        if self._stages is None:
+            self._stages = self._build()
+
+        results = payloads
+        for stage in self._stages:
+            results = stage(results)
+        return iter(results)
+
+
+def make_chain_factory(names: Sequence[str]):
+    """Picklable zero-argument factory for ParallelTransformer"""
+    TamperChain(names)  # Fail fast on unknown names
+    return partial(TamperChain, tuple(names))
+
+
+def _open_input(path: str) -> io.TextIOBase:
+    # surrogateescape round-trips payload bytes that are not valid UTF-8
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='surrogateescape')
+    return open(path, encoding='utf-8', errors='surrogateescape')
+
+
+def _open_output(path: str) -> io.TextIOBase:
+    if path == '-':
+        return io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='surrogateescape', newline='\n')
+    return open(path, 'w', encoding='utf-8', errors='surrogateescape', newline='\n',
+                buffering=WRITE_BUFFER_SIZE)
+
+
+def _close(stream: io.TextIOBase, path: str):
+    # Never close the process's own stdin/stdout, only our wrapper
+    if path == '-':
+        stream.detach()
+    else:
+        stream.close()
+
+
+def _read_payloads(stream: io.TextIOBase) -> Iterator[str]:
+    for line in stream:
+        yield line[:-1] if line.endswith('\n') else line
+
+
+def _list_chain_elements():
+    print("Framework rules:")
+    for name in RULE_SPECS:
+        print(f"  {name}")
+    print("\nTamper scripts:")
+    for name in available_scripts():
+        print(f"  {name}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='sqlmap-tamper',
+        description="Apply a chain of tamper rules/scripts to payloads, one per line."
+    )
+    parser.add_argument('chain', nargs='?',
+                        help='comma-separated rules and/or tamper scripts, applied left to right')
+    parser.add_argument('-i', '--input', default='-',
+                        help='payload file (default: stdin)')
+    parser.add_argument('-o', '--output', default='-',
+                        help='output file (default: stdout)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='worker processes (default: 1, 0 = one per CPU)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='payloads per worker task (default: %(default)s)')
+    parser.add_argument('--stats', action='store_true',
+                        help='print a throughput summary to stderr')
+    parser.add_argument('--list', action='store_true',
+                        help='list available rules and tamper scripts')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list:
+        _list_chain_elements()
+        return 0
+    if not args.chain:
+        parser.error("a tamper chain is required (see --list)")
+
+    names = [name.strip() for name in args.chain.split(',') if name.strip()]
+    try:
+        factory = make_chain_factory(names)
+        executor = ParallelTransformer(factory, jobs=args.jobs or None, chunk_size=args.chunk_size)
+    except ValueError as e:
+        parser.error(str(e))
+
+    count = 0
+    start = time.perf_counter()
+
+    try:
+        source = _open_input(args.input)
+    except OSError as e:
+        parser.error(f"cannot read {args.input}: {e.strerror}")
+    try:
+        output = _open_output(args.output)
+    except OSError as e:
+        _close(source, args.input)
+        parser.error(f"cannot write {args.output}: {e.strerror}")
+
+    try:
+        for result in executor.map(_read_payloads(source)):
+            output.write(result)
+            output.write('\n')
+            count += 1
+        output.flush()
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head); stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    finally:
+        _close(source, args.input)
+        _close(output, args.output)
+
+    if args.stats:
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else 0.0
+        print(
+            f"{count:,} payloads in {elapsed:.2f}s ({rate:,.0f} payloads/s), "
+            f"chain={','.join(names)}, jobs={executor.jobs}",
+            file=sys.stderr
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,12 +12,14 @@ License: GPL v2
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import Optional, List
-from tamper_framework.lexer import Token, TokenType
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple, Union
+from tamper_framework.lexer import Token, TokenType, stream_tokens
 
 
 class ClauseType(Enum):
     """SQL clause types"""
+    __hash__ = object.__hash__  # Identity hash, as for TokenType
+    
     UNKNOWN = "UNKNOWN"
     SELECT = "SELECT"
     FROM = "FROM"
@@ -36,7 +38,7 @@ class ClauseType(Enum):
     UNION = "UNION"
 
 
-@dataclass
+@dataclass(frozen=True)
 class SQLContext:
     """
     Represents the current SQL parsing context
@@ -46,6 +48,9 @@ class SQLContext:
     - Nesting depth (for subqueries)
     - Function call depth
     - Parent context (for nested structures)
+    
+    Immutable: the tracker hands out shared, interned instances
+    (see intern_context), so identical states are one object.
     """
     clause: ClauseType
     depth: int  # Parenthesis nesting level
@@ -57,6 +62,36 @@ class SQLContext:
         return f"Context({self.clause.value}, depth={self.depth}, subquery={self.in_subquery})"
 
 
+# Interned contexts keyed by (clause, depth, in_function, in_subquery, id(parent)).
+# Keying on the parent's identity is safe: a pooled context holds a
+# reference to its parent, so the parent cannot be freed and its id reused.
+_CONTEXT_POOL: Dict[tuple, SQLContext] = {}
+CONTEXT_POOL_LIMIT = 4096
+
+
+def intern_context(
+    clause: ClauseType,
+    depth: int,
+    in_function: bool,
+    in_subquery: bool,
+    parent: Optional[SQLContext] = None
+) -> SQLContext:
+    """
+    Get the shared SQLContext for a state
+    
+    Identical states (same clause, depth, flags and parent) map to the
+    same object. Past CONTEXT_POOL_LIMIT entries new states are created
+    without being pooled, so the pool stays bounded.
+    """
+    key = (clause, depth, in_function, in_subquery, id(parent) if parent is not None else None)
+    context = _CONTEXT_POOL.get(key)
+    if context is None:
+        context = SQLContext(clause, depth, in_function, in_subquery, parent)
+        if len(_CONTEXT_POOL) < CONTEXT_POOL_LIMIT:
+            context = _CONTEXT_POOL.setdefault(key, context)
+    return context
+
+
 class SQLContextTracker:
     """
     Tracks SQL context as we process tokens
@@ -99,7 +134,7 @@ class SQLContextTracker:
     }
     
     def __init__(self):
-        self.current_context = SQLContext(
+        self.current_context = intern_context(
             clause=ClauseType.UNKNOWN,
             depth=0,
             in_function=False,
@@ -131,7 +166,7 @@ class SQLContextTracker:
         self.context_stack.append(self.current_context)
         
         # Create new context with increased depth
-        self.current_context = SQLContext(
+        self.current_context = intern_context(
             clause=self.current_context.clause,
             depth=self.current_context.depth + 1,
             in_function=self.current_context.in_function,
@@ -155,7 +190,7 @@ class SQLContextTracker:
             
             # If we see SELECT inside parentheses, it's a subquery
             if keyword == 'SELECT' and self.current_context.depth > 0:
-                self.current_context = SQLContext(
+                self.current_context = intern_context(
                     clause=new_clause,
                     depth=self.current_context.depth,
                     in_function=False,
@@ -164,7 +199,7 @@ class SQLContextTracker:
                 )
             else:
                 # Normal clause change
-                self.current_context = SQLContext(
+                self.current_context = intern_context(
                     clause=new_clause,
                     depth=self.current_context.depth,
                     in_function=self.current_context.in_function,
@@ -174,7 +209,13 @@ class SQLContextTracker:
         
         # Check if it's a function
         elif keyword in self.FUNCTION_KEYWORDS:
-            self.current_context.in_function = True
+            self.current_context = intern_context(
+                clause=self.current_context.clause,
+                depth=self.current_context.depth,
+                in_function=True,
+                in_subquery=self.current_context.in_subquery,
+                parent=self.current_context.parent
+            )
     
     def get_context(self) -> SQLContext:
         """Get current context"""
@@ -197,20 +238,36 @@ class SQLContextTracker:
         return self.current_context.depth
 
 
-def annotate_tokens_with_context(tokens: List[Token]) -> List[tuple[Token, SQLContext]]:
+def iter_tokens_with_context(
+    tokens: Union[str, Iterable[Token]]
+) -> Iterator[Tuple[Token, SQLContext]]:
     """
-    Annotate each token with its SQL context
+    Lazily annotate tokens with their SQL context
     
-    Returns list of (token, context) tuples
+    Yields (token, context) pairs as tokens arrive, so any iterable of
+    tokens (e.g. a generator) streams through without the whole annotated
+    list being held. A SQL string is tokenized through the shared token
+    cache, or lexed lazily when that cache is disabled.
     """
-    tracker = SQLContextTracker()
-    annotated = []
+    if isinstance(tokens, str):
+        tokens = stream_tokens(tokens)
     
+    process_token = SQLContextTracker().process_token
     for token in tokens:
-        context = tracker.process_token(token)
-        annotated.append((token, context))
+        yield token, process_token(token)
+
+
+def annotate_tokens_with_context(
+    tokens: Union[str, Iterable[Token]]
+) -> List[tuple[Token, SQLContext]]:
+    """
+    Annotate each token with its SQL context
+    
+    Accepts tokens, or a SQL string (see iter_tokens_with_context).
     
-    return annotated
+    Returns list of (token, context) tuples
+    """
+    return list(iter_tokens_with_context(tokens))
 
 
 if __name__ == "__main__":
@@ -8,13 +8,21 @@ License: GPL v2
 """
 
 import re
-import uuid
+import itertools
+from array import array
 from enum import Enum
-from dataclasses import dataclass
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from tamper_framework.cache import LRUCache, CacheInfo
+
+# Token IDs are ints from the process-wide counter, or UUID strings in debug mode
+TokenId = Union[int, str]
 
 class TokenType(Enum):
     """SQL token types"""
+    # Members are singletons, so hash by identity: Enum's default hashes
+    # the name in Python code, which slows every per-token set/dict lookup
+    __hash__ = object.__hash__
+    
     KEYWORD = "KEYWORD"
     IDENTIFIER = "IDENTIFIER"
     STRING_LITERAL = "STRING_LITERAL"
@@ -30,15 +38,41 @@ class TokenType(Enum):
     UNKNOWN = "UNKNOWN"
     EOF = "EOF"
 
-@dataclass
-class Token:
+# Process-wide token ID sequence (next() on a count is atomic under the GIL)
+_token_id_sequence = itertools.count(1)
+
+
+def counter_token_id() -> int:
+    """Next monotonic token ID, unique for the lifetime of the process"""
+    return next(_token_id_sequence)
+
+
+def uuid_token_id() -> str:
+    """Random UUID token ID (debug mode: readable, globally unique, slow)"""
+    import uuid  # Debug only; not worth its import time on every startup
+    return str(uuid.uuid4())
+
+
+# Built-in token ID strategies, selectable by name
+TOKEN_ID_STRATEGIES = {
+    'counter': counter_token_id,
+    'uuid': uuid_token_id,
+}
+
+
+class Token(NamedTuple):
     """
     Represents a single SQL token with unique ID
     
-    CRITICAL: Uses UUID for tracking, not position
+    CRITICAL: Uses a unique ID for tracking, not position
     Position can change after transformations
+    
+    Immutable: tokenize_cached() shares one tuple of tokens between all
+    transformers, so rules build new tokens with with_value() instead
+    of assigning fields. A named tuple rather than a frozen dataclass,
+    which would make every token construction several times slower.
     """
-    id: str  # Unique identifier for tracking
+    id: TokenId  # Unique identifier for tracking
     type: TokenType
     value: str
     position: int  # Original position (for reconstruction)
@@ -46,18 +80,145 @@ class Token:
     column: int
     
     def __repr__(self):
-        return f"Token({self.type.value}, {repr(self.value)}, id={self.id[:8]}...)"
+        if isinstance(self.id, str):
+            return f"Token({self.type.value}, {repr(self.value)}, id={self.id[:8]}...)"
+        return f"Token({self.type.value}, {repr(self.value)}, id={self.id})"
+    
+    def with_value(self, value: str) -> 'Token':
+        """Copy of this token with a rewritten value (same ID and location)"""
+        return _new_token(Token, (self.id, self.type, value, self.position, self.line, self.column))
+
+
+# Builds a Token from a field tuple without the keyword-argument
+# handling of Token(...); used on the per-token hot paths
+_new_token = tuple.__new__
+
+
+# Compact type codes used by TokenStream
+_TOKEN_TYPES = tuple(TokenType)
+_TOKEN_TYPE_CODES = {token_type: code for code, token_type in enumerate(_TOKEN_TYPES)}
+
+
+def _pack_ids(ids: list):
+    """Pack token IDs into an int64 array when they fit"""
+    try:
+        return array('q', ids)
+    except (TypeError, OverflowError):
+        # Non-integer IDs (e.g. UUID debug mode) or IDs beyond 64 bits
+        # (e.g. uuid4().int) stay in a list
+        return ids
+
+
+class TokenStream:
+    """
+    Compact struct-of-arrays token store
+    
+    Keeps parallel arrays of type codes, offsets, lengths, lines and
+    columns instead of one Token object per token. Values are sliced
+    lazily from the source string, and rewritten values are kept in a
+    sparse {index: value} map, so rules can rewrite a value without
+    allocating a whole token.
+    
+    The last entry is the EOF token, like SQLLexer.tokenize().
+    """
+    
+    __slots__ = ('sql', 'ids', 'types', 'offsets', 'lengths', 'lines', 'columns', 'rewrites')
+    
+    def __init__(self, sql: str, ids, types: array, offsets: array,
+                 lengths: array, lines: array, columns: array):
+        self.sql = sql
+        self.ids = ids
+        self.types = types
+        self.offsets = offsets
+        self.lengths = lengths
+        self.lines = lines
+        self.columns = columns
+        self.rewrites: Dict[int, str] = {}
+    
+    @classmethod
+    def from_tokens(cls, sql: str, tokens: List[Token]) -> 'TokenStream':
+        """Pack a token list; values that differ from the source become rewrites"""
+        stream = cls(
+            sql,
+            _pack_ids([token.id for token in tokens]),
+            array('B', [_TOKEN_TYPE_CODES[token.type] for token in tokens]),
+            array('l', [token.position for token in tokens]),
+            array('l', [len(token.value) for token in tokens]),
+            array('l', [token.line for token in tokens]),
+            array('l', [token.column for token in tokens]),
+        )
+        
+        for index, token in enumerate(tokens):
+            if sql[token.position:token.position + len(token.value)] != token.value:
+                stream.rewrites[index] = token.value
+        
+        return stream
+    
+    def __len__(self) -> int:
+        return len(self.types)
+    
+    def type(self, index: int) -> TokenType:
+        """Token type at index"""
+        return _TOKEN_TYPES[self.types[index]]
+    
+    def value(self, index: int) -> str:
+        """Current (possibly rewritten) value at index"""
+        rewritten = self.rewrites.get(index)
+        if rewritten is not None:
+            return rewritten
+        offset = self.offsets[index]
+        return self.sql[offset:offset + self.lengths[index]]
+    
+    def rewrite(self, index: int, value: str):
+        """Replace the value at index without materializing a Token"""
+        self.rewrites[index] = value
+    
+    def token(self, index: int) -> Token:
+        """Materialize the token at index"""
+        return Token(
+            self.ids[index],
+            _TOKEN_TYPES[self.types[index]],
+            self.value(index),
+            self.offsets[index],
+            self.lines[index],
+            self.columns[index]
+        )
+    
+    def __getitem__(self, index: int) -> Token:
+        return self.token(index)
+    
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self.types)):
+            yield self.token(index)
+    
+    def reconstruct(self) -> str:
+        """Reconstruct SQL from the stream"""
+        if not self.rewrites:
+            return self.sql  # Tokens cover the source exactly
+        return ''.join(self.value(index) for index in range(len(self.types)))
+
 
 class SQLLexer:
     """
-    SQL lexer with UUID-based token tracking
+    SQL lexer with ID-based token tracking
     
     Features:
     - Each token gets unique ID
+      ('counter' strategy by default, 'uuid' for debugging, or any
+      zero-argument callable returning unique hashable values)
     - Handles escaped quotes in strings
     - Preserves comments
     - Multi-character operator support
     - Line and column tracking
+    
+    Engines:
+    - 'regex' (default): single pass over one compiled master pattern
+    - 'scanner': reference character-by-character scanner
+    
+    Both engines produce the identical token stream. Payloads with
+    non-ASCII characters always go through the scanner, since the
+    str.isalnum()/isdigit() checks it relies on have Unicode semantics
+    the ASCII character classes of the master pattern do not mirror.
     """
     
     # SQL keywords (MySQL/MariaDB focused)
@@ -84,8 +245,35 @@ class SQLLexer:
         '=', '<', '>', '+', '-', '*', '/', '%', '!', '~', '&', '|', '^'
     }
     
-    def __init__(self, sql: str):
+    # Available tokenizer engines
+    ENGINES = ('regex', 'scanner')
+    DEFAULT_ENGINE = 'regex'
+    
+    # Token ID strategy used when none is given
+    DEFAULT_ID_STRATEGY = 'counter'
+    
+    def __init__(
+        self,
+        sql: str,
+        engine: str = None,
+        id_strategy: Union[str, Callable[[], TokenId]] = None
+    ):
+        engine = engine or self.DEFAULT_ENGINE
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown lexer engine: {engine!r} (expected one of {self.ENGINES})")
+        
+        id_strategy = id_strategy or self.DEFAULT_ID_STRATEGY
+        if isinstance(id_strategy, str):
+            if id_strategy not in TOKEN_ID_STRATEGIES:
+                raise ValueError(
+                    f"Unknown token ID strategy: {id_strategy!r} "
+                    f"(expected one of {tuple(TOKEN_ID_STRATEGIES)} or a callable)"
+                )
+            id_strategy = TOKEN_ID_STRATEGIES[id_strategy]
+        
         self.sql = sql
+        self.engine = engine
+        self.new_token_id = id_strategy
         self.position = 0
         self.line = 1
         self.column = 1
@@ -126,6 +314,13 @@ class SQLLexer:
     
     def skip_whitespace(self) -> str:
         """Collect whitespace characters"""
+        token = self.read_whitespace()
+        if token.value:
+            self.tokens.append(token)
+        return token.value
+    
+    def read_whitespace(self) -> Token:
+        """Read a run of whitespace characters"""
         start_pos = self.position
         start_line = self.line
         start_col = self.column
@@ -135,17 +330,14 @@ class SQLLexer:
             whitespace += self.current_char()
             self.advance()
         
-        if whitespace:
-            self.tokens.append(Token(
-                id=str(uuid.uuid4()),
-                type=TokenType.WHITESPACE,
-                value=whitespace,
-                position=start_pos,
-                line=start_line,
-                column=start_col
-            ))
-        
-        return whitespace
+        return Token(
+            id=self.new_token_id(),
+            type=TokenType.WHITESPACE,
+            value=whitespace,
+            position=start_pos,
+            line=start_line,
+            column=start_col
+        )
     
     def read_string_literal(self, quote_char: str) -> Token:
         """Read a string literal with proper escape handling"""
@@ -185,7 +377,7 @@ class SQLLexer:
             self.advance()
         
         return Token(
-            id=str(uuid.uuid4()),
+            id=self.new_token_id(),
             type=TokenType.STRING_LITERAL,
             value=value,
             position=start_pos,
@@ -206,7 +398,7 @@ class SQLLexer:
                 value += self.current_char()
                 self.advance()
             return Token(
-                id=str(uuid.uuid4()),
+                id=self.new_token_id(),
                 type=TokenType.COMMENT,
                 value=value,
                 position=start_pos,
@@ -228,7 +420,7 @@ class SQLLexer:
                 value += self.advance()
             
             return Token(
-                id=str(uuid.uuid4()),
+                id=self.new_token_id(),
                 type=TokenType.COMMENT,
                 value=value,
                 position=start_pos,
@@ -254,7 +446,7 @@ class SQLLexer:
         token_type = TokenType.KEYWORD if value.upper() in self.KEYWORDS else TokenType.IDENTIFIER
         
         return Token(
-            id=str(uuid.uuid4()),
+            id=self.new_token_id(),
             type=token_type,
             value=value,
             position=start_pos,
@@ -274,7 +466,7 @@ class SQLLexer:
             self.advance()
         
         return Token(
-            id=str(uuid.uuid4()),
+            id=self.new_token_id(),
             type=TokenType.NUMBER,
             value=value,
             position=start_pos,
@@ -300,7 +492,7 @@ class SQLLexer:
                 for _ in range(len(op)):
                     self.advance()
                 return Token(
-                    id=str(uuid.uuid4()),
+                    id=self.new_token_id(),
                     type=TokenType.OPERATOR,
                     value=value,
                     position=start_pos,
@@ -312,7 +504,7 @@ class SQLLexer:
         value = self.current_char()
         self.advance()
         return Token(
-            id=str(uuid.uuid4()),
+            id=self.new_token_id(),
             type=TokenType.OPERATOR,
             value=value,
             position=start_pos,
@@ -322,134 +514,335 @@ class SQLLexer:
     
     def tokenize(self) -> List[Token]:
         """Tokenize the entire SQL query"""
-        self.tokens = []
+        self.tokens = list(self.iter_tokens())
+        return self.tokens
+    
+    def iter_tokens(self) -> Iterator[Token]:
+        """
+        Yield tokens one at a time, ending with EOF
+        
+        Consumers (the context tracker, the rule pipeline) can start on
+        the first token right away and stop early; tokens are not
+        collected into self.tokens.
+        """
+        if self.engine == 'regex' and self.sql.isascii():
+            return self._iter_regex()
+        return self._iter_scanner()
+    
+    def tokenize_stream(self) -> TokenStream:
+        """
+        Tokenize into a compact TokenStream
+        
+        The regex engine fills the arrays directly, without creating
+        Token objects.
+        """
+        if not (self.engine == 'regex' and self.sql.isascii()):
+            return TokenStream.from_tokens(self.sql, self.tokenize())
+        
+        keywords = self.KEYWORDS
+        group_codes = _GROUP_CODES
+        identifier = _TOKEN_TYPE_CODES[TokenType.IDENTIFIER]
+        keyword = _TOKEN_TYPE_CODES[TokenType.KEYWORD]
+        new_token_id = self.new_token_id
+        ids = []
+        types = array('B')
+        offsets = array('l')
+        lengths = array('l')
+        lines = array('l')
+        columns = array('l')
+        line = 1
+        column = 1
+        
+        for match in _MASTER_PATTERN.finditer(self.sql):
+            value = match.group()
+            code = group_codes[match.lastgroup]
+            if code == identifier and value.upper() in keywords:
+                code = keyword
+            
+            ids.append(new_token_id())
+            types.append(code)
+            offsets.append(match.start())
+            lengths.append(len(value))
+            lines.append(line)
+            columns.append(column)
+            
+            newlines = value.count('\n')
+            if newlines:
+                line += newlines
+                column = len(value) - value.rfind('\n')
+            else:
+                column += len(value)
+        
+        # EOF
+        ids.append(new_token_id())
+        types.append(_TOKEN_TYPE_CODES[TokenType.EOF])
+        offsets.append(len(self.sql))
+        lengths.append(0)
+        lines.append(line)
+        columns.append(column)
+        
+        return TokenStream(self.sql, _pack_ids(ids), types, offsets, lengths, lines, columns)
+    
+    def _iter_regex(self) -> Iterator[Token]:
+        """
+        Tokenize with the compiled master pattern
+        
+        Every alternative of _MASTER_PATTERN mirrors one branch of the
+        scanner, in the same priority order, and the last alternative
+        matches any single character, so finditer() yields contiguous
+        matches covering the whole payload.
+        """
+        keywords = self.KEYWORDS
+        group_types = _GROUP_TYPES
+        new_token_id = self.new_token_id
+        new_token = _new_token
+        line = self.line
+        column = self.column
+        
+        for match in _MASTER_PATTERN.finditer(self.sql, self.position):
+            value = match.group()
+            token_type = group_types[match.lastgroup]
+            if token_type is TokenType.IDENTIFIER and value.upper() in keywords:
+                token_type = TokenType.KEYWORD
+            
+            yield new_token(Token, (new_token_id(), token_type, value, match.start(), line, column))
+            
+            newlines = value.count('\n')
+            if newlines:
+                line += newlines
+                column = len(value) - value.rfind('\n')
+            else:
+                column += len(value)
         
+        self.position = len(self.sql)
+        self.line = line
+        self.column = column
+        
+        yield Token(
+            id=self.new_token_id(),
+            type=TokenType.EOF,
+            value='',
+            position=self.position,
+            line=line,
+            column=column
+        )
+    
+    def _iter_scanner(self) -> Iterator[Token]:
+        """Tokenize character by character (reference engine)"""
         while self.current_char():
             char = self.current_char()
             
             # Whitespace
             if char in ' \t\n\r':
-                self.skip_whitespace()
+                yield self.read_whitespace()
                 continue
             
             # String literals
             if char in ('"', "'"):
-                self.tokens.append(self.read_string_literal(char))
+                yield self.read_string_literal(char)
                 continue
             
             # Comments
             if char == '-' and self.peek_char() == '-':
-                self.tokens.append(self.read_comment())
+                yield self.read_comment()
                 continue
             
             if char == '/' and self.peek_char() == '*':
-                self.tokens.append(self.read_comment())
+                yield self.read_comment()
                 continue
             
             # Numbers
             if char.isdigit():
-                self.tokens.append(self.read_number())
+                yield self.read_number()
                 continue
             
             # Identifiers and keywords
             if char.isalpha() or char == '_':
-                self.tokens.append(self.read_identifier_or_keyword())
+                yield self.read_identifier_or_keyword()
                 continue
             
             # Special characters
             if char == '(':
-                self.tokens.append(Token(
-                    id=str(uuid.uuid4()),
+                yield Token(
+                    id=self.new_token_id(),
                     type=TokenType.LPAREN,
                     value=char,
                     position=self.position,
                     line=self.line,
                     column=self.column
-                ))
+                )
                 self.advance()
                 continue
             
             if char == ')':
-                self.tokens.append(Token(
-                    id=str(uuid.uuid4()),
+                yield Token(
+                    id=self.new_token_id(),
                     type=TokenType.RPAREN,
                     value=char,
                     position=self.position,
                     line=self.line,
                     column=self.column
-                ))
+                )
                 self.advance()
                 continue
             
             if char == ',':
-                self.tokens.append(Token(
-                    id=str(uuid.uuid4()),
+                yield Token(
+                    id=self.new_token_id(),
                     type=TokenType.COMMA,
                     value=char,
                     position=self.position,
                     line=self.line,
                     column=self.column
-                ))
+                )
                 self.advance()
                 continue
             
             if char == ';':
-                self.tokens.append(Token(
-                    id=str(uuid.uuid4()),
+                yield Token(
+                    id=self.new_token_id(),
                     type=TokenType.SEMICOLON,
                     value=char,
                     position=self.position,
                     line=self.line,
                     column=self.column
-                ))
+                )
                 self.advance()
                 continue
             
             if char == '.':
-                self.tokens.append(Token(
-                    id=str(uuid.uuid4()),
+                yield Token(
+                    id=self.new_token_id(),
                     type=TokenType.DOT,
                     value=char,
                     position=self.position,
                     line=self.line,
                     column=self.column
-                ))
+                )
                 self.advance()
                 continue
             
             # Operators (check this AFTER special chars)
             if char in '=<>!+-*/%&|^~':
-                self.tokens.append(self.read_operator())
+                yield self.read_operator()
                 continue
             
             # Unknown character
-            self.tokens.append(Token(
-                id=str(uuid.uuid4()),
+            yield Token(
+                id=self.new_token_id(),
                 type=TokenType.UNKNOWN,
                 value=char,
                 position=self.position,
                 line=self.line,
                 column=self.column
-            ))
+            )
             self.advance()
         
         # Add EOF token
-        self.tokens.append(Token(
-            id=str(uuid.uuid4()),
+        yield Token(
+            id=self.new_token_id(),
             type=TokenType.EOF,
             value='',
             position=self.position,
             line=self.line,
             column=self.column
-        ))
-        
-        return self.tokens
+        )
     
-    def reconstruct(self, tokens: List[Token]) -> str:
+    @staticmethod
+    def reconstruct(tokens: List[Token]) -> str:
         """Reconstruct SQL from tokens"""
         return ''.join(token.value for token in tokens if token.type != TokenType.EOF)
 
 
+# Process-wide token cache: payload -> immutable token tuple
+TOKEN_CACHE_SIZE = 1024
+_token_cache: Optional[LRUCache] = LRUCache(TOKEN_CACHE_SIZE)
+
+
+def tokenize_cached(sql: str) -> Tuple[Token, ...]:
+    """
+    Tokenize through the process-wide token cache
+    
+    SQLTransformer, ASTTransformer and annotate_tokens_with_context all
+    consult this cache, so each distinct payload is lexed once per process
+    (while it stays in the cache).
+    
+    The returned tuple is shared between callers; tokens are immutable,
+    so transformations build new ones with Token.with_value().
+    """
+    cache = _token_cache
+    if cache is None:
+        return tuple(SQLLexer(sql).tokenize())
+    
+    tokens = cache.get(sql)
+    if tokens is None:
+        tokens = tuple(SQLLexer(sql).tokenize())
+        cache.put(sql, tokens)
+    
+    return tokens
+
+
+def stream_tokens(sql: str) -> Iterable[Token]:
+    """
+    Tokens of sql for a streaming consumer
+    
+    The cached tuple when the token cache is enabled (the payload is then
+    lexed once per process), otherwise a lazy SQLLexer.iter_tokens()
+    generator so work can start on the first token.
+    """
+    if _token_cache is None:
+        return SQLLexer(sql).iter_tokens()
+    return tokenize_cached(sql)
+
+
+def configure_token_cache(maxsize: Optional[int]):
+    """Resize the token cache (0 or None disables it); drops cached entries"""
+    global _token_cache
+    _token_cache = LRUCache(maxsize) if maxsize else None
+
+
+def token_cache_info() -> Optional[CacheInfo]:
+    """Get token cache statistics (None if disabled)"""
+    cache = _token_cache
+    return cache.cache_info() if cache is not None else None
+
+
+def clear_token_cache():
+    """Drop all cached token streams"""
+    cache = _token_cache
+    if cache is not None:
+        cache.clear()
+
+
+# Master pattern for the regex engine. Alternatives are ordered exactly
+# like the branches of SQLLexer._tokenize_scanner():
+# - strings: backslash escapes any character, doubled quotes stay inside,
+#   an unterminated literal runs to the end (keeping a trailing backslash)
+# - comments: '--' up to the newline, '/*' up to '*/' or end of input
+# - numbers start with a digit and continue over digits and dots
+# - multi-character operators are tried before single characters
+_MASTER_PATTERN = re.compile(r"""
+    (?P<WHITESPACE>[ \t\n\r]+)
+  | (?P<STRING_LITERAL>
+        '(?:[^'\\]|\\[\s\S]|'')*(?:'|\\)?
+      | "(?:[^"\\]|\\[\s\S]|"")*(?:"|\\)?
+    )
+  | (?P<COMMENT>--[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<NUMBER>[0-9][0-9.]*)
+  | (?P<IDENTIFIER>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<LPAREN>\()
+  | (?P<RPAREN>\))
+  | (?P<COMMA>,)
+  | (?P<SEMICOLON>;)
+  | (?P<DOT>\.)
+  | (?P<OPERATOR><=|>=|<>|!=|\|\||&&|<<|>>|[=<>!+\-*/%&|^~])
+  | (?P<UNKNOWN>[\s\S])
+""", re.VERBOSE)
+
+_GROUP_TYPES = {name: TokenType[name] for name in _MASTER_PATTERN.groupindex}
+_GROUP_CODES = {name: _TOKEN_TYPE_CODES[token_type] for name, token_type in _GROUP_TYPES.items()}
+
+
 if __name__ == "__main__":
     # Test multi-character operators
     test_queries = [
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+"""
+Parallel Transformer - Multi-process batch transformation
+
+The lexer and rules are pure Python, so one process saturates one core.
+For offline corpus generation, ParallelTransformer shards payloads into
+chunks and runs them through SQLTransformer.transform_many() in a pool
+of worker processes, yielding results in input order.
+
+Workers do not receive the transformer itself (it holds a lock and may
+hold closures). They receive a picklable pipeline factory - a module-
+level function such as cloudflare2025.build_transformer, or the rule
+specs via ParallelTransformer.from_specs() - and build their own copy
+once at startup.
+
+Author: Regaan
+License: GPL v2
+"""
+
+import os
+from collections import deque
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from tamper_framework.transformer import SQLTransformer, RuleSpec
+
+
+# Payloads per task: large enough to amortise pickling and IPC,
+# small enough to keep every worker busy until the end of the input
+DEFAULT_CHUNK_SIZE = 512
+
+# Pipeline built by the pool initializer in each worker process
+_worker_transformer: Optional[SQLTransformer] = None
+
+
+def _init_worker(pipeline_factory: Callable[[], SQLTransformer]):
+    """Build the worker's pipeline once, when the process starts"""
+    global _worker_transformer
+    _worker_transformer = pipeline_factory()
+
+
+def _transform_chunk(chunk: List[str]) -> List[str]:
+    """Transform one chunk of payloads in a worker"""
+    return list(_worker_transformer.transform_many(chunk))
+
+
+def _chunks(payloads: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(payloads)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_payload_file(path: str, encoding: str = 'utf-8') -> Iterator[str]:
+    """Read payloads from a file, one per line (line endings stripped)"""
+    with open(path, encoding=encoding) as f:
+        for line in f:
+            yield line[:-1] if line.endswith('\n') else line
+
+
+class ParallelTransformer:
+    """
+    Process-pool executor for SQLTransformer pipelines
+
+    Features:
+    - Chunked batching through transform_many() in each worker
+    - Output in input order, streamed as chunks complete
+    - Bounded number of chunks in flight (memory stays flat on
+      arbitrarily long inputs)
+    - jobs=1 runs in-process with no pool at all
+    """
+
+    def __init__(
+        self,
+        pipeline_factory: Callable[[], SQLTransformer],
+        jobs: int = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        if jobs is not None and jobs < 1:
+            raise ValueError(f"jobs must be at least 1, got {jobs}")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+
+        self.pipeline_factory = pipeline_factory
+        self.jobs = jobs or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # Two chunks per worker: one running, one queued
+        self.max_pending = self.jobs * 2
+
+    @classmethod
+    def from_specs(
+        cls,
+        specs: Iterable[RuleSpec],
+        jobs: int = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> 'ParallelTransformer':
+        """Run a pipeline described by rule specs (shipped to workers as data)"""
+        factory = partial(SQLTransformer.from_specs, tuple(specs))
+        return cls(factory, jobs=jobs, chunk_size=chunk_size)
+
+    def map(self, payloads: Iterable[str]) -> Iterator[str]:
+        """Transform payloads, yielding results in input order"""
+        if self.jobs == 1:
+            yield from self.pipeline_factory().transform_many(payloads)
+            return
+
+        # Imported here: multiprocessing is slow to import and jobs=1 never needs it
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_worker,
+            initargs=(self.pipeline_factory,)
+        ) as executor:
+            pending = deque()
+
+            for chunk in _chunks(payloads, self.chunk_size):
+                pending.append(executor.submit(_transform_chunk, chunk))
+                if len(pending) >= self.max_pending:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+
+    def map_file(self, path: str, encoding: str = 'utf-8') -> Iterator[str]:
+        """Transform a payload file (one payload per line) in order"""
+        return self.map(iter_payload_file(path, encoding))
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tamper_scripts'))
+    from cloudflare2025 import build_transformer
+
+    payloads = [f"SELECT * FROM users WHERE id>={i}" for i in range(5)]
+
+    for result in ParallelTransformer(build_transformer, jobs=2, chunk_size=2).map(payloads):
+        print(result)
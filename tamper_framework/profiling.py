@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+
+"""
+Profiling - Opt-in per-stage and per-rule instrumentation
+
+Transformers collect nothing by default. enable_profiling() attaches a
+PipelineStats, and from then on payloads go through a separate
+instrumented path that times each pipeline stage (tokenize, context,
+rules, reconstruct...) and each rule, and counts the tokens each rule
+was given (touched), accepted (applied) and actually changed
+(rewritten). A rule with a low applied/touched ratio spends most of its
+time rejecting tokens; in adaptive mode, SQLTransformer also counts the
+payloads on which it skipped a rule entirely. For pure rules, memo hits
+and misses show how often a transformed value was reused.
+
+The instrumented path materializes every stage so it can be timed on
+its own, so absolute times are slightly higher than in the streaming
+path. Use the numbers to compare stages and rules, not as throughput.
+
+Author: Regaan
+License: GPL v2
+"""
+
+import json
+from threading import Lock
+from typing import Any, Dict, Iterable, Tuple
+
+
+class StageStats:
+    """Cumulative wall time of one pipeline stage"""
+
+    __slots__ = ('calls', 'seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'calls': self.calls, 'seconds': self.seconds}
+
+
+class RuleStats:
+    """Cumulative wall time and token counts of one rule"""
+
+    __slots__ = (
+        'calls', 'skipped', 'seconds', 'tokens_touched', 'tokens_applied', 'tokens_rewritten',
+        'memo_hits', 'memo_misses'
+    )
+
+    def __init__(self):
+        self.calls = 0              # Payloads the rule ran on
+        self.skipped = 0            # Payloads adaptive mode skipped it on
+        self.seconds = 0.0
+        self.tokens_touched = 0     # Tokens dispatched to the rule (evaluated)
+        self.tokens_applied = 0     # Tokens that passed its checks
+        self.tokens_rewritten = 0   # Tokens whose value or type it changed
+        self.memo_hits = 0          # Applied tokens served from its memo (pure rules)
+        self.memo_misses = 0        # Applied tokens it computed (pure rules)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of evaluated tokens the rule was applied to"""
+        return self.tokens_applied / self.tokens_touched if self.tokens_touched else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'skipped': self.skipped,
+            'seconds': self.seconds,
+            'tokens_touched': self.tokens_touched,
+            'tokens_applied': self.tokens_applied,
+            'tokens_rewritten': self.tokens_rewritten,
+            'hit_rate': self.hit_rate,
+            'memo_hits': self.memo_hits,
+            'memo_misses': self.memo_misses,
+        }
+
+
+class PipelineStats:
+    """
+    Profiling results of a transformer
+
+    Stages and rules are keyed by name, in the order first seen. Each
+    payload's measurements are merged in one locked step, so a profiled
+    transformer can still be shared between threads.
+    """
+
+    def __init__(self):
+        self.payloads = 0
+        self.tokens = 0
+        self.stages: Dict[str, StageStats] = {}
+        self.rules: Dict[str, RuleStats] = {}
+        self._lock = Lock()
+
+    def record(
+        self,
+        tokens: int,
+        stages: Iterable[Tuple[str, float]],
+        rules: Iterable[Tuple[str, float, int, int, int, int, int]],
+        skipped: Iterable[str] = ()
+    ):
+        """
+        Merge the measurements of one payload
+
+        stages: (name, seconds) pairs
+        rules: (name, seconds, tokens touched, tokens applied,
+            tokens rewritten, memo hits, memo misses) tuples
+        skipped: names of rules not run on this payload
+        """
+        with self._lock:
+            self.payloads += 1
+            self.tokens += tokens
+
+            for name, seconds in stages:
+                stage = self.stages.get(name)
+                if stage is None:
+                    stage = self.stages[name] = StageStats()
+                stage.calls += 1
+                stage.seconds += seconds
+
+            for name, seconds, touched, applied, rewritten, memo_hits, memo_misses in rules:
+                rule = self._rule(name)
+                rule.calls += 1
+                rule.seconds += seconds
+                rule.tokens_touched += touched
+                rule.tokens_applied += applied
+                rule.tokens_rewritten += rewritten
+                rule.memo_hits += memo_hits
+                rule.memo_misses += memo_misses
+
+            for name in skipped:
+                self._rule(name).skipped += 1
+
+    def _rule(self, name: str) -> RuleStats:
+        """Get the stats of a rule, creating them on first use"""
+        rule = self.rules.get(name)
+        if rule is None:
+            rule = self.rules[name] = RuleStats()
+        return rule
+
+    def reset(self):
+        """Drop all measurements"""
+        with self._lock:
+            self.payloads = 0
+            self.tokens = 0
+            self.stages.clear()
+            self.rules.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get all measurements as plain data"""
+        with self._lock:
+            return {
+                'payloads': self.payloads,
+                'tokens': self.tokens,
+                'stages': {name: stage.to_dict() for name, stage in self.stages.items()},
+                'rules': {name: rule.to_dict() for name, rule in self.rules.items()},
+            }
+
+    def to_json(self, indent: int = 2) -> str:
+        """Get all measurements as a JSON document"""
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tamper_scripts'))
+    from cloudflare2025 import build_transformer
+
+    transformer = build_transformer()
+    stats = transformer.enable_profiling()
+
+    for i in range(100):
+        transformer.transform(f"SELECT * FROM users WHERE id>={i} AND name='admin'")
+
+    print(stats.to_json())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+"""
+Span Scanner - Quote/comment-aware scanning for standalone scripts
+
+The standalone tamper scripts work on raw payload strings, not tokens.
+Instead of walking the payload character by character and tracking
+quote state by hand, they can split it into code, string and comment
+spans with one compiled regex, and rewrite only the code spans.
+
+Quoting follows the standalone scripts: a quote preceded by a backslash
+neither opens nor closes a string, and unterminated strings and
+comments run to the end of the payload.
+
+Author: Regaan
+License: GPL v2
+"""
+
+import re
+from collections import namedtuple
+from enum import Enum
+from typing import Callable, List, Union
+
+
+class SpanType(Enum):
+    """Payload span types"""
+    CODE = "CODE"
+    STRING = "STRING"
+    COMMENT = "COMMENT"
+
+
+# Half-open [start, end) slice of the payload
+Span = namedtuple('Span', ['type', 'start', 'end'])
+
+# String literals: opened by an unescaped quote, closed by the next
+# unescaped quote of the same kind (or the end of the payload). The
+# quote comes before the lookbehind so the regex engine can jump
+# straight to quote characters.
+_STRING_PATTERN = (
+    r"(?P<STRING>"
+    r"'(?<!\\')(?:[^']+|(?<=\\)')*(?:'|\Z)"
+    r'|"(?<!\\")(?:[^"]+|(?<=\\)")*(?:"|\Z)'
+    r")"
+)
+
+# Comments, as recognised by the lexer
+_COMMENT_PATTERN = r"(?P<COMMENT>--[^\n]*|/\*[\s\S]*?(?:\*/|\Z))"
+
+
+class SpanScanner:
+    """
+    Single-pass string/comment span scanner
+
+    Features:
+    - One compiled regex finds every string and comment span
+    - Code spans are the gaps between them
+    - compile_sub() rewrites code spans only, each with one re.sub()
+    - comments=False treats comment markers as code
+    """
+
+    def __init__(self, comments: bool = True):
+        self.comments = comments
+        self.pattern = re.compile(_STRING_PATTERN + ('|' + _COMMENT_PATTERN if comments else ''))
+
+    def spans(self, payload: str) -> List[Span]:
+        """Split a payload into consecutive code, string and comment spans"""
+        spans = []
+        position = 0
+
+        for match in self.pattern.finditer(payload):
+            start, end = match.span()
+            if start > position:
+                spans.append(Span(SpanType.CODE, position, start))
+            spans.append(Span(SpanType[match.lastgroup], start, end))
+            position = end
+
+        if position < len(payload):
+            spans.append(Span(SpanType.CODE, position, len(payload)))
+        return spans
+
+    def compile_sub(
+        self,
+        pattern: str,
+        repl: Union[str, Callable[..., str]],
+        flags: int = 0
+    ) -> Callable[[str], str]:
+        """
+        Compile a substitution that only rewrites code spans
+
+        Strings and comments are copied unchanged. Each code span is
+        rewritten on its own, so lookarounds do not see past it. repl is
+        a literal string or a function of the match.
+        """
+        code_pattern = re.compile(pattern, flags)
+        if not callable(repl):
+            repl = repl.replace('\\', '\\\\')  # Literal, not a template
+        skip_pattern = self.pattern
+
+        def sub(payload: str) -> str:
+            parts = []
+            position = 0
+
+            for match in skip_pattern.finditer(payload):
+                start, end = match.span()
+                if start > position:
+                    parts.append(code_pattern.sub(repl, payload[position:start]))
+                parts.append(match.group())
+                position = end
+
+            if not parts:
+                return code_pattern.sub(repl, payload)
+            if position < len(payload):
+                parts.append(code_pattern.sub(repl, payload[position:]))
+            return ''.join(parts)
+
+        return sub
+
+
+if __name__ == "__main__":
+    scanner = SpanScanner()
+    payload = "SELECT 'a b', \"it\\\"s\" FROM t /* x y */ WHERE id=1 -- z"
+
+    for span in scanner.spans(payload):
+        print(f"{span.type.value:8} {payload[span.start:span.end]!r}")
+
+    replace_spaces = scanner.compile_sub(r' ', '/**/')
+    print(replace_spaces(payload))
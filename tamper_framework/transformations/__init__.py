@@ -7,14 +7,45 @@ Author: Regaan
 License: GPL v2
 """
 
-from tamper_framework.transformations.keyword_wrap import create_keyword_wrap_rule
-from tamper_framework.transformations.space_replace import create_space_replace_rule
-from tamper_framework.transformations.case_alternate import create_case_alternate_rule
-from tamper_framework.transformations.value_encode import create_value_encode_rule
+import importlib
+
+# Public names, by defining module, imported on first access (PEP 562)
+_LAZY_MODULES = {
+    'tamper_framework.transformations.keyword_wrap': ('create_keyword_wrap_rule', 'KEYWORD_WRAP_SPEC'),
+    'tamper_framework.transformations.space_replace': ('create_space_replace_rule', 'SPACE_REPLACE_SPEC'),
+    'tamper_framework.transformations.case_alternate': ('create_case_alternate_rule', 'CASE_ALTERNATE_SPEC'),
+    'tamper_framework.transformations.value_encode': ('create_value_encode_rule', 'VALUE_ENCODE_SPEC'),
+}
+
+_LAZY_ATTRIBUTES = {
+    name: module
+    for module, names in _LAZY_MODULES.items()
+    for name in names
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 __all__ = [
     'create_keyword_wrap_rule',
     'create_space_replace_rule',
     'create_case_alternate_rule',
     'create_value_encode_rule',
+    
+    # Declarative (picklable) specs of the same rules
+    'KEYWORD_WRAP_SPEC',
+    'SPACE_REPLACE_SPEC',
+    'CASE_ALTERNATE_SPEC',
+    'VALUE_ENCODE_SPEC',
 ]
@@ -10,10 +10,58 @@ License: GPL v2
 """
 
 from tamper_framework.lexer import Token, TokenType
-from tamper_framework.transformer import TransformationRule
+from tamper_framework.transformer import TransformationRule, RuleSpec, register_transform
 from tamper_framework.context import SQLContext
 
 
+def is_alternating_case(text: str) -> bool:
+    """Check if text is already in alternating case"""
+    if not text or len(text) < 2:
+        return False
+    
+    # Check if follows pattern: lower, upper, lower, upper...
+    for i, char in enumerate(text):
+        if not char.isalpha():
+            continue
+        
+        expected_lower = (i % 2 == 0)
+        if expected_lower and char.isupper():
+            return False
+        if not expected_lower and char.islower():
+            return False
+    
+    return True
+
+
+@register_transform('case_alternate')
+def alternate_case(token: Token, context: SQLContext) -> Token:
+    """Apply alternating case to keyword"""
+    if token.type != TokenType.KEYWORD:
+        return token
+    
+    # Check if already alternated
+    if is_alternating_case(token.value):
+        return token
+    
+    # Apply alternating case
+    new_value = ''.join(
+        char.lower() if i % 2 == 0 else char.upper()
+        for i, char in enumerate(token.value)
+    )
+    
+    return token.with_value(new_value)
+
+
+CASE_ALTERNATE_SPEC = RuleSpec(
+    name="case_alternate",
+    transform_id="case_alternate",
+    target_types=(TokenType.KEYWORD,),
+    skip_types=(TokenType.STRING_LITERAL, TokenType.COMMENT),
+    track_transformed=True,
+    pure=True  # Depends only on the keyword text
+)
+
+
 def create_case_alternate_rule() -> TransformationRule:
     """
     Create a rule that applies alternating case to keywords
@@ -24,56 +72,7 @@ def create_case_alternate_rule() -> TransformationRule:
     
     IMPROVED: Better detection of already-alternated keywords
     """
-    
-    def is_alternating_case(text: str) -> bool:
-        """Check if text is already in alternating case"""
-        if not text or len(text) < 2:
-            return False
-        
-        # Check if follows pattern: lower, upper, lower, upper...
-        for i, char in enumerate(text):
-            if not char.isalpha():
-                continue
-            
-            expected_lower = (i % 2 == 0)
-            if expected_lower and char.isupper():
-                return False
-            if not expected_lower and char.islower():
-                return False
-        
-        return True
-    
-    def alternate_case(token: Token, context: SQLContext) -> Token:
-        """Apply alternating case to keyword"""
-        if token.type != TokenType.KEYWORD:
-            return token
-        
-        # Check if already alternated
-        if is_alternating_case(token.value):
-            return token
-        
-        # Apply alternating case
-        new_value = ''.join(
-            char.lower() if i % 2 == 0 else char.upper()
-            for i, char in enumerate(token.value)
-        )
-        
-        return Token(
-            id=token.id,
-            type=token.type,
-            value=new_value,
-            position=token.position,
-            line=token.line,
-            column=token.column
-        )
-    
-    return TransformationRule(
-        name="case_alternate",
-        transform_func=alternate_case,
-        target_types=[TokenType.KEYWORD],
-        skip_types=[TokenType.STRING_LITERAL, TokenType.COMMENT],
-        track_transformed=True
-    )
+    return TransformationRule.from_spec(CASE_ALTERNATE_SPEC)
 
 
 if __name__ == "__main__":
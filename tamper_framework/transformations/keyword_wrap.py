@@ -10,10 +10,35 @@ License: GPL v2
 """
 
 from tamper_framework.lexer import Token, TokenType
-from tamper_framework.transformer import TransformationRule
+from tamper_framework.transformer import TransformationRule, RuleSpec, register_transform
 from tamper_framework.context import SQLContext
 
 
+@register_transform('keyword_wrap')
+def wrap_keyword(token: Token, context: SQLContext, version: str = '50000') -> Token:
+    """Wrap keyword in MySQL version comment"""
+    if token.type != TokenType.KEYWORD:
+        return token
+    
+    # Check if already wrapped
+    if token.value.startswith('/*!'):
+        return token
+    
+    new_value = f'/*!{version}{token.value}*/'
+    
+    return token.with_value(new_value)
+
+
+KEYWORD_WRAP_SPEC = RuleSpec(
+    name="keyword_wrap",
+    transform_id="keyword_wrap",
+    target_types=(TokenType.KEYWORD,),
+    skip_types=(TokenType.STRING_LITERAL, TokenType.COMMENT),
+    track_transformed=True,  # Prevent double-wrapping
+    pure=True  # Depends only on the keyword text
+)
+
+
 def create_keyword_wrap_rule() -> TransformationRule:
     """
     Create a rule that wraps keywords in MySQL version comments
@@ -27,34 +52,7 @@ def create_keyword_wrap_rule() -> TransformationRule:
     - Checks if already wrapped
     - Works across all clauses
     """
-    
-    def wrap_keyword(token: Token, context: SQLContext) -> Token:
-        """Wrap keyword in MySQL version comment"""
-        if token.type != TokenType.KEYWORD:
-            return token
-        
-        # Check if already wrapped
-        if token.value.startswith('/*!'):
-            return token
-        
-        new_value = f'/*!50000{token.value}*/'
-        
-        return Token(
-            id=token.id,  # Keep same UUID
-            type=token.type,
-            value=new_value,
-            position=token.position,
-            line=token.line,
-            column=token.column
-        )
-    
-    return TransformationRule(
-        name="keyword_wrap",
-        transform_func=wrap_keyword,
-        target_types=[TokenType.KEYWORD],
-        skip_types=[TokenType.STRING_LITERAL, TokenType.COMMENT],
-        track_transformed=True  # Prevent double-wrapping
-    )
+    return TransformationRule.from_spec(KEYWORD_WRAP_SPEC)
 
 
 if __name__ == "__main__":
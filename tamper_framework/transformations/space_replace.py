@@ -10,10 +10,33 @@ License: GPL v2
 """
 
 from tamper_framework.lexer import Token, TokenType
-from tamper_framework.transformer import TransformationRule
+from tamper_framework.transformer import TransformationRule, RuleSpec, register_transform
 from tamper_framework.context import SQLContext
 
 
+@register_transform('space_replace')
+def replace_space(token: Token, context: SQLContext, replacement: str = '/**/') -> Token:
+    """Replace space with inline comment"""
+    if token.type != TokenType.WHITESPACE:
+        return token
+    
+    # Only replace single spaces, preserve newlines/tabs
+    if token.value == ' ':
+        return token.with_value(replacement)
+    
+    return token
+
+
+SPACE_REPLACE_SPEC = RuleSpec(
+    name="space_replace",
+    transform_id="space_replace",
+    target_types=(TokenType.WHITESPACE,),
+    skip_types=(),  # Don't skip anything for whitespace
+    track_transformed=False,  # Can apply multiple times
+    pure=True  # Depends only on the whitespace text
+)
+
+
 def create_space_replace_rule() -> TransformationRule:
     """
     Create a rule that replaces spaces with inline comments
@@ -26,33 +49,7 @@ def create_space_replace_rule() -> TransformationRule:
     - Preserves newlines and tabs
     - Simple and deterministic
     """
-    
-    def replace_space(token: Token, context: SQLContext) -> Token:
-        """Replace space with inline comment"""
-        if token.type != TokenType.WHITESPACE:
-            return token
-        
-        # Only replace single spaces, preserve newlines/tabs
-        if token.value == ' ':
-            new_value = '/**/'
-            return Token(
-                id=token.id,
-                type=token.type,
-                value=new_value,
-                position=token.position,
-                line=token.line,
-                column=token.column
-            )
-        
-        return token
-    
-    return TransformationRule(
-        name="space_replace",
-        transform_func=replace_space,
-        target_types=[TokenType.WHITESPACE],
-        skip_types=[],  # Don't skip anything for whitespace
-        track_transformed=False  # Can apply multiple times
-    )
+    return TransformationRule.from_spec(SPACE_REPLACE_SPEC)
 
 
 if __name__ == "__main__":
@@ -13,10 +13,51 @@ License: GPL v2
 """
 
 from tamper_framework.lexer import Token, TokenType
-from tamper_framework.transformer import TransformationRule
+from tamper_framework.transformer import TransformationRule, RuleSpec, register_transform
 from tamper_framework.context import SQLContext, ClauseType
 
 
+# Complete operator encoding map
+OPERATOR_ENCODING = {
+    '=': '%3D',
+    '<': '%3C',
+    '>': '%3E',
+    '!': '%21',
+    '<=': '%3C%3D',  # Multi-char operators
+    '>=': '%3E%3D',
+    '<>': '%3C%3E',
+    '!=': '%21%3D',
+}
+
+
+@register_transform('value_encode')
+def encode_operator(token: Token, context: SQLContext) -> Token:
+    """Encode operator - complete operator, not parts"""
+    if token.type != TokenType.OPERATOR:
+        return token
+    
+    # Only encode in value contexts (WHERE, HAVING)
+    if context.clause not in (ClauseType.WHERE, ClauseType.HAVING):
+        return token
+    
+    # Encode complete operator
+    if token.value in OPERATOR_ENCODING:
+        new_value = OPERATOR_ENCODING[token.value]
+        return token.with_value(new_value)
+    
+    return token
+
+
+VALUE_ENCODE_SPEC = RuleSpec(
+    name="value_encode",
+    transform_id="value_encode",
+    target_types=(TokenType.OPERATOR,),
+    skip_types=(TokenType.STRING_LITERAL, TokenType.COMMENT),
+    allowed_clauses=(ClauseType.WHERE, ClauseType.HAVING),  # Only in value context
+    track_transformed=False  # Can encode multiple times
+)
+
+
 def create_value_encode_rule() -> TransformationRule:
     """
     Create a rule that properly encodes operators
@@ -27,50 +68,7 @@ def create_value_encode_rule() -> TransformationRule:
     
     Only encodes in WHERE/HAVING clauses (value context)
     """
-    
-    # Complete operator encoding map
-    OPERATOR_ENCODING = {
-        '=': '%3D',
-        '<': '%3C',
-        '>': '%3E',
-        '!': '%21',
-        '<=': '%3C%3D',  # Multi-char operators
-        '>=': '%3E%3D',
-        '<>': '%3C%3E',
-        '!=': '%21%3D',
-    }
-    
-    def encode_operator(token: Token, context: SQLContext) -> Token:
-        """Encode operator - complete operator, not parts"""
-        if token.type != TokenType.OPERATOR:
-            return token
-        
-        # Only encode in value contexts (WHERE, HAVING)
-        if context.clause not in (ClauseType.WHERE, ClauseType.HAVING):
-            return token
-        
-        # Encode complete operator
-        if token.value in OPERATOR_ENCODING:
-            new_value = OPERATOR_ENCODING[token.value]
-            return Token(
-                id=token.id,
-                type=token.type,
-                value=new_value,
-                position=token.position,
-                line=token.line,
-                column=token.column
-            )
-        
-        return token
-    
-    return TransformationRule(
-        name="value_encode",
-        transform_func=encode_operator,
-        target_types=[TokenType.OPERATOR],
-        skip_types=[TokenType.STRING_LITERAL, TokenType.COMMENT],
-        allowed_clauses=[ClauseType.WHERE, ClauseType.HAVING],  # Only in value context
-        track_transformed=False  # Can encode multiple times
-    )
+    return TransformationRule.from_spec(VALUE_ENCODE_SPEC)
 
 
 if __name__ == "__main__":
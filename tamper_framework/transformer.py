@@ -3,15 +3,105 @@
 """
 SQL Transformer - Context-aware token transformation
 
-Uses UUID tracking and SQL context for safe transformations.
+Uses token ID tracking and SQL context for safe transformations.
 
 Author: Regaan
 License: GPL v2
 """
 
-from typing import List, Callable, Dict, Any, Set
-from tamper_framework.lexer import Token, TokenType, SQLLexer
-from tamper_framework.context import SQLContext, annotate_tokens_with_context, ClauseType
+import importlib
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import List, Callable, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+from tamper_framework.lexer import SQLLexer, Token, TokenId, TokenType, stream_tokens
+from tamper_framework.context import (
+    SQLContext,
+    SQLContextTracker,
+    ClauseType,
+    intern_context,
+    iter_tokens_with_context
+)
+from tamper_framework.cache import BATCH_DEDUPE_SIZE, LRUCache, CacheInfo, ValueMemo
+
+
+# Registered transform functions, keyed by transform ID
+_TRANSFORMS: Dict[str, Callable[..., Token]] = {}
+
+# Built-in transforms live in tamper_framework.transformations.<transform ID>
+_BUILTIN_TRANSFORMS_PACKAGE = 'tamper_framework.transformations'
+
+
+def register_transform(transform_id: str):
+    """
+    Register a module-level transform function under a stable ID
+    
+    The function is called as func(token, context, **params). Rules
+    refer to it by ID in a RuleSpec, so they can be pickled and rebuilt
+    in another process.
+    
+    Usage:
+        @register_transform('my_transform')
+        def my_transform(token, context, suffix='x'):
+            ...
+    """
+    def decorator(func: Callable[..., Token]) -> Callable[..., Token]:
+        _TRANSFORMS[transform_id] = func
+        return func
+    return decorator
+
+
+def get_transform(transform_id: str) -> Callable[..., Token]:
+    """
+    Look up a registered transform function
+    
+    Built-in transforms are imported on first use, so a fresh worker
+    process can resolve them without importing every module up front.
+    """
+    func = _TRANSFORMS.get(transform_id)
+    if func is None and transform_id.isidentifier():
+        try:
+            importlib.import_module(f'{_BUILTIN_TRANSFORMS_PACKAGE}.{transform_id}')
+        except ImportError:
+            pass
+        func = _TRANSFORMS.get(transform_id)
+    
+    if func is None:
+        raise ValueError(f"Unknown transform ID: {transform_id!r}")
+    return func
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """
+    Declarative, picklable description of a TransformationRule
+    
+    Holds only data (the transform is referenced by its registered ID),
+    so specs can be sent to worker processes or stored on disk and
+    turned back into rules with TransformationRule.from_spec().
+    
+    Type and clause filters may be given as any iterable and params as a
+    dict; they are stored as tuples (params as sorted (name, value)
+    pairs) so specs stay hashable.
+    """
+    name: str
+    transform_id: str
+    target_types: Tuple[TokenType, ...]
+    skip_types: Optional[Tuple[TokenType, ...]] = None
+    allowed_clauses: Optional[Tuple[ClauseType, ...]] = None
+    params: Tuple[Tuple[str, Any], ...] = ()
+    track_transformed: bool = True
+    deterministic: bool = True
+    pure: bool = False
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'target_types', tuple(self.target_types))
+        for name in ('skip_types', 'allowed_clauses'):
+            value = getattr(self, name)
+            if value is not None:
+                object.__setattr__(self, name, tuple(value))
+        if isinstance(self.params, dict):
+            object.__setattr__(self, 'params', tuple(sorted(self.params.items())))
 
 
 class TransformationRule:
@@ -28,56 +118,173 @@ class TransformationRule:
         self,
         name: str,
         transform_func: Callable[[Token, SQLContext], Token],
-        target_types: List[TokenType],
-        skip_types: List[TokenType] = None,
-        allowed_clauses: List[ClauseType] = None,  # NEW: context filtering
-        track_transformed: bool = True
+        target_types: Iterable[TokenType],
+        skip_types: Iterable[TokenType] = None,
+        allowed_clauses: Iterable[ClauseType] = None,  # NEW: context filtering
+        track_transformed: bool = True,
+        deterministic: bool = True,
+        pure: bool = False
     ):
         self.name = name
         self.transform_func = transform_func
-        self.target_types = target_types
-        self.skip_types = skip_types or [TokenType.STRING_LITERAL, TokenType.COMMENT]
-        self.allowed_clauses = allowed_clauses  # If set, only transform in these clauses
+        # Stored as frozensets: should_transform() tests them per token
+        self.target_types = frozenset(target_types)
+        self.skip_types = frozenset(skip_types or (TokenType.STRING_LITERAL, TokenType.COMMENT))
+        self.eligible_types = self.target_types - self.skip_types  # Targeted and not skipped
+        # If set, only transform in these clauses
+        self.allowed_clauses = frozenset(allowed_clauses) if allowed_clauses else None
         self.track_transformed = track_transformed
-        self.transformed_ids: Set[str] = set()  # Track by UUID, not position!
+        self.deterministic = deterministic  # False disables result caching
+        # True if the transform's result depends only on token.value and
+        # keeps the token type: SQLTransformer then memoizes it per value
+        self.pure = pure
+        self.transformed_ids: Set[TokenId] = set()  # Track by token ID, not position!
+        self.spec: Optional[RuleSpec] = None  # Set when built from a RuleSpec
     
-    def should_transform(self, token: Token, context: SQLContext) -> bool:
-        """Check if token should be transformed"""
-        # Skip if wrong type
-        if token.type not in self.target_types:
-            return False
+    @classmethod
+    def from_spec(cls, spec: RuleSpec) -> 'TransformationRule':
+        """Build a rule from its declarative spec"""
+        func = get_transform(spec.transform_id)
+        if spec.params:
+            func = partial(func, **dict(spec.params))
         
-        # Skip if in skip list
-        if token.type in self.skip_types:
-            return False
+        rule = cls(
+            name=spec.name,
+            transform_func=func,
+            target_types=spec.target_types,
+            skip_types=spec.skip_types,
+            allowed_clauses=spec.allowed_clauses,
+            track_transformed=spec.track_transformed,
+            deterministic=spec.deterministic,
+            pure=spec.pure
+        )
+        rule.spec = spec
+        return rule
+    
+    def should_transform(
+        self,
+        token: Token,
+        context: SQLContext,
+        state: 'TransformationState' = None
+    ) -> bool:
+        """
+        Check if token should be transformed
         
-        # Skip if already transformed (use UUID!)
-        if self.track_transformed and token.id in self.transformed_ids:
+        With a state, reapplication is tracked in the per-invocation
+        state instead of the rule's own transformed_ids.
+        """
+        # Skip if wrong type or in skip list (one precomputed set)
+        if token.type not in self.eligible_types:
             return False
         
+        # Skip if already transformed (use token ID!)
+        if self.track_transformed:
+            transformed_ids = self.transformed_ids if state is None else state.ids_for(self)
+            if token.id in transformed_ids:
+                return False
+        
         # NEW: Check context if clause filtering is enabled
-        if self.allowed_clauses and context.clause not in self.allowed_clauses:
+        if self.allowed_clauses is not None and context.clause not in self.allowed_clauses:
             return False
         
         return True
     
-    def apply(self, token: Token, context: SQLContext) -> Token:
+    def apply(
+        self,
+        token: Token,
+        context: SQLContext,
+        state: 'TransformationState' = None
+    ) -> Token:
         """Apply transformation to token"""
-        if not self.should_transform(token, context):
+        if not self.should_transform(token, context, state):
             return token
         
         # Transform (pass context to transformation function)
         new_token = self.transform_func(token, context)
         
-        # Track transformation by UUID
+        # Track transformation by token ID
+        if self.track_transformed:
+            if state is None:
+                self.transformed_ids.add(token.id)
+            else:
+                state.ids_for(self).add(token.id)
+        
+        return new_token
+    
+    def apply_memoized(
+        self,
+        token: Token,
+        context: SQLContext,
+        state: 'TransformationState',
+        memo: ValueMemo
+    ) -> Token:
+        """
+        apply() for pure rules, reusing transformed values from memo
+        
+        The transform runs once per distinct token value; later tokens
+        with that value get the remembered result. A result that changes
+        the token type is returned but not remembered.
+        """
+        if not self.should_transform(token, context, state):
+            return token
+        
+        value = token.value
+        new_value = memo.get(value)
+        if new_value is None:
+            new_token = self.transform_func(token, context)
+            if new_token.type is token.type:
+                memo.remember(value, new_token.value)
+        elif new_value == value:
+            new_token = token
+        else:
+            new_token = token.with_value(new_value)
+        
         if self.track_transformed:
-            self.transformed_ids.add(token.id)
+            state.ids_for(self).add(token.id)
         
         return new_token
     
     def reset(self):
         """Reset transformation tracking"""
         self.transformed_ids.clear()
+    
+    def clause_keywords(self) -> Optional[Tuple[str, ...]]:
+        """
+        Get the keywords that open one of the allowed clauses
+        
+        A payload that contains none of them (case-insensitively) has no
+        token this rule can transform. None if the rule is not limited
+        to clauses, or may act outside any clause (ClauseType.UNKNOWN).
+        """
+        if self.allowed_clauses is None or ClauseType.UNKNOWN in self.allowed_clauses:
+            return None
+        
+        return tuple(
+            keyword for keyword, clause in SQLContextTracker.CLAUSE_KEYWORDS.items()
+            if clause in self.allowed_clauses
+        )
+
+
+class TransformationState:
+    """
+    Per-invocation transformation state
+    
+    Holds the token IDs each rule has transformed during one transform()
+    call. Keeping this out of the rules lets a single SQLTransformer and
+    its rules be shared between threads (e.g. sqlmap --threads).
+    """
+    
+    __slots__ = ('transformed_ids',)
+    
+    def __init__(self):
+        self.transformed_ids: Dict[TransformationRule, Set[TokenId]] = {}
+    
+    def ids_for(self, rule: TransformationRule) -> Set[TokenId]:
+        """Get the set of token IDs already transformed by rule"""
+        ids = self.transformed_ids.get(rule)
+        if ids is None:
+            ids = self.transformed_ids[rule] = set()
+        return ids
 
 
 class SQLTransformer:
@@ -85,19 +292,195 @@ class SQLTransformer:
     Context-aware SQL transformer
     
     Features:
-    - UUID-based token tracking
+    - ID-based token tracking
     - SQL context awareness
     - Safe transformation ordering
+    - Single-pass compiled rule pipeline
     - Validation
+    
+    Thread safety: once all rules are added, transform() may be called
+    from several threads at once. Per-call state lives in a fresh
+    TransformationState; the transformer itself is only read.
+    
+    Caching: with cache_size set, results are memoized per payload in a
+    bounded LRU cache. The cache is bypassed whenever any rule is
+    registered with deterministic=False.
+    
+    Batches: transform_many() runs an iterable of payloads through the
+    pipeline, compiling once and transforming duplicates once.
+    
+    Profiling: enable_profiling() collects per-stage and per-rule timings
+    through a separate instrumented path (see tamper_framework.profiling).
+    
+    Memoization: rules declared pure=True (and deterministic) get a
+    value -> value memo of up to MEMO_SIZE entries, kept for the life of
+    the transformer, so e.g. SELECT is rewritten once and then looked up.
+    When every rule for a token type is pure, the whole chain is tabled:
+    compile() precomputes the final form of every lexer keyword, and
+    keyword tokens are then rewritten with one dict lookup.
+    
+    Adaptive mode: with adaptive=True, rules limited to some clauses are
+    dropped for payloads that cannot reach those clauses (e.g. an encoder
+    for WHERE/HAVING on a payload with neither keyword). The check is one
+    uppercase copy and a few substring searches per payload; output is
+    unchanged, since the context tracker only enters a clause on one of
+    its keywords.
     """
     
-    def __init__(self):
+    # Distinct payloads remembered by transform_many()
+    BATCH_DEDUPE_SIZE = BATCH_DEDUPE_SIZE
+    
+    # Distinct token values remembered per pure rule
+    MEMO_SIZE = 4096
+    
+    def __init__(self, cache_size: int = None, adaptive: bool = False):
         self.rules: List[TransformationRule] = []
-        self.lexer = None
+        self.cache = LRUCache(cache_size) if cache_size else None
+        self.adaptive = adaptive
+        self._dispatch: Dict[TokenType, Tuple[Tuple[int, TransformationRule], ...]] = None
+        self._cacheable = True
+        self._filters: Tuple[Tuple[int, Tuple[str, ...]], ...] = ()
+        self._filtered_dispatch: Dict[Tuple[int, ...], Dict[TokenType, tuple]] = {}
+        self._memos: Dict[TransformationRule, ValueMemo] = {}
+        self._chain_tables: Dict[TokenType, ValueMemo] = {}
+        self.stats: Optional['PipelineStats'] = None  # Set by enable_profiling()
+    
+    @classmethod
+    def from_specs(
+        cls,
+        specs: Iterable[RuleSpec],
+        cache_size: int = None,
+        adaptive: bool = False
+    ) -> 'SQLTransformer':
+        """Build a compiled transformer from rule specs, in order"""
+        transformer = cls(cache_size=cache_size, adaptive=adaptive)
+        for spec in specs:
+            transformer.add_rule(TransformationRule.from_spec(spec))
+        transformer.compile()
+        return transformer
+    
+    def specs(self) -> List[RuleSpec]:
+        """
+        Get the specs of all rules, in order
+        
+        Raises ValueError if a rule was built from a function rather than
+        a spec (closures cannot be described declaratively).
+        """
+        missing = [rule.name for rule in self.rules if rule.spec is None]
+        if missing:
+            raise ValueError(f"Rules not built from a RuleSpec: {', '.join(missing)}")
+        return [rule.spec for rule in self.rules]
     
     def add_rule(self, rule: TransformationRule):
         """Add a transformation rule"""
         self.rules.append(rule)
+        self._dispatch = None  # Recompile on next transform
+        if self.cache is not None:
+            self.cache.clear()  # Cached results came from the old chain
+    
+    def cache_info(self) -> Optional[CacheInfo]:
+        """Get result cache statistics (None if caching is disabled)"""
+        if self.cache is None:
+            return None
+        return self.cache.cache_info()
+    
+    def memo_sizes(self) -> Dict[str, int]:
+        """Get the number of memoized values per pure rule"""
+        return {rule.name: len(memo) for rule, memo in self._memos.items()}
+    
+    def chain_tables(self) -> Dict[TokenType, Dict[str, str]]:
+        """Get the precomputed value -> final value table per token type"""
+        return {token_type: dict(table) for token_type, table in self._chain_tables.items()}
+    
+    def enable_profiling(self) -> 'PipelineStats':
+        """
+        Start collecting per-stage and per-rule timings
+        
+        Returns the stats object (the same one if already enabled). Only
+        pipeline runs are measured; result cache hits skip the pipeline.
+        """
+        if self.stats is None:
+            from tamper_framework.profiling import PipelineStats
+            self.stats = PipelineStats()
+        return self.stats
+    
+    def disable_profiling(self) -> Optional['PipelineStats']:
+        """Stop collecting timings and return what was collected"""
+        stats, self.stats = self.stats, None
+        return stats
+    
+    def compile(self) -> Dict[TokenType, Tuple[Tuple[int, TransformationRule], ...]]:
+        """
+        Fuse the registered rules into a per-TokenType dispatch table
+        
+        Each token type maps to the (index, rule) pairs that can act on it,
+        in registration order, so a keyword rule is never even looked at
+        for a whitespace token. Called automatically by transform().
+        
+        Also precomputes the clause keyword filters used in adaptive mode,
+        the memos of pure rules (kept across recompiles), and the chain
+        tables of token types handled only by pure rules.
+        """
+        dispatch: Dict[TokenType, List[Tuple[int, TransformationRule]]] = {}
+        filters = []
+        memos = {}
+        
+        for index, rule in enumerate(self.rules):
+            for token_type in rule.eligible_types:
+                dispatch.setdefault(token_type, []).append((index, rule))
+            
+            keywords = rule.clause_keywords()
+            if keywords is not None:
+                filters.append((index, keywords))
+            
+            if rule.pure and rule.deterministic:
+                memo = self._memos.get(rule)
+                memos[rule] = memo if memo is not None else ValueMemo(self.MEMO_SIZE)
+        
+        self._cacheable = all(rule.deterministic for rule in self.rules)
+        self._filters = tuple(filters)
+        self._memos = memos
+        self._filtered_dispatch = {}
+        dispatch = {token_type: tuple(entries) for token_type, entries in dispatch.items()}
+        # Tables first: another thread may start using the pipeline as
+        # soon as _dispatch is set
+        self._chain_tables = self._build_chain_tables(dispatch)
+        self._dispatch = dispatch
+        return dispatch
+    
+    def _build_chain_tables(
+        self,
+        dispatch: Dict[TokenType, Tuple[Tuple[int, TransformationRule], ...]]
+    ) -> Dict[TokenType, ValueMemo]:
+        """
+        Table the rule chains that depend on the token value alone
+        
+        A chain qualifies if all its rules are pure, deterministic and
+        not limited to clauses; reapplication tracking never triggers
+        within one pass, so the chain's result is a function of the value.
+        Adaptive mode only drops clause-limited rules, so these chains
+        are never filtered. The keyword table is filled with every lexer
+        keyword, upper and lower case; other values are added on first
+        sight.
+        """
+        tables = {}
+        for token_type, entries in dispatch.items():
+            if token_type is not TokenType.EOF and all(
+                rule.pure and rule.deterministic and rule.allowed_clauses is None
+                for _, rule in entries
+            ):
+                tables[token_type] = ValueMemo(self.MEMO_SIZE)
+        
+        keywords = tables.get(TokenType.KEYWORD)
+        if keywords is not None:
+            entries = dispatch[TokenType.KEYWORD]
+            context = intern_context(ClauseType.UNKNOWN, 0, False, False)
+            for keyword in sorted(SQLLexer.KEYWORDS):
+                for value in (keyword, keyword.lower()):
+                    token = Token(0, TokenType.KEYWORD, value, 0, 1, 1)
+                    self._apply_chain(token, context, keywords, entries, dispatch, TransformationState())
+        
+        return tables
     
     def transform(self, sql: str) -> str:
         """
@@ -106,38 +489,308 @@ class SQLTransformer:
         Process:
         1. Tokenize SQL
         2. Annotate tokens with context
-        3. Apply each rule with context awareness
+        3. Apply the compiled rule pipeline in a single pass
         4. Reconstruct SQL
+        
+        Output is identical to applying each rule over the whole token
+        list in registration order: rules act on one token at a time, so
+        running the chain per token gives the same result.
+        """
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self.compile()
+        
+        run = self._transform if self.stats is None else self._transform_profiled
+        if self.adaptive and self._filters:
+            run = self._transform_adaptive
+        
+        cache = self.cache
+        if cache is None or not self._cacheable:
+            return run(sql, dispatch)
+        
+        result = cache.get(sql)
+        if result is None:
+            result = run(sql, dispatch)
+            cache.put(sql, result)
+        
+        return result
+    
+    def transform_many(self, payloads: Iterable[str]) -> Iterator[str]:
+        """
+        Transform many payloads, yielding results in input order
+        
+        Meant for offline batches (corpus generation, WAF rule testing):
+        - Rules are compiled once for the whole batch
+        - Identical payloads are transformed once; results are shared
+          from a batch-local table instead of the locked result cache
+        - Results are produced lazily, so inputs can be streamed
+        
+        Duplicates are not shared if any rule is nondeterministic.
         """
-        # Tokenize
-        self.lexer = SQLLexer(sql)
-        tokens = self.lexer.tokenize()
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self.compile()
+        
+        run = self._transform if self.stats is None else self._transform_profiled
+        if self.adaptive and self._filters:
+            run = self._transform_adaptive
+        
+        if not self._cacheable:
+            for sql in payloads:
+                yield run(sql, dispatch)
+            return
         
-        # Annotate with context
-        annotated = annotate_tokens_with_context(tokens)
+        seen: Dict[str, str] = {}
+        limit = self.BATCH_DEDUPE_SIZE
         
-        # Apply each rule
-        for rule in self.rules:
-            annotated = self._apply_rule(annotated, rule)
+        for sql in payloads:
+            result = seen.get(sql)
+            if result is None:
+                result = run(sql, dispatch)
+                if len(seen) >= limit:
+                    seen.clear()
+                seen[sql] = result
+            yield result
+    
+    def _transform_adaptive(
+        self,
+        sql: str,
+        dispatch: Dict[TokenType, Tuple[Tuple[int, TransformationRule], ...]]
+    ) -> str:
+        """Drop the rules this payload cannot trigger, then run the pipeline"""
+        # str.upper() maps character by character, so any keyword token
+        # (whose uppercase value opens a clause) appears in the copy
+        upper = sql.upper()
+        rejected = ()
+        for index, keywords in self._filters:
+            for keyword in keywords:
+                if keyword in upper:
+                    break
+            else:
+                rejected += (index,)
+        
+        if rejected:
+            filtered = self._filtered_dispatch.get(rejected)
+            if filtered is None:
+                filtered = self._filtered_dispatch[rejected] = {
+                    token_type: tuple(entry for entry in entries if entry[0] not in rejected)
+                    for token_type, entries in dispatch.items()
+                }
+            dispatch = filtered
+        
+        if self.stats is None:
+            return self._transform(sql, dispatch)
+        return self._transform_profiled(sql, dispatch, rejected)
+    
+    def _transform(
+        self,
+        sql: str,
+        dispatch: Dict[TokenType, Tuple[Tuple[int, TransformationRule], ...]]
+    ) -> str:
+        """Run the compiled pipeline over one payload (no caching)"""
+        # Tokenize (shared token cache, or a lazy lexer when it is off)
+        tokens = stream_tokens(sql)
         
-        # Extract tokens (discard context)
-        transformed_tokens = [token for token, _ in annotated]
+        # Annotate with context and apply all rules in one streaming pass,
+        # keeping only the output values
+        state = TransformationState()
+        tables = self._chain_tables
+        eof = TokenType.EOF
+        parts = []
+        for token, context in iter_tokens_with_context(tokens):
+            entries = dispatch.get(token.type)
+            if entries:
+                table = tables.get(token.type)
+                if table is None:
+                    token, _ = self._apply_compiled(token, context, entries, dispatch, state)
+                else:
+                    # Tabled chain: one lookup, no token objects
+                    value = table.get(token.value)
+                    if value is not None:
+                        parts.append(value)
+                        continue
+                    token = self._apply_chain(token, context, table, entries, dispatch, state)
+            if token.type is not eof:
+                parts.append(token.value)
         
         # Reconstruct
-        result = self.lexer.reconstruct(transformed_tokens)
+        return ''.join(parts)
+    
+    def _apply_chain(
+        self,
+        token: Token,
+        context: SQLContext,
+        table: ValueMemo,
+        entries: Tuple[Tuple[int, TransformationRule], ...],
+        dispatch: Dict[TokenType, Tuple[Tuple[int, TransformationRule], ...]],
+        state: TransformationState
+    ) -> Token:
+        """
+        Run a token through a tabled chain and remember its final value
+        
+        Not remembered if a rule changed the token type on the way, even
+        back to the original type: the rules for the other type are not
+        checked for purity and may depend on the context.
+        """
+        new_token, retyped = self._apply_compiled(token, context, entries, dispatch, state)
+        if not retyped:
+            table.remember(token.value, new_token.value)
+        return new_token
+    
+    def _apply_compiled(
+        self,
+        token: Token,
+        context: SQLContext,
+        entries: Tuple[Tuple[int, TransformationRule], ...],
+        dispatch: Dict[TokenType, Tuple[Tuple[int, TransformationRule], ...]],
+        state: TransformationState
+    ) -> Tuple[Token, bool]:
+        """
+        Run a token through its dispatched rules in registration order
+        
+        Returns the final token and whether any rule changed its type.
+        """
+        memos = self._memos
+        retyped = False
+        position = 0
+        while position < len(entries):
+            index, rule = entries[position]
+            position += 1
+            
+            memo = memos.get(rule) if memos else None
+            if memo is None:
+                new_token = rule.apply(token, context, state)
+            else:
+                new_token = rule.apply_memoized(token, context, state, memo)
+            
+            # A rule changed the token type: continue with the later
+            # rules registered for the new type
+            if new_token.type is not token.type:
+                entries = tuple(
+                    entry for entry in dispatch.get(new_token.type, ())
+                    if entry[0] > index
+                )
+                position = 0
+                retyped = True
+            
+            token = new_token
+        
+        return token, retyped
+    
+    def _transform_profiled(
+        self,
+        sql: str,
+        dispatch: Dict[TokenType, Tuple[Tuple[int, TransformationRule], ...]],
+        rejected: Tuple[int, ...] = ()
+    ) -> str:
+        """
+        Instrumented _transform(), used while profiling
+        
+        Runs each stage to completion so it can be timed on its own, and
+        times every rule application. Output is the same. rejected holds
+        the indexes of rules dropped by adaptive mode.
+        """
+        stats = self.stats
+        if stats is None:
+            # Profiling was disabled by another thread in the meantime
+            return self._transform(sql, dispatch)
         
-        # Reset rules for next transformation
-        for rule in self.rules:
-            rule.reset()
+        clock = time.perf_counter
         
+        start = clock()
+        tokens = tuple(stream_tokens(sql))
+        tokenized = clock()
+        annotated = list(iter_tokens_with_context(tokens))
+        annotated_at = clock()
+        
+        # rule -> [seconds, tokens touched, tokens applied, tokens rewritten,
+        #          memo hits, memo misses]
+        counters = {
+            rule: [0.0, 0, 0, 0, 0, 0] for index, rule in enumerate(self.rules)
+            if index not in rejected
+        }
+        state = TransformationState()
+        eof = TokenType.EOF
+        parts = []
+        for token, context in annotated:
+            entries = dispatch.get(token.type)
+            if entries:
+                token = self._apply_profiled(token, context, entries, dispatch, state, counters)
+            if token.type is not eof:
+                parts.append(token.value)
+        transformed = clock()
+        
+        result = ''.join(parts)
+        finished = clock()
+        
+        stats.record(
+            len(tokens),
+            (
+                ('tokenize', tokenized - start),
+                ('context', annotated_at - tokenized),
+                ('rules', transformed - annotated_at),
+                ('reconstruct', finished - transformed),
+            ),
+            [(rule.name, *counts) for rule, counts in counters.items()],
+            [self.rules[index].name for index in rejected]
+        )
         return result
     
+    def _apply_profiled(
+        self,
+        token: Token,
+        context: SQLContext,
+        entries: Tuple[Tuple[int, TransformationRule], ...],
+        dispatch: Dict[TokenType, Tuple[Tuple[int, TransformationRule], ...]],
+        state: TransformationState,
+        counters: Dict[TransformationRule, list]
+    ) -> Token:
+        """_apply_compiled() with per-rule timing, token and memo counts"""
+        clock = time.perf_counter
+        memos = self._memos
+        position = 0
+        while position < len(entries):
+            index, rule = entries[position]
+            position += 1
+            
+            counts = counters[rule]
+            memo = memos.get(rule)
+            start = clock()
+            if not rule.should_transform(token, context, state):
+                applied = 0
+                new_token = token
+            elif memo is None:
+                applied = 1
+                new_token = rule.apply(token, context, state)
+            else:
+                applied = 1
+                counts[4 if token.value in memo else 5] += 1
+                new_token = rule.apply_memoized(token, context, state, memo)
+            counts[0] += clock() - start
+            counts[1] += 1
+            counts[2] += applied
+            if new_token is not token and (
+                new_token.value != token.value or new_token.type is not token.type
+            ):
+                counts[3] += 1
+            
+            if new_token.type is not token.type:
+                entries = tuple(
+                    entry for entry in dispatch.get(new_token.type, ())
+                    if entry[0] > index
+                )
+                position = 0
+            
+            token = new_token
+        
+        return token
+    
     def _apply_rule(
         self,
         annotated: List[tuple[Token, SQLContext]],
         rule: TransformationRule
     ) -> List[tuple[Token, SQLContext]]:
-        """Apply a single rule to all tokens"""
+        """Apply a single rule to all tokens (sequential reference path)"""
         transformed = []
         
         for token, context in annotated:
@@ -155,14 +808,7 @@ if __name__ == "__main__":
         """Wrap keyword in MySQL version comment"""
         if token.type == TokenType.KEYWORD:
             new_value = f'/*!50000{token.value}*/'
-            return Token(
-                id=token.id,  # Keep same ID!
-                type=token.type,
-                value=new_value,
-                position=token.position,
-                line=token.line,
-                column=token.column
-            )
+            return token.with_value(new_value)
         return token
     
     # Create rule that only transforms in WHERE clause
@@ -14,12 +14,6 @@ This tamper uses a token-based framework with:
 - Deterministic transformations
 """
 
-import sys
-import os
-
-# Add parent directory to path for framework import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 try:
     from lib.core.enums import PRIORITY
     __priority__ = PRIORITY.HIGHEST
@@ -27,15 +21,54 @@ except ImportError:
     # Not running in SQLMap context
     pass
 
-from tamper_framework.transformer import SQLTransformer
+try:
+    from tamper_framework.transformer import SQLTransformer
+except ImportError:
+    # Framework not installed: use the copy next to tamper_scripts/
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from tamper_framework.transformer import SQLTransformer
+
+from tamper_framework.cache import map_deduplicated
 from tamper_framework.transformations import (
-    create_keyword_wrap_rule,
-    create_space_replace_rule,
-    create_case_alternate_rule,
-    create_value_encode_rule
+    KEYWORD_WRAP_SPEC,
+    SPACE_REPLACE_SPEC,
+    CASE_ALTERNATE_SPEC,
+    VALUE_ENCODE_SPEC
+)
+
+
+# Maximum number of payload -> result pairs memoized by the shared pipeline
+CACHE_SIZE = 4096
+
+# Rules in safe order:
+# 1. Keyword wrapping (/*!50000SELECT*/)
+# 2. Space replacement (/**/)
+# 3. Value encoding (%3E%3D for >=)
+# 4. Case alternation (sElEcT)
+RULE_SPECS = (
+    KEYWORD_WRAP_SPEC,
+    SPACE_REPLACE_SPEC,
+    VALUE_ENCODE_SPEC,  # FIXED: encodes complete operators
+    CASE_ALTERNATE_SPEC,
 )
 
 
+def build_transformer():
+    """
+    Build the cloudflare2025 pipeline from RULE_SPECS
+    
+    Picklable, so it can be passed to ParallelTransformer as is.
+    """
+    return SQLTransformer.from_specs(RULE_SPECS, cache_size=CACHE_SIZE)
+
+
+# Built once at import and shared by every tamper() call. Per-call state
+# lives in a TransformationState, so sqlmap --threads can share it safely.
+_TRANSFORMER = build_transformer()
+
+
 def dependencies():
     pass
 
@@ -63,18 +96,9 @@ def tamper(payload, **kwargs):
     if not payload:
         return payload
     
-    # Create transformer
-    transformer = SQLTransformer()
-    
-    # Add rules in correct order
-    transformer.add_rule(create_keyword_wrap_rule())
-    transformer.add_rule(create_space_replace_rule())
-    transformer.add_rule(create_value_encode_rule())  # FIXED: encodes complete operators
-    transformer.add_rule(create_case_alternate_rule())
-    
-    # Transform
+    # Transform with the shared pipeline
     try:
-        result = transformer.transform(payload)
+        result = _TRANSFORMER.transform(payload)
         return result
     except Exception as e:
         # If transformation fails, return original
@@ -82,6 +106,18 @@ def tamper(payload, **kwargs):
         return payload
 
 
+def tamper_many(payloads, **kwargs):
+    """
+    Batch version of tamper() for offline payload lists
+    
+    Yields results in input order; identical payloads are tampered once
+    (see tamper_framework.cache.map_deduplicated). Each payload goes
+    through tamper(), so empty payloads and failed transformations come
+    back unchanged.
+    """
+    return map_deduplicated(tamper, payloads, kwargs)
+
+
 if __name__ == "__main__":
     # Test the tamper script
     test_queries = [
@@ -11,9 +11,45 @@ Priority: LOWEST
 """
 
 import re
-from lib.core.enums import PRIORITY
 
-__priority__ = PRIORITY.LOWEST
+try:
+    from lib.core.enums import PRIORITY
+    __priority__ = PRIORITY.LOWEST
+except ImportError:
+    # Not running in SQLMap context
+    pass
+
+try:
+    from tamper_framework.cache import map_deduplicated
+except ImportError:
+    # Script copied into sqlmap on its own: no batch deduplication
+    map_deduplicated = None
+
+# SQL keywords to apply alternating case
+KEYWORDS = (
+    'SELECT', 'UNION', 'INSERT', 'UPDATE', 'DELETE',
+    'WHERE', 'FROM', 'JOIN', 'ORDER', 'GROUP', 'HAVING'
+)
+
+# Keyword -> alternating case version (sElEcT)
+ALTERNATING = {
+    keyword: ''.join(
+        char.lower() if i % 2 == 0 else char.upper()
+        for i, char in enumerate(keyword)
+    )
+    for keyword in KEYWORDS
+}
+
+# One scan finds whole-word keywords in any case (one group per
+# keyword, so the match identifies it even for non-ASCII case variants).
+# The lookahead on first letters lets the scan skip positions where no
+# keyword can start.
+_KEYWORD_PATTERN = re.compile(
+    r'(?=(?i:[%s]))\b(?i:%s)\b' % (
+        ''.join(sorted({keyword[0] for keyword in KEYWORDS})),
+        '|'.join(f'({keyword})' for keyword in KEYWORDS)
+    )
+)
 
 def dependencies():
     pass
@@ -47,27 +83,29 @@ def tamper(payload, **kwargs):
     if not payload:
         return retVal
     
-    # SQL keywords to apply alternating case
-    keywords = [
-        'SELECT', 'UNION', 'INSERT', 'UPDATE', 'DELETE',
-        'WHERE', 'FROM', 'JOIN', 'ORDER', 'GROUP', 'HAVING'
-    ]
+    # Keywords already in alternating case somewhere in the payload are
+    # skipped entirely. Replacing other keywords can neither create nor
+    # remove an alternating version, so checking up front matches the
+    # previous keyword-by-keyword passes.
+    processed = {keyword for keyword in KEYWORDS if ALTERNATING[keyword] in payload}
     
-    for keyword in keywords:
-        # Create alternating case version
-        alternating = ''.join(
-            char.lower() if i % 2 == 0 else char.upper()
-            for i, char in enumerate(keyword)
-        )
-        
-        # Check if keyword is already in alternating case
-        if alternating in retVal:
-            continue  # Skip, already processed
-        
-        # Use word boundaries to match whole words only
-        pattern = r'\b' + keyword + r'\b'
-        
-        # Replace with alternating case
-        retVal = re.sub(pattern, alternating, retVal, flags=re.IGNORECASE)
+    def replace(match):
+        keyword = KEYWORDS[match.lastindex - 1]
+        return match.group() if keyword in processed else ALTERNATING[keyword]
+    
+    retVal = _KEYWORD_PATTERN.sub(replace, payload)
     
     return retVal
+
+def tamper_many(payloads, **kwargs):
+    """
+    Batch version of tamper() for offline payload lists
+
+    Yields results in input order; with the framework available,
+    identical payloads are tampered once.
+    """
+
+    if map_deduplicated is not None:
+        return map_deduplicated(tamper, payloads, kwargs)
+
+    return (tamper(payload, **kwargs) for payload in payloads)
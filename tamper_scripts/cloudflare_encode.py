@@ -11,9 +11,38 @@ Priority: LOW
 """
 
 import re
-from lib.core.enums import PRIORITY
 
-__priority__ = PRIORITY.LOW
+try:
+    from lib.core.enums import PRIORITY
+    __priority__ = PRIORITY.LOW
+except ImportError:
+    # Not running in SQLMap context
+    pass
+
+try:
+    from tamper_framework.cache import map_deduplicated
+except ImportError:
+    # Script copied into sqlmap on its own: no batch deduplication
+    map_deduplicated = None
+
+# Encoding steps, in the order they were historically applied:
+# 1. = after WHERE/HAVING <column>
+# 2. single-quoted values after =
+# 3. double-quoted values after =
+_WHERE_VALUE_PATTERN = re.compile(r'(WHERE|HAVING)\s+(\w+)=', re.IGNORECASE)
+_SINGLE_QUOTED_PATTERN = re.compile(r"='([^']*)'")
+_DOUBLE_QUOTED_PATTERN = re.compile(r'="([^"]*)"')
+
+# All three steps in one scan: groups 1-2, 3 and 4 respectively. The
+# lookahead lets the scan skip positions that cannot start any step
+# (case-insensitive matching otherwise tries every branch everywhere)
+_ENCODE_PATTERN = re.compile(
+    r"(?=[WwHh=])(?:"
+    r"(?i:(WHERE|HAVING)\s+(\w+))="
+    r"|='([^']*)'"
+    r'|="([^"]*)"'
+    r")"
+)
 
 def dependencies():
     pass
@@ -57,12 +86,43 @@ def tamper(payload, **kwargs):
     # Strategy: Only encode = in WHERE/HAVING clauses
     # Only encode quotes in string literals
     
-    # Encode = only after WHERE/HAVING
-    retVal = re.sub(r'(WHERE|HAVING)\s+(\w+)=', r'\1 \2%3D', retVal, flags=re.IGNORECASE)
+    # Single pass over the payload for all three encodings
+    nested = []
+    
+    def replace(match):
+        keyword, column, single, double = match.groups()
+        if keyword is not None:
+            return f'{keyword} {column}%3D'
+        
+        value = single if single is not None else double
+        if '=' in value:
+            nested.append(value)
+        quote = '%27' if single is not None else '%22'
+        return f'={quote}{value}{quote}'
+    
+    retVal = _ENCODE_PATTERN.sub(replace, payload)
     
-    # Encode quotes only in value context (after =)
-    # This is simplified - full parser would be better
-    retVal = re.sub(r"='([^']*)'", r"=%27\1%27", retVal)
-    retVal = re.sub(r'="([^"]*)"', r'=%22\1%22', retVal)
+    if nested:
+        # A quoted value contains '=', so a later step may match inside
+        # an earlier step's output: apply the steps one after another
+        retVal = _WHERE_VALUE_PATTERN.sub(r'\1 \2%3D', payload)
+        
+        # Encode quotes only in value context (after =)
+        # This is simplified - full parser would be better
+        retVal = _SINGLE_QUOTED_PATTERN.sub(r"=%27\1%27", retVal)
+        retVal = _DOUBLE_QUOTED_PATTERN.sub(r'=%22\1%22', retVal)
     
     return retVal
+
+def tamper_many(payloads, **kwargs):
+    """
+    Batch version of tamper() for offline payload lists
+
+    Yields results in input order; with the framework available,
+    identical payloads are tampered once.
+    """
+
+    if map_deduplicated is not None:
+        return map_deduplicated(tamper, payloads, kwargs)
+
+    return (tamper(payload, **kwargs) for payload in payloads)
@@ -11,9 +11,44 @@ Priority: HIGHEST
 """
 
 import re
-from lib.core.enums import PRIORITY
 
-__priority__ = PRIORITY.HIGHEST
+try:
+    from lib.core.enums import PRIORITY
+    __priority__ = PRIORITY.HIGHEST
+except ImportError:
+    # Not running in SQLMap context
+    pass
+
+try:
+    from tamper_framework.cache import map_deduplicated
+except ImportError:
+    # Script copied into sqlmap on its own: no batch deduplication
+    map_deduplicated = None
+
+# SQL keywords to obfuscate (most common first)
+KEYWORDS = (
+    'SELECT', 'UNION', 'INSERT', 'UPDATE', 'DELETE', 'DROP',
+    'WHERE', 'FROM', 'JOIN', 'INNER', 'OUTER', 'LEFT', 'RIGHT',
+    'ORDER', 'GROUP', 'HAVING', 'LIMIT'
+)
+
+# Version comment wrapped keywords, in KEYWORDS order
+WRAPPED = tuple(f'/*!50000{keyword}*/' for keyword in KEYWORDS)
+
+# Any keyword as a whole word, case-insensitive, in a single scan; one
+# group per keyword, so the match identifies it even for non-ASCII
+# case variants. The lookahead on first letters lets the scan skip
+# positions where no keyword can start.
+_KEYWORD_PATTERN = re.compile(
+    r'(?=[%s])\b(?:%s)\b' % (
+        ''.join(sorted({keyword[0] for keyword in KEYWORDS})),
+        '|'.join(f'({keyword})' for keyword in KEYWORDS)
+    ),
+    re.IGNORECASE
+)
+
+def _wrap(match):
+    return WRAPPED[match.lastindex - 1]
 
 def dependencies():
     pass
@@ -46,20 +81,20 @@ def tamper(payload, **kwargs):
         # Already processed, don't reapply
         return retVal
     
-    # SQL keywords to obfuscate (most common first)
-    keywords = [
-        'SELECT', 'UNION', 'INSERT', 'UPDATE', 'DELETE', 'DROP',
-        'WHERE', 'FROM', 'JOIN', 'INNER', 'OUTER', 'LEFT', 'RIGHT',
-        'ORDER', 'GROUP', 'HAVING', 'LIMIT'
-    ]
-    
-    for keyword in keywords:
-        # Use word boundaries to avoid partial matches
-        # \b ensures we match whole words only
-        pattern = r'\b' + keyword + r'\b'
-        replacement = f'/*!50000{keyword}*/'
-        
-        # Case-insensitive replacement with word boundaries
-        retVal = re.sub(pattern, replacement, retVal, flags=re.IGNORECASE)
+    # Wrap every keyword in one pass; word boundaries avoid partial matches
+    retVal = _KEYWORD_PATTERN.sub(_wrap, retVal)
     
     return retVal
+
+def tamper_many(payloads, **kwargs):
+    """
+    Batch version of tamper() for offline payload lists
+
+    Yields results in input order; with the framework available,
+    identical payloads are tampered once.
+    """
+
+    if map_deduplicated is not None:
+        return map_deduplicated(tamper, payloads, kwargs)
+
+    return (tamper(payload, **kwargs) for payload in payloads)
@@ -11,9 +11,29 @@ Priority: NORMAL
 """
 
 import re
-from lib.core.enums import PRIORITY
 
-__priority__ = PRIORITY.NORMAL
+try:
+    from lib.core.enums import PRIORITY
+    __priority__ = PRIORITY.NORMAL
+except ImportError:
+    # Not running in SQLMap context
+    pass
+
+try:
+    from tamper_framework.cache import map_deduplicated
+except ImportError:
+    # Script copied into sqlmap on its own: no batch deduplication
+    map_deduplicated = None
+
+try:
+    from tamper_framework.scanner import SpanScanner
+    
+    # Spaces outside string literals, unless followed by /** (already
+    # replaced), in one scan over code spans
+    _replace_spaces = SpanScanner(comments=False).compile_sub(r' (?!/\*\*)', '/**/')
+except ImportError:
+    # Script copied into sqlmap on its own: use the character loop
+    _replace_spaces = None
 
 def dependencies():
     pass
@@ -49,6 +69,14 @@ def tamper(payload, **kwargs):
         # Partially processed, only replace remaining spaces
         pass
     
+    if _replace_spaces is not None:
+        return _replace_spaces(retVal)
+    
+    return _replace_spaces_chars(retVal)
+
+def _replace_spaces_chars(retVal):
+    """Character loop version of the span scanner substitution"""
+    
     # Simple approach: replace spaces not inside quotes or existing comments
     # This is a simplified version - full SQL parsing would be more robust
     
@@ -83,3 +111,16 @@ def tamper(payload, **kwargs):
         i += 1
     
     return ''.join(result)
+
+def tamper_many(payloads, **kwargs):
+    """
+    Batch version of tamper() for offline payload lists
+
+    Yields results in input order; with the framework available,
+    identical payloads are tampered once.
+    """
+
+    if map_deduplicated is not None:
+        return map_deduplicated(tamper, payloads, kwargs)
+
+    return (tamper(payload, **kwargs) for payload in payloads)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+
+"""
+AST Builder Tests
+
+Tests tree construction and source-order reconstruction.
+
+Author: Regaan
+License: GPL v2
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tamper_framework.lexer import SQLLexer, TokenType
+from tamper_framework.ast_builder import ASTNode, NodeType, SQLASTBuilder, reconstruct_from_ast
+from tamper_framework.ast_transformer import ASTTransformer, ASTTransformationRule
+from tests.test_lexer import CONFORMANCE_CORPUS
+
+
+NESTED_PAYLOADS = [
+    "1 AND 4586=(SELECT 4586 FROM (SELECT(SLEEP(5)))aBcD)",
+    "1 AND EXTRACTVALUE(7214,CONCAT(0x5c,(SELECT (ELT(7214=7214,1))),0x71))",
+    "SELECT * FROM (SELECT * FROM (SELECT * FROM (SELECT id FROM t) a) b) c",
+    "SELECT MID((SELECT MID((SELECT pw FROM u),1,1) FROM dual),2,1)",
+    "((((1))))",
+    "SELECT (1",
+    "SELECT 1)) FROM (SELECT 2",
+]
+
+
+def build_ast(sql: str) -> ASTNode:
+    """Tokenize and build an AST"""
+    lexer = SQLLexer(sql)
+    return SQLASTBuilder(lexer.tokenize()).build()
+
+
+def reconstruct_sorted(node: ASTNode) -> str:
+    """Reference reconstruction: sort tokens and children by position at every level"""
+    if not node.children:
+        return ''.join(token.value for token in node.tokens)
+
+    items = [(token.position, token.value) for token in node.tokens]
+    for child in node.children:
+        if child.tokens:
+            items.append((child.tokens[0].position, reconstruct_sorted(child)))
+
+    items.sort(key=lambda x: x[0])
+    return ''.join(item[1] for item in items)
+
+
+def test_reconstruct_matches_reference():
+    """Test that linear reconstruction matches per-level sorting"""
+    for sql in CONFORMANCE_CORPUS + NESTED_PAYLOADS:
+        ast = build_ast(sql)
+        assert reconstruct_from_ast(ast) == reconstruct_sorted(ast), f"Mismatch for {sql!r}"
+
+    print("✓ test_reconstruct_matches_reference passed")
+
+
+def test_reconstruct_deep_nesting():
+    """Test reconstruction of deeply nested subqueries"""
+    sql = "SELECT id FROM t"
+    for _ in range(50):
+        sql = f"SELECT * FROM ({sql}) x"
+
+    ast = build_ast(sql)
+    assert reconstruct_from_ast(ast) == reconstruct_sorted(ast)
+    assert reconstruct_from_ast(ast) == sql
+    print("✓ test_reconstruct_deep_nesting passed")
+
+
+def test_reconstruct_skips_empty_children():
+    """Test that children without tokens are not emitted"""
+    root = build_ast("SELECT * FROM (SELECT id FROM t) x")
+    root.children[0].add_child(ASTNode(type=NodeType.EXPRESSION))
+
+    assert reconstruct_from_ast(root) == reconstruct_sorted(root)
+    print("✓ test_reconstruct_skips_empty_children passed")
+
+
+def test_paren_index():
+    """Test paren matching and SELECT group classification"""
+    tokens = SQLLexer("SELECT ((1), (SELECT 2)) + (3").tokenize()
+    paren_match, select_parens = SQLASTBuilder(tokens).paren_index
+
+    opens = [i for i, token in enumerate(tokens) if token.value == '(']
+    closes = [i for i, token in enumerate(tokens) if token.value == ')']
+    assert paren_match == {opens[1]: closes[0], opens[2]: closes[1], opens[0]: closes[2]}
+    assert opens[3] not in paren_match, "Unmatched paren should have no match"
+
+    # SELECT propagates to the enclosing group only
+    assert select_parens == {opens[0], opens[2]}
+    print("✓ test_paren_index passed")
+
+
+def test_paren_index_unmatched():
+    """Test that unmatched groups contain everything after them"""
+    tokens = SQLLexer("SELECT ((1, (SELECT 2").tokenize()
+    paren_match, select_parens = SQLASTBuilder(tokens).paren_index
+
+    opens = [i for i, token in enumerate(tokens) if token.value == '(']
+    assert paren_match == {}
+    assert select_parens == set(opens)
+    print("✓ test_paren_index_unmatched passed")
+
+
+def test_wrapped_subquery_nesting():
+    """Test subqueries wrapped in many redundant parens"""
+    depth = 200
+    sql = "SELECT " + "(" * depth + "SELECT password FROM users" + ")" * depth
+    ast = build_ast(sql)
+
+    node = ast
+    subqueries = 0
+    while node.children:
+        node = node.children[0]
+        subqueries += node.is_subquery()
+
+    assert subqueries == depth
+    assert reconstruct_from_ast(ast) == reconstruct_sorted(ast)
+    print("✓ test_wrapped_subquery_nesting passed")
+
+
+def test_depth_and_ancestors():
+    """Test that depth and ancestor flags are set when nodes are attached"""
+    ast = build_ast("SELECT * FROM (SELECT CONCAT(a, b) FROM t) x")
+
+    select = ast.children[0]
+    subquery = select.children[0]
+    inner = subquery.children[0]
+    func = inner.children[0]
+
+    assert [node.get_depth() for node in (ast, select, subquery, inner, func)] == [0, 1, 2, 3, 4]
+    assert func.type == NodeType.FUNCTION_CALL
+    assert func.has_ancestor(NodeType.SUBQUERY)
+    assert func.has_ancestor(NodeType.ROOT)
+    assert not func.has_ancestor(NodeType.FUNCTION_CALL)
+    assert not select.has_ancestor(NodeType.SUBQUERY)
+
+    # Attaching an already-built subtree updates all of it
+    wrapper = ASTNode(type=NodeType.EXPRESSION)
+    wrapper.add_child(subquery)
+    assert (subquery.depth, inner.depth, func.depth) == (1, 2, 3)
+    assert not func.has_ancestor(NodeType.ROOT)
+    assert func.has_ancestor(NodeType.EXPRESSION)
+    print("✓ test_depth_and_ancestors passed")
+
+
+def transform_node_reference(node: ASTNode, rules: list):
+    """Reference AST transform: every rule checked for every token"""
+    node.tokens = [_apply_all(token, node, rules) for token in node.tokens]
+    for child in node.children:
+        transform_node_reference(child, rules)
+
+
+def _apply_all(token, node, rules):
+    for rule in rules:
+        token = rule.apply(token, node)
+    return token
+
+
+def test_ast_rule_dispatch():
+    """Test that per-node-type dispatch matches checking every rule"""
+    def wrap(token, node):
+        return token.with_value(f'/*!50000{token.value}*/')
+
+    def upper(token, node):
+        return token.with_value(token.value.upper())
+
+    rules = [
+        ASTTransformationRule("top_wrap", wrap, [TokenType.KEYWORD], [NodeType.SELECT_STATEMENT], max_depth=1),
+        ASTTransformationRule("func_upper", upper, [TokenType.IDENTIFIER], [NodeType.FUNCTION_CALL]),
+        ASTTransformationRule("sub_wrap", wrap, [TokenType.KEYWORD, TokenType.IDENTIFIER], max_depth=3),
+    ]
+
+    transformer = ASTTransformer()
+    for rule in rules:
+        transformer.add_rule(rule)
+
+    for sql in CONFORMANCE_CORPUS + NESTED_PAYLOADS:
+        expected = build_ast(sql)
+        transform_node_reference(expected, rules)
+        assert transformer.transform(sql) == reconstruct_from_ast(expected), f"Mismatch for {sql!r}"
+
+    print("✓ test_ast_rule_dispatch passed")
+
+
+def run_all_tests():
+    """Run all AST tests"""
+    print("\n" + "=" * 70)
+    print("Running AST Builder Tests")
+    print("=" * 70 + "\n")
+
+    tests = [
+        test_reconstruct_matches_reference,
+        test_reconstruct_deep_nesting,
+        test_reconstruct_skips_empty_children,
+        test_paren_index,
+        test_paren_index_unmatched,
+        test_wrapped_subquery_nesting,
+        test_depth_and_ancestors,
+        test_ast_rule_dispatch,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} error: {e}")
+            failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
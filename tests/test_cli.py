@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+
+"""
+Command Line Interface Tests
+
+Tests chain resolution and streaming payload files through sqlmap-tamper.
+
+Author: Regaan
+License: GPL v2
+"""
+
+import sys
+import os
+import pickle
+import shutil
+import subprocess
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tamper_scripts'))
+
+from tamper_framework.cli import TamperChain, main, resolve_script, SCRIPTS_DIR
+from tests.test_parallel import build_pipeline, PAYLOADS as ALL_PAYLOADS
+import cloudflare2025
+import cloudflare_space
+import cloudflare_case
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# One payload per line, so multi-line corpus entries are left out
+PAYLOADS = [payload for payload in ALL_PAYLOADS if '\n' not in payload and '\r' not in payload]
+
+
+def run_cli(argv: list, payloads: list) -> list:
+    """Run main() on a temporary payload file and return the output lines"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'payloads.txt')
+        output = os.path.join(tmp, 'out.txt')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(payloads) + '\n')
+
+        assert main(argv + ['-i', source, '-o', output]) == 0
+        with open(output, encoding='utf-8') as f:
+            return f.read().split('\n')[:-1]
+
+
+def test_cli_rule_chain():
+    """Test that framework rules match the equivalent pipeline"""
+    expected = [build_pipeline().transform(payload) for payload in PAYLOADS]
+
+    chain = 'keyword_wrap,space_replace,value_encode,case_alternate'
+    assert run_cli([chain], PAYLOADS) == expected
+    print("✓ test_cli_rule_chain passed")
+
+
+def test_cli_script_chain():
+    """Test chaining tamper scripts, applied left to right"""
+    payloads = PAYLOADS[:20] + [""]
+    expected = [cloudflare_case.tamper(cloudflare_space.tamper(p)) for p in payloads]
+
+    assert run_cli(['cloudflare_space,cloudflare_case'], payloads) == expected
+    # Scripts can also be given by path
+    path = os.path.join(SCRIPTS_DIR, 'cloudflare_space.py')
+    assert run_cli([path], payloads) == [cloudflare_space.tamper(p) for p in payloads]
+    print("✓ test_cli_script_chain passed")
+
+
+def test_cli_parallel():
+    """Test that --jobs output matches a single process"""
+    chain = 'cloudflare2025,cloudflare_case'
+    assert run_cli([chain, '-j', '2', '--chunk-size', '5'], PAYLOADS) == run_cli([chain], PAYLOADS)
+    print("✓ test_cli_parallel passed")
+
+
+def test_tamper_chain():
+    """Test chain resolution, rule fusion and pickling"""
+    chain = TamperChain(['keyword_wrap', 'space_replace', 'cloudflare_case', 'case_alternate'])
+    assert [kind for kind, _ in chain.steps] == ['rules', 'script', 'rules']
+    assert len(chain.steps[0][1]) == 2
+    assert chain.steps[1][1] == resolve_script('cloudflare_case')
+
+    list(chain.transform_many(PAYLOADS[:3]))
+    clone = pickle.loads(pickle.dumps(chain))
+    assert clone.steps == chain.steps
+    assert list(clone.transform_many(PAYLOADS[:3])) == list(chain.transform_many(PAYLOADS[:3]))
+
+    for names in (['no_such_script'], []):
+        try:
+            TamperChain(names)
+            assert False, f"Should have raised ValueError for {names}"
+        except ValueError:
+            pass
+
+    print("✓ test_tamper_chain passed")
+
+
+def test_cli_unknown_name():
+    """Test that unknown chain elements are usage errors"""
+    for argv in (['keyword_wrap,no_such_script'], []):
+        try:
+            main(argv)
+            assert False, f"Should have exited for {argv}"
+        except SystemExit as e:
+            assert e.code == 2
+
+    print("✓ test_cli_unknown_name passed")
+
+
+def test_cli_unopenable_files():
+    """Test that files that cannot be opened are usage errors"""
+    with tempfile.TemporaryDirectory() as tmp:
+        missing = os.path.join(tmp, 'missing.txt')
+        source = os.path.join(tmp, 'payloads.txt')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('SELECT 1\n')
+
+        result = subprocess.run(
+            [sys.executable, '-m', 'tamper_framework.cli', 'keyword_wrap', '-i', missing],
+            capture_output=True, text=True, cwd=ROOT_DIR
+        )
+        assert result.returncode == 2
+        assert 'cannot read' in result.stderr and 'Traceback' not in result.stderr
+
+        # An unwritable output is reported too (a directory cannot be
+        # opened as a file)
+        for argv in (['-i', missing], ['-i', source, '-o', tmp]):
+            try:
+                main(['keyword_wrap'] + argv)
+                assert False, f"Should have exited for {argv}"
+            except SystemExit as e:
+                assert e.code == 2
+
+    print("✓ test_cli_unopenable_files passed")
+
+
+def test_cli_stdin_stdout():
+    """Test streaming stdin to stdout, preserving non-UTF-8 bytes"""
+    payloads = b"1 AND 1=1\nSELECT '\xff'\n\n"
+    result = subprocess.run(
+        [sys.executable, '-m', 'tamper_framework.cli', 'space_replace', '--stats'],
+        input=payloads, capture_output=True, cwd=ROOT_DIR, check=True
+    )
+
+    assert result.stdout == b"1/**/AND/**/1=1\nSELECT/**/'\xff'\n\n"
+    assert b"3 payloads" in result.stderr
+    print("✓ test_cli_stdin_stdout passed")
+
+
+def test_cli_installed():
+    """Test that a built package finds its scripts outside the source tree"""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Build from a copy, so the checkout gets no build/egg-info files
+        source = os.path.join(tmp, 'source')
+        ignore = shutil.ignore_patterns('__pycache__', '*.pyc')
+        for name in ('tamper_framework', 'tamper_scripts'):
+            shutil.copytree(os.path.join(ROOT_DIR, name), os.path.join(source, name), ignore=ignore)
+        for name in ('setup.py', 'README.md', 'MANIFEST.in', 'requirements.txt'):
+            shutil.copy(os.path.join(ROOT_DIR, name), source)
+
+        lib = os.path.join(tmp, 'lib')
+        subprocess.run(
+            [sys.executable, 'setup.py', '-q', 'build', '--build-base', os.path.join(tmp, 'build'), '--build-lib', lib],
+            cwd=source, capture_output=True, check=True
+        )
+        shutil.rmtree(source)
+
+        def run(*args, payloads=''):
+            return subprocess.run(
+                [sys.executable, '-m', 'tamper_framework.cli', *args], input=payloads,
+                capture_output=True, text=True, cwd=tmp, env=dict(os.environ, PYTHONPATH=lib), check=True
+            ).stdout
+
+        assert 'cloudflare2025' in run('--list').split()
+        assert run('cloudflare2025', payloads='SELECT 1 FROM t\n') == cloudflare2025.tamper('SELECT 1 FROM t') + '\n'
+    print("✓ test_cli_installed passed")
+
+
+def run_all_tests():
+    """Run all CLI tests"""
+    print("\n" + "=" * 70)
+    print("Running Command Line Interface Tests")
+    print("=" * 70 + "\n")
+
+    tests = [
+        test_cli_rule_chain,
+        test_cli_script_chain,
+        test_cli_parallel,
+        test_tamper_chain,
+        test_cli_unknown_name,
+        test_cli_unopenable_files,
+        test_cli_stdin_stdout,
+        test_cli_installed,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} error: {e}")
+            failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+"""
+Context Tracker Tests
+
+Tests clause tracking, streaming annotation and context interning.
+
+Author: Regaan
+License: GPL v2
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataclasses import FrozenInstanceError
+
+from tamper_framework.lexer import SQLLexer, TokenType
+from tamper_framework.context import (
+    ClauseType,
+    annotate_tokens_with_context,
+    iter_tokens_with_context,
+    intern_context
+)
+from tests.test_lexer import CONFORMANCE_CORPUS
+
+
+def test_clause_tracking():
+    """Test that keywords switch the current clause"""
+    annotated = annotate_tokens_with_context("SELECT * FROM users WHERE id=1")
+    
+    clauses = {token.value: context.clause for token, context in annotated if token.type != TokenType.WHITESPACE}
+    assert clauses["SELECT"] == ClauseType.SELECT
+    assert clauses["users"] == ClauseType.FROM
+    assert clauses["="] == ClauseType.WHERE
+    print("✓ test_clause_tracking passed")
+
+
+def test_subquery_context():
+    """Test depth and subquery flags inside parentheses"""
+    annotated = annotate_tokens_with_context("SELECT * FROM (SELECT id FROM users) AS sub")
+    
+    ids = [context for token, context in annotated if token.value == "id"]
+    assert ids[0].depth == 1
+    assert ids[0].in_subquery
+    assert ids[0].clause == ClauseType.SELECT
+    
+    sub = [context for token, context in annotated if token.value == "sub"]
+    assert sub[0].depth == 0
+    print("✓ test_subquery_context passed")
+
+
+def test_streaming_matches_list():
+    """Test that the generator yields exactly what the list variant returns"""
+    for query in CONFORMANCE_CORPUS:
+        tokens = SQLLexer(query).tokenize()
+        assert list(iter_tokens_with_context(tokens)) == annotate_tokens_with_context(tokens)
+    print("✓ test_streaming_matches_list passed")
+
+
+def test_streaming_is_lazy():
+    """Test that annotation pulls tokens on demand and can stop early"""
+    pulled = []
+    
+    def token_source():
+        for token in SQLLexer("SELECT a FROM t WHERE id=1").tokenize():
+            pulled.append(token)
+            yield token
+    
+    annotations = iter_tokens_with_context(token_source())
+    token, context = next(annotations)
+    
+    assert token.value == "SELECT"
+    assert context.clause == ClauseType.SELECT
+    assert len(pulled) == 1
+    print("✓ test_streaming_is_lazy passed")
+
+
+def test_interned_contexts():
+    """Test that identical states share one immutable context object"""
+    first = annotate_tokens_with_context("SELECT * FROM users WHERE id=1")
+    second = annotate_tokens_with_context("SELECT name FROM admin WHERE role=2")
+    
+    assert first[-1][1] is second[-1][1]  # Both end in top-level WHERE
+    assert intern_context(ClauseType.WHERE, 0, False, False) is first[-1][1]
+    
+    try:
+        first[0][1].depth = 5
+    except FrozenInstanceError:
+        pass
+    else:
+        raise AssertionError("SQLContext is mutable")
+    
+    print("✓ test_interned_contexts passed")
+
+
+def run_all_tests():
+    """Run all context tests"""
+    print("\n" + "=" * 70)
+    print("Running Context Tracker Tests")
+    print("=" * 70 + "\n")
+    
+    tests = [
+        test_clause_tracking,
+        test_subquery_context,
+        test_streaming_matches_list,
+        test_streaming_is_lazy,
+        test_interned_contexts,
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} error: {e}")
+            failed += 1
+    
+    print(f"\n{passed} passed, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
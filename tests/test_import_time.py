@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+"""
+Import Time Tests
+
+sqlmap imports every --tamper script at startup, so importing the
+framework must not pull in modules a tamper script does not use.
+Each test imports in a fresh interpreter under `python -X importtime`
+and reports the cumulative import time of the top-level module.
+
+Author: Regaan
+License: GPL v2
+"""
+
+import sys
+import os
+import subprocess
+from typing import Dict, Tuple
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tamper_framework
+import tamper_framework.transformations
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed for AST rules, parallel runs or debug token IDs
+HEAVY_MODULES = (
+    'tamper_framework.ast_builder',
+    'tamper_framework.ast_transformer',
+    'tamper_framework.parallel',
+    'concurrent.futures',
+    'multiprocessing',
+    'uuid',
+)
+
+
+def import_times(statement: str) -> Dict[str, Tuple[int, int]]:
+    """Run a statement in a new interpreter: {module: (self us, cumulative us)}"""
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, cwd=ROOT_DIR, env=env
+    )
+    assert result.returncode == 0, result.stderr
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def test_package_import_is_lazy():
+    """Test that importing the package imports none of its submodules"""
+    times = import_times('import tamper_framework')
+
+    loaded = [name for name in times if name.startswith('tamper_framework.')]
+    assert loaded == ['tamper_framework.__version__'], f"Eagerly imported: {loaded}"
+    print(f"  import tamper_framework: {times['tamper_framework'][1] / 1000:.1f} ms")
+    print("✓ test_package_import_is_lazy passed")
+
+
+def test_tamper_script_import():
+    """Test that cloudflare2025 imports only the token pipeline"""
+    statement = (
+        "import sys; sys.path.insert(0, 'tamper_scripts'); path = list(sys.path); "
+        "import cloudflare2025; "
+        "assert sys.path == path, 'sys.path modified'"
+    )
+    times = import_times(statement)
+
+    heavy = [name for name in times if name.startswith(HEAVY_MODULES)]
+    assert not heavy, f"Unneeded imports: {heavy}"
+    print(f"  import cloudflare2025: {times['cloudflare2025'][1] / 1000:.1f} ms")
+    print("✓ test_tamper_script_import passed")
+
+
+def test_lazy_attributes():
+    """Test that every exported name resolves to its defining module's object"""
+    for package in (tamper_framework, tamper_framework.transformations):
+        for name in package.__all__:
+            value = getattr(package, name)
+            module = package._LAZY_ATTRIBUTES.get(name)
+            if module is not None:
+                assert value is getattr(sys.modules[module], name)
+            assert name in dir(package)
+
+        try:
+            package.no_such_name
+            assert False, "Should have raised AttributeError"
+        except AttributeError:
+            pass
+
+    # `from ... import` goes through the same hook
+    from tamper_framework import SQLTransformer
+    from tamper_framework.transformer import SQLTransformer as Defined
+    assert SQLTransformer is Defined
+    print("✓ test_lazy_attributes passed")
+
+
+def test_uuid_token_ids():
+    """Test that the debug UUID strategy still works with uuid imported lazily"""
+    tokens = tamper_framework.SQLLexer("SELECT 1", id_strategy='uuid').tokenize()
+
+    ids = [token.id for token in tokens]
+    assert all(isinstance(token_id, str) and len(token_id) == 36 for token_id in ids)
+    assert len(set(ids)) == len(ids)
+    print("✓ test_uuid_token_ids passed")
+
+
+def run_all_tests():
+    """Run all import time tests"""
+    print("\n" + "=" * 70)
+    print("Running Import Time Tests")
+    print("=" * 70 + "\n")
+
+    tests = [
+        test_package_import_is_lazy,
+        test_tamper_script_import,
+        test_lazy_attributes,
+        test_uuid_token_ids,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} error: {e}")
+            failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
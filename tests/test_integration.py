@@ -158,6 +158,118 @@ def test_complex_real_world():
     print("✓ test_complex_real_world passed")
 
 
+def test_shared_pipeline_threads():
+    """Test that concurrent tamper() calls on the shared pipeline agree with serial ones"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    payloads = [
+        "SELECT * FROM users WHERE id>=5",
+        "UNION SELECT password FROM admin WHERE role='admin'",
+        "SELECT * FROM users WHERE id=(SELECT id FROM admin WHERE role='admin')",
+        "SELECT COUNT(*) FROM users WHERE active=1",
+    ] * 50
+    
+    expected = [tamper(payload) for payload in payloads]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(tamper, payloads))
+    
+    assert results == expected, "Concurrent results differ from serial results!"
+    print("✓ test_shared_pipeline_threads passed")
+
+
+def test_legacy_scripts_standalone():
+    """Test that the standalone scripts load and run outside SQLMap"""
+    import importlib
+    
+    for name in ('cloudflare_case', 'cloudflare_encode', 'cloudflare_keyword', 'cloudflare_space'):
+        module = importlib.import_module(name)
+        result = module.tamper("1 AND 1=1 UNION SELECT password FROM admin")
+        assert isinstance(result, str) and result, f"{name} returned {result!r}"
+    
+    print("✓ test_legacy_scripts_standalone passed")
+
+
+def test_tamper_many():
+    """Test that every script's tamper_many() matches tamper() in order"""
+    import importlib
+    
+    payloads = [
+        "SELECT * FROM users WHERE id>=5",
+        "1' AND SLEEP(5)-- -",
+        "SELECT * FROM users WHERE id>=5",
+        "",
+        "UNION SELECT password FROM admin WHERE role='admin'",
+    ]
+    
+    for name in ('cloudflare2025', 'cloudflare_case', 'cloudflare_encode', 'cloudflare_keyword', 'cloudflare_space'):
+        module = importlib.import_module(name)
+        expected = [module.tamper(payload) for payload in payloads]
+        assert list(module.tamper_many(payloads)) == expected, f"{name} batch differs"
+    
+    print("✓ test_tamper_many passed")
+
+
+def test_tamper_many_passes_bad_payloads_through():
+    """Test that tamper_many() keeps tamper()'s fallbacks instead of raising"""
+    import importlib
+    
+    payloads = ["SELECT 1", None, "", "SELECT 1"]
+    for name in ('cloudflare2025', 'cloudflare_case', 'cloudflare_encode', 'cloudflare_keyword', 'cloudflare_space'):
+        module = importlib.import_module(name)
+        results = list(module.tamper_many(payloads, hints={}))
+        assert results[1:3] == [None, ""], f"{name} changed falsy payloads"
+        assert results[0] == results[3] == module.tamper("SELECT 1")
+    
+    # A failing transformation returns the original payload, as in tamper()
+    import cloudflare2025
+    assert cloudflare2025.tamper(123) == 123
+    assert list(cloudflare2025.tamper_many([123, "SELECT 1"])) == [123, cloudflare2025.tamper("SELECT 1")]
+    
+    # Copied into sqlmap without the framework, the scripts tamper each
+    # payload in turn
+    import cloudflare_case
+    original, cloudflare_case.map_deduplicated = cloudflare_case.map_deduplicated, None
+    try:
+        assert list(cloudflare_case.tamper_many(payloads)) == [cloudflare_case.tamper(p) for p in payloads]
+    finally:
+        cloudflare_case.map_deduplicated = original
+    
+    print("✓ test_tamper_many_passes_bad_payloads_through passed")
+
+
+def test_legacy_scripts_single_pass():
+    """Test that the single-pass scripts match their previous per-keyword versions"""
+    import random
+    from benchmarks.bench_legacy_scripts import SCRIPTS
+    from benchmarks.corpus import all_payloads
+    
+    payloads = all_payloads() + [
+        "sElEcT * FROM users UNION SELECT 1",       # Keyword already alternated
+        "SELECT * FROM xfRoMx WHERE 1",             # Alternated inside a word
+        "jOiNsErT INSERT",                          # Alternated versions overlapping
+        "ſelect İnsert FROM t",                     # Non-ASCII case variants
+        "WHERE a='b=c' AND b=\"x='y'\"",            # '=' inside quoted values
+        "WHERE\t id='WHERE x=1'",
+        "/*!50000SELECT*/ * FROM users",
+    ]
+    
+    # Random payloads built from the pieces the patterns react to
+    atoms = [
+        "WHERE", "having", "SELECT", "sElEcT", "from", "fRoM", "UNION", "İnsert",
+        "INSERT", "jOiN", "sErT", "iNsErT", "oRdEr", "wHeR",
+        " ", "\t", "=", "'", '"', "id", "x", "_", "1", "(", "/*!50000"
+    ]
+    rnd = random.Random(2025)
+    for _ in range(2000):
+        payloads.append(''.join(rnd.choice(atoms) for _ in range(rnd.randint(0, 12))))
+    
+    for name, (legacy, current) in SCRIPTS.items():
+        for payload in payloads:
+            assert current(payload) == legacy(payload), f"{name} differs for {payload!r}"
+    
+    print("✓ test_legacy_scripts_single_pass passed")
+
+
 def run_all_tests():
     """Run all integration tests"""
     print("\n" + "=" * 70)
@@ -178,6 +290,11 @@ def run_all_tests():
         test_deterministic,
         test_empty_payload,
         test_complex_real_world,
+        test_shared_pipeline_threads,
+        test_legacy_scripts_standalone,
+        test_tamper_many,
+        test_tamper_many_passes_bad_payloads_through,
+        test_legacy_scripts_single_pass,
     ]
     
     passed = 0
@@ -13,7 +13,15 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from tamper_framework.lexer import SQLLexer, TokenType
+from tamper_framework.lexer import (
+    SQLLexer,
+    TokenType,
+    TokenStream,
+    tokenize_cached,
+    configure_token_cache,
+    token_cache_info,
+    TOKEN_CACHE_SIZE
+)
 
 
 def test_simple_select():
@@ -160,6 +168,44 @@ def test_uuid_uniqueness():
     print("✓ test_uuid_uniqueness passed")
 
 
+def test_token_id_strategies():
+    """Test counter IDs, UUID debug IDs and custom ID callables"""
+    query = "SELECT * FROM users WHERE id=1"
+    
+    # Default counter IDs are ints, unique across lexers
+    first = SQLLexer(query).tokenize()
+    second = SQLLexer(query).tokenize()
+    ids = [t.id for t in first + second]
+    assert all(isinstance(i, int) for i in ids)
+    assert len(ids) == len(set(ids)), "Counter IDs collide across lexers!"
+    
+    # UUID debug mode
+    tokens = SQLLexer(query, id_strategy='uuid').tokenize()
+    assert all(isinstance(t.id, str) and len(t.id) == 36 for t in tokens)
+    assert len({t.id for t in tokens}) == len(tokens)
+    
+    # Custom callable
+    sequence = iter(range(100, 200))
+    tokens = SQLLexer(query, id_strategy=lambda: next(sequence)).tokenize()
+    assert [t.id for t in tokens] == list(range(100, 100 + len(tokens)))
+    
+    # IDs too large for the packed stream fall back to a list
+    big = iter(range(2 ** 128, 2 ** 128 + 100))
+    stream = SQLLexer(query, id_strategy=lambda: next(big)).tokenize_stream()
+    assert stream.ids[0] == 2 ** 128
+    assert stream.reconstruct() == query
+    
+    # Unknown strategy name
+    try:
+        SQLLexer(query, id_strategy='nope')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown ID strategy was accepted")
+    
+    print("✓ test_token_id_strategies passed")
+
+
 def test_position_tracking():
     """Test position tracking"""
     query = "SELECT * FROM users"
@@ -177,6 +223,173 @@ def test_position_tracking():
     print("✓ test_position_tracking passed")
 
 
+# Payloads used across the test suite, plus lexer edge cases
+CONFORMANCE_CORPUS = [
+    "SELECT * FROM users",
+    "SELECT * FROM users WHERE id>=5",
+    "SELECT * FROM users WHERE id<=10",
+    "SELECT * FROM users WHERE id<>1",
+    "SELECT * FROM users WHERE name!='admin'",
+    "SELECT 'admin' FROM users",
+    "SELECT 'it''s escaped' FROM users",
+    "/* comment */ SELECT * FROM users",
+    "SELECT * FROM users -- comment",
+    "SELECT user.id, user.name FROM users AS user WHERE user.role='admin' AND user.active=1",
+    "SELECT * FROM (SELECT id FROM users) AS sub",
+    "UNION SELECT password FROM admin",
+    "SELECT * FROM users WHERE id=1 AND 1=1",
+    "SELECT * FROM users WHERE id=1 AND SLEEP(5)",
+    "SELECT * FROM users WHERE id=1 AND (SELECT 1 FROM(SELECT COUNT(*),CONCAT(version(),0x3a,FLOOR(RAND(0)*2))x FROM information_schema.tables GROUP BY x)a)",
+    "SELECT * FROM users; DROP TABLE users",
+    "SELECT * FROM users WHERE id=(SELECT id FROM admin WHERE role='admin')",
+    "SELECT COUNT(*) FROM users WHERE active=1",
+    "SELECT * FROM users WHERE name='admin' AND role='superuser'",
+    "UNION ALL SELECT NULL,NULL,CONCAT(0x7e,JSON_ARRAYAGG(CONCAT_WS(0x3a,table_schema,table_name)),0x7e) FROM information_schema.tables WHERE table_schema NOT IN (0x696e666f726d6174696f6e5f736368656d61,0x6d7973716c,0x706572666f726d616e63655f736368656d61,0x737973)",
+    "SELECT 'a\\'b' FROM t",
+    "SELECT \"dq \"\" inside\" FROM t",
+    "SELECT 'unterminated",
+    "SELECT 'trailing backslash\\",
+    "SELECT /* unterminated",
+    "SELECT 1.5.2, .5, 3. FROM t",
+    "SELECT a||b, c&&d, e<<2, f>>1, ~g, h^i FROM t",
+    "SELECT\n\t*\r\nFROM users\n-- line\nWHERE id=1",
+    "SELECT `col`, @var, #x, $y FROM t",
+    "SELECT * FROM t WHERE a--b",
+    "SELECT é, café FROM t",
+    "",
+]
+
+
+def test_engine_conformance():
+    """Test that the regex and scanner engines produce identical token streams"""
+    for query in CONFORMANCE_CORPUS:
+        streams = []
+        for engine in SQLLexer.ENGINES:
+            tokens = SQLLexer(query, engine=engine).tokenize()
+            streams.append([
+                (t.type, t.value, t.position, t.line, t.column) for t in tokens
+            ])
+        
+        assert streams[0] == streams[1], f"Engines disagree on {query!r}"
+    
+    print("✓ test_engine_conformance passed")
+
+
+def test_unknown_engine():
+    """Test that an unknown engine name is rejected"""
+    try:
+        SQLLexer("SELECT 1", engine="nope")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown engine was accepted")
+    
+    print("✓ test_unknown_engine passed")
+
+
+def test_slotted_tokens():
+    """Test that tokens carry no per-instance __dict__"""
+    tokens = SQLLexer("SELECT 1").tokenize()
+    assert not hasattr(tokens[0], '__dict__')
+    
+    rewritten = tokens[0].with_value("sElEcT")
+    assert rewritten.value == "sElEcT"
+    assert rewritten.id == tokens[0].id
+    assert rewritten.position == tokens[0].position
+    assert tokens[0].value == "SELECT"
+    print("✓ test_slotted_tokens passed")
+
+
+def test_token_stream():
+    """Test that TokenStream matches tokenize() and supports rewrites"""
+    for query in CONFORMANCE_CORPUS:
+        for engine in SQLLexer.ENGINES:
+            tokens = SQLLexer(query, engine=engine).tokenize()
+            stream = SQLLexer(query, engine=engine).tokenize_stream()
+            
+            assert len(stream) == len(tokens)
+            assert [
+                (t.type, t.value, t.position, t.line, t.column) for t in stream
+            ] == [
+                (t.type, t.value, t.position, t.line, t.column) for t in tokens
+            ], f"TokenStream differs from tokenize() on {query!r}"
+            assert stream.reconstruct() == query
+    
+    # Rewrites change values without touching the source
+    stream = SQLLexer("SELECT * FROM users").tokenize_stream()
+    stream.rewrite(0, "/*!50000SELECT*/")
+    assert stream.value(0) == "/*!50000SELECT*/"
+    assert stream.type(0) == TokenType.KEYWORD
+    assert stream.reconstruct() == "/*!50000SELECT*/ * FROM users"
+    
+    # Packing rewritten tokens keeps their values
+    tokens = SQLLexer("SELECT 1").tokenize()
+    tokens[0] = tokens[0].with_value("sElEcT")
+    assert TokenStream.from_tokens("SELECT 1", tokens).reconstruct() == "sElEcT 1"
+    
+    print("✓ test_token_stream passed")
+
+
+def test_token_cache():
+    """Test that each distinct payload is lexed once while cached"""
+    configure_token_cache(4)
+    try:
+        query = "SELECT * FROM users WHERE id=1"
+        first = tokenize_cached(query)
+        second = tokenize_cached(query)
+        
+        assert isinstance(first, tuple)
+        assert first is second
+        assert SQLLexer.reconstruct(first) == query
+        assert token_cache_info().hits == 1
+        assert token_cache_info().misses == 1
+        
+        # Cached tokens are shared, so they cannot be mutated
+        try:
+            first[0].value = "DROP"
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError("Cached token was mutated")
+        assert first[0].with_value("sElEcT").value == "sElEcT"
+        assert tokenize_cached(query)[0].value == "SELECT"
+        
+        # Disabled cache still tokenizes
+        configure_token_cache(0)
+        assert token_cache_info() is None
+        assert tokenize_cached(query) is not tokenize_cached(query)
+    finally:
+        configure_token_cache(TOKEN_CACHE_SIZE)
+    
+    print("✓ test_token_cache passed")
+
+
+def test_iter_tokens():
+    """Test that iter_tokens() yields the tokenize() stream lazily"""
+    for query in CONFORMANCE_CORPUS:
+        for engine in SQLLexer.ENGINES:
+            expected = [
+                (t.type, t.value, t.position, t.line, t.column)
+                for t in SQLLexer(query, engine=engine).tokenize()
+            ]
+            streamed = [
+                (t.type, t.value, t.position, t.line, t.column)
+                for t in SQLLexer(query, engine=engine).iter_tokens()
+            ]
+            assert streamed == expected, f"iter_tokens() differs on {query!r} ({engine})"
+    
+    # Early stop: the first token is available without lexing the rest
+    columns = ",".join("NULL" for _ in range(5000))
+    lexer = SQLLexer(f"UNION ALL SELECT {columns}", engine="scanner")
+    tokens = lexer.iter_tokens()
+    first = next(tokens)
+    assert first.value == "UNION"
+    assert lexer.position == len("UNION")
+    assert lexer.tokens == []
+    
+    print("✓ test_iter_tokens passed")
+
+
 def run_all_tests():
     """Run all lexer tests"""
     print("\n" + "=" * 70)
@@ -192,7 +405,14 @@ def run_all_tests():
         test_complex_query,
         test_subquery,
         test_uuid_uniqueness,
+        test_token_id_strategies,
         test_position_tracking,
+        test_engine_conformance,
+        test_unknown_engine,
+        test_slotted_tokens,
+        test_token_stream,
+        test_token_cache,
+        test_iter_tokens,
     ]
     
     passed = 0
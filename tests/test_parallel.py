@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+"""
+Parallel Transformer Tests
+
+Tests multi-process batch transformation and ordering.
+
+Author: Regaan
+License: GPL v2
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tamper_framework.transformer import SQLTransformer
+from tamper_framework.transformations import (
+    create_keyword_wrap_rule,
+    create_space_replace_rule,
+    create_case_alternate_rule,
+    create_value_encode_rule,
+    KEYWORD_WRAP_SPEC,
+    SPACE_REPLACE_SPEC,
+    CASE_ALTERNATE_SPEC,
+    VALUE_ENCODE_SPEC
+)
+from tamper_framework.parallel import ParallelTransformer
+from tests.test_lexer import CONFORMANCE_CORPUS
+
+
+def build_pipeline() -> SQLTransformer:
+    """Picklable pipeline factory (module-level function)"""
+    transformer = SQLTransformer()
+    transformer.add_rule(create_keyword_wrap_rule())
+    transformer.add_rule(create_space_replace_rule())
+    transformer.add_rule(create_value_encode_rule())
+    transformer.add_rule(create_case_alternate_rule())
+    return transformer
+
+
+PAYLOADS = [f"{sql} AND {i}={i}" for i, sql in enumerate(CONFORMANCE_CORPUS * 5)]
+
+
+def test_parallel_matches_serial():
+    """Test that worker output matches a single transformer, in order"""
+    expected = [build_pipeline().transform(payload) for payload in PAYLOADS]
+
+    executor = ParallelTransformer(build_pipeline, jobs=2, chunk_size=7)
+    assert list(executor.map(PAYLOADS)) == expected
+    print("✓ test_parallel_matches_serial passed")
+
+
+def test_parallel_in_process():
+    """Test that jobs=1 transforms without a process pool"""
+    expected = [build_pipeline().transform(payload) for payload in PAYLOADS]
+
+    executor = ParallelTransformer(build_pipeline, jobs=1)
+    assert list(executor.map(iter(PAYLOADS))) == expected
+    print("✓ test_parallel_in_process passed")
+
+
+def test_parallel_map_file():
+    """Test transforming a payload file line by line"""
+    payloads = PAYLOADS[:20] + [""]
+    expected = [build_pipeline().transform(payload) for payload in payloads]
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write('\n'.join(payloads) + '\n')
+    try:
+        executor = ParallelTransformer(build_pipeline, jobs=2, chunk_size=4)
+        assert list(executor.map_file(f.name)) == expected
+    finally:
+        os.unlink(f.name)
+
+    print("✓ test_parallel_map_file passed")
+
+
+def test_parallel_from_specs():
+    """Test shipping rule specs (not closures) to workers"""
+    import pickle
+
+    specs = [KEYWORD_WRAP_SPEC, SPACE_REPLACE_SPEC, VALUE_ENCODE_SPEC, CASE_ALTERNATE_SPEC]
+    expected = [build_pipeline().transform(payload) for payload in PAYLOADS]
+
+    executor = ParallelTransformer.from_specs(specs, jobs=2, chunk_size=16)
+    pickle.dumps(executor.pipeline_factory)  # Must not raise
+    assert list(executor.map(PAYLOADS)) == expected
+    print("✓ test_parallel_from_specs passed")
+
+
+def test_parallel_invalid_arguments():
+    """Test validation of jobs and chunk_size"""
+    for kwargs in ({'jobs': 0}, {'chunk_size': 0}):
+        try:
+            ParallelTransformer(build_pipeline, **kwargs)
+            assert False, f"Should have raised ValueError for {kwargs}"
+        except ValueError:
+            pass
+
+    print("✓ test_parallel_invalid_arguments passed")
+
+
+def run_all_tests():
+    """Run all parallel tests"""
+    print("\n" + "=" * 70)
+    print("Running Parallel Transformer Tests")
+    print("=" * 70 + "\n")
+
+    tests = [
+        test_parallel_matches_serial,
+        test_parallel_in_process,
+        test_parallel_map_file,
+        test_parallel_from_specs,
+        test_parallel_invalid_arguments,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} error: {e}")
+            failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+
+"""
+Profiling Tests
+
+Tests per-stage and per-rule instrumentation of the transformers.
+
+Author: Regaan
+License: GPL v2
+"""
+
+import sys
+import os
+import json
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tamper_framework.lexer import TokenType
+from tamper_framework.cache import LRUCache
+from tamper_framework.ast_transformer import ASTTransformer, ASTTransformationRule
+from tamper_framework.profiling import PipelineStats
+from tests.test_parallel import build_pipeline
+from tests.test_lexer import CONFORMANCE_CORPUS
+
+
+def test_profiled_output_unchanged():
+    """Test that the instrumented path produces the same output"""
+    expected = [build_pipeline().transform(sql) for sql in CONFORMANCE_CORPUS]
+
+    transformer = build_pipeline()
+    transformer.enable_profiling()
+    assert [transformer.transform(sql) for sql in CONFORMANCE_CORPUS] == expected
+    assert list(transformer.transform_many(CONFORMANCE_CORPUS)) == expected
+    print("✓ test_profiled_output_unchanged passed")
+
+
+def test_pipeline_stats():
+    """Test stage and rule measurements of SQLTransformer"""
+    transformer = build_pipeline()
+    stats = transformer.enable_profiling()
+    assert transformer.enable_profiling() is stats
+
+    sql = "SELECT * FROM users WHERE id>=5"
+    transformer.transform(sql)
+    transformer.transform(sql)
+
+    assert stats.payloads == 2
+    assert list(stats.stages) == ['tokenize', 'context', 'rules', 'reconstruct']
+    assert all(stage.calls == 2 and stage.seconds >= 0 for stage in stats.stages.values())
+    assert list(stats.rules) == ['keyword_wrap', 'space_replace', 'value_encode', 'case_alternate']
+
+    # 3 keywords and 5 spaces per payload
+    keyword_wrap = stats.rules['keyword_wrap']
+    assert (keyword_wrap.tokens_touched, keyword_wrap.tokens_rewritten) == (6, 6)
+    assert stats.rules['space_replace'].tokens_rewritten == 10
+    # value_encode is given both operators, is applied to the one in
+    # WHERE, and rewrites it
+    value_encode = stats.rules['value_encode']
+    assert (value_encode.tokens_touched, value_encode.tokens_applied, value_encode.tokens_rewritten) == (4, 2, 2)
+    assert value_encode.hit_rate == 0.5
+    assert all(rule.calls == 2 and rule.skipped == 0 for rule in stats.rules.values())
+    print("✓ test_pipeline_stats passed")
+
+
+def test_memo_profiling():
+    """Test memo hit/miss counts of pure rules"""
+    transformer = build_pipeline()
+    stats = transformer.enable_profiling()
+    transformer.transform("SELECT a FROM t")
+    transformer.transform("SELECT b FROM u")
+
+    # Keywords were precomputed by compile(); the space is computed once
+    keyword_wrap = stats.rules['keyword_wrap']
+    assert (keyword_wrap.memo_hits, keyword_wrap.memo_misses) == (4, 0)
+    case_alternate = stats.rules['case_alternate']
+    assert (case_alternate.memo_hits, case_alternate.memo_misses) == (4, 0)
+    space_replace = stats.rules['space_replace']
+    assert (space_replace.memo_hits, space_replace.memo_misses) == (5, 1)
+    # value_encode is not pure
+    assert stats.rules['value_encode'].memo_hits == stats.rules['value_encode'].memo_misses == 0
+    assert transformer.memo_sizes()['space_replace'] == 1
+    print("✓ test_memo_profiling passed")
+
+
+def test_adaptive_profiling():
+    """Test that rules dropped in adaptive mode are counted as skipped"""
+    transformer = build_pipeline()
+    transformer.adaptive = True
+    stats = transformer.enable_profiling()
+
+    expected = [build_pipeline().transform(sql) for sql in CONFORMANCE_CORPUS]
+    assert [transformer.transform(sql) for sql in CONFORMANCE_CORPUS] == expected
+
+    stats.reset()
+    transformer.transform("SELECT a>=b FROM t")
+    transformer.transform("SELECT a FROM t WHERE b>=1")
+
+    value_encode = stats.rules['value_encode']
+    assert (value_encode.calls, value_encode.skipped) == (1, 1)
+    assert (value_encode.tokens_touched, value_encode.tokens_applied) == (1, 1)
+    assert stats.rules['keyword_wrap'].calls == 2
+    print("✓ test_adaptive_profiling passed")
+
+
+def test_profiling_cache_hits():
+    """Test that result cache hits are not profiled as pipeline runs"""
+    transformer = build_pipeline()
+    transformer.cache = LRUCache(16)
+
+    stats = transformer.enable_profiling()
+    for _ in range(3):
+        transformer.transform("SELECT 1")
+
+    assert stats.payloads == 1
+    assert transformer.cache_info().hits == 2
+    print("✓ test_profiling_cache_hits passed")
+
+
+def test_disable_profiling():
+    """Test that disabling stops collection and returns the stats"""
+    transformer = build_pipeline()
+    stats = transformer.enable_profiling()
+    transformer.transform("SELECT 1")
+
+    assert transformer.disable_profiling() is stats
+    assert transformer.stats is None
+    transformer.transform("SELECT 2")
+    assert stats.payloads == 1
+    print("✓ test_disable_profiling passed")
+
+
+def test_stats_json():
+    """Test JSON export and reset"""
+    transformer = build_pipeline()
+    stats = transformer.enable_profiling()
+    transformer.transform("SELECT * FROM users")
+
+    data = json.loads(stats.to_json())
+    assert data == stats.to_dict()
+    assert data['payloads'] == 1
+    assert set(data['rules']['keyword_wrap']) == {
+        'calls', 'skipped', 'seconds', 'tokens_touched', 'tokens_applied', 'tokens_rewritten', 'hit_rate',
+        'memo_hits', 'memo_misses'
+    }
+
+    stats.reset()
+    assert stats.to_dict() == PipelineStats().to_dict()
+    print("✓ test_stats_json passed")
+
+
+def test_ast_profiling():
+    """Test stage and rule measurements of ASTTransformer"""
+    def upper(token, node):
+        return token.with_value(token.value.upper())
+
+    transformer = ASTTransformer()
+    transformer.add_rule(ASTTransformationRule("upper", upper, [TokenType.KEYWORD]))
+
+    sql = "select * from (select id from t) x"
+    expected = transformer.transform(sql)
+    stats = transformer.enable_profiling()
+    assert transformer.transform(sql) == expected
+
+    assert list(stats.stages) == ['tokenize', 'build', 'rules', 'reconstruct']
+    assert stats.rules['upper'].tokens_rewritten == 4
+    assert stats.rules['upper'].tokens_touched >= 4
+    print("✓ test_ast_profiling passed")
+
+
+def run_all_tests():
+    """Run all profiling tests"""
+    print("\n" + "=" * 70)
+    print("Running Profiling Tests")
+    print("=" * 70 + "\n")
+
+    tests = [
+        test_profiled_output_unchanged,
+        test_pipeline_stats,
+        test_memo_profiling,
+        test_adaptive_profiling,
+        test_profiling_cache_hits,
+        test_disable_profiling,
+        test_stats_json,
+        test_ast_profiling,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} error: {e}")
+            failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+
+"""
+Span Scanner Tests
+
+Tests string/comment span detection and code-only substitution.
+
+Author: Regaan
+License: GPL v2
+"""
+
+import sys
+import os
+import re
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tamper_scripts'))
+
+from tamper_framework.scanner import SpanScanner, SpanType
+from benchmarks.corpus import all_payloads
+import cloudflare_space
+
+
+def span_texts(scanner: SpanScanner, payload: str) -> list:
+    """(type, text) for every span of a payload"""
+    return [(span.type, payload[span.start:span.end]) for span in scanner.spans(payload)]
+
+
+def test_spans():
+    """Test splitting a payload into code, string and comment spans"""
+    payload = "SELECT 'a b', \"x\" FROM t /* c */ WHERE id=1 -- d"
+
+    assert span_texts(SpanScanner(), payload) == [
+        (SpanType.CODE, "SELECT "),
+        (SpanType.STRING, "'a b'"),
+        (SpanType.CODE, ", "),
+        (SpanType.STRING, '"x"'),
+        (SpanType.CODE, " FROM t "),
+        (SpanType.COMMENT, "/* c */"),
+        (SpanType.CODE, " WHERE id=1 "),
+        (SpanType.COMMENT, "-- d"),
+    ]
+    assert SpanScanner().spans("") == []
+    print("✓ test_spans passed")
+
+
+def test_span_quoting():
+    """Test escaped quotes, mixed quotes and unterminated spans"""
+    scanner = SpanScanner()
+
+    # A quote after a backslash neither opens nor closes a string
+    assert span_texts(scanner, "a\\'b 'c\\'d' e") == [
+        (SpanType.CODE, "a\\'b "),
+        (SpanType.STRING, "'c\\'d'"),
+        (SpanType.CODE, " e"),
+    ]
+    # The other quote kind does not end a string
+    assert span_texts(scanner, "'it\"s' x") == [(SpanType.STRING, "'it\"s'"), (SpanType.CODE, " x")]
+    # Unterminated strings and comments run to the end
+    assert span_texts(scanner, "x 'abc") == [(SpanType.CODE, "x "), (SpanType.STRING, "'abc")]
+    assert span_texts(scanner, "x /* abc") == [(SpanType.CODE, "x "), (SpanType.COMMENT, "/* abc")]
+    # Comment markers inside strings are part of the string
+    assert span_texts(scanner, "'-- x'") == [(SpanType.STRING, "'-- x'")]
+    print("✓ test_span_quoting passed")
+
+
+def test_spans_without_comments():
+    """Test that comments=False treats comment markers as code"""
+    payload = "a /* 'b' */"
+    assert span_texts(SpanScanner(comments=False), payload) == [
+        (SpanType.CODE, "a /* "),
+        (SpanType.STRING, "'b'"),
+        (SpanType.CODE, " */"),
+    ]
+    print("✓ test_spans_without_comments passed")
+
+
+def test_compile_sub():
+    """Test that substitutions only rewrite code spans"""
+    scanner = SpanScanner()
+    payload = "SELECT 'a b' FROM t /* c d */ WHERE x"
+
+    replace_spaces = scanner.compile_sub(r' ', '/**/')
+    assert replace_spaces(payload) == "SELECT/**/'a b'/**/FROM/**/t/**//* c d *//**/WHERE/**/x"
+    assert replace_spaces("no_spaces") == "no_spaces"
+
+    # Literal replacement, not a template
+    assert scanner.compile_sub(r'x', r'\1\\')("x 'x'") == "\\1\\\\ 'x'"
+
+    # Callable replacement and flags
+    upper = scanner.compile_sub(r'select|from', lambda match: match.group().upper(), re.IGNORECASE)
+    assert upper("select 'select' from t") == "SELECT 'select' FROM t"
+    print("✓ test_compile_sub passed")
+
+
+def test_cloudflare_space_spans():
+    """Test that cloudflare_space on spans matches its character loop"""
+    assert cloudflare_space._replace_spaces is not None, "Scanner not used"
+
+    payloads = all_payloads() + [
+        "SELECT 'a b' FROM t",
+        "a\\' b 'c d",
+        "x /**/ y  /** z",
+        "\"it's here\" and 'that\"s' too",
+    ]
+
+    atoms = [" ", " ", "'", '"', "\\", "/**", "/**/", "a", "--", "\n"]
+    rnd = random.Random(2025)
+    for _ in range(2000):
+        payloads.append(''.join(rnd.choice(atoms) for _ in range(rnd.randint(0, 12))))
+
+    for payload in payloads:
+        expected = cloudflare_space._replace_spaces_chars(payload)
+        assert cloudflare_space._replace_spaces(payload) == expected, f"Differs for {payload!r}"
+
+    print("✓ test_cloudflare_space_spans passed")
+
+
+def run_all_tests():
+    """Run all scanner tests"""
+    print("\n" + "=" * 70)
+    print("Running Span Scanner Tests")
+    print("=" * 70 + "\n")
+
+    tests = [
+        test_spans,
+        test_span_quoting,
+        test_spans_without_comments,
+        test_compile_sub,
+        test_cloudflare_space_spans,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} error: {e}")
+            failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
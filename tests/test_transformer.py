@@ -13,14 +13,45 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from tamper_framework.transformer import SQLTransformer
+from tamper_framework.transformer import (
+    SQLTransformer,
+    TransformationRule,
+    RuleSpec,
+    register_transform
+)
 from tamper_framework.transformations import (
     create_keyword_wrap_rule,
     create_space_replace_rule,
     create_case_alternate_rule,
-    create_value_encode_rule
+    create_value_encode_rule,
+    KEYWORD_WRAP_SPEC,
+    SPACE_REPLACE_SPEC,
+    CASE_ALTERNATE_SPEC,
+    VALUE_ENCODE_SPEC
+)
+from tamper_framework.lexer import (
+    SQLLexer,
+    Token,
+    TokenType,
+    configure_token_cache,
+    token_cache_info,
+    TOKEN_CACHE_SIZE
 )
-from tamper_framework.lexer import SQLLexer, TokenType
+from tamper_framework.ast_transformer import ASTTransformer
+from tamper_framework.context import ClauseType, annotate_tokens_with_context
+from tamper_framework.cache import BATCH_DEDUPE_SIZE, LRUCache, ValueMemo, map_deduplicated
+from tests.test_lexer import CONFORMANCE_CORPUS
+
+
+def transform_sequential(transformer, sql):
+    """Reference path: apply each rule over the whole token list in turn"""
+    lexer = SQLLexer(sql)
+    annotated = annotate_tokens_with_context(lexer.tokenize())
+    for rule in transformer.rules:
+        annotated = transformer._apply_rule(annotated, rule)
+    for rule in transformer.rules:
+        rule.reset()
+    return lexer.reconstruct([token for token, _ in annotated])
 
 
 def test_keyword_wrap():
@@ -189,6 +220,486 @@ def test_no_reapplication():
     print("✓ test_no_reapplication passed")
 
 
+def test_compiled_pipeline_matches_sequential():
+    """Test that the fused single-pass pipeline equals sequential rule passes"""
+    transformer = SQLTransformer()
+    transformer.add_rule(create_keyword_wrap_rule())
+    transformer.add_rule(create_space_replace_rule())
+    transformer.add_rule(create_value_encode_rule())
+    transformer.add_rule(create_case_alternate_rule())
+    
+    # Keyword rules are never dispatched to whitespace tokens
+    dispatch = transformer.compile()
+    assert [rule.name for _, rule in dispatch[TokenType.WHITESPACE]] == ["space_replace"]
+    assert [rule.name for _, rule in dispatch[TokenType.KEYWORD]] == ["keyword_wrap", "case_alternate"]
+    assert TokenType.STRING_LITERAL not in dispatch
+    
+    for query in CONFORMANCE_CORPUS:
+        assert transformer.transform(query) == transform_sequential(transformer, query), \
+            f"Compiled pipeline differs on {query!r}"
+    
+    print("✓ test_compiled_pipeline_matches_sequential passed")
+
+
+def test_compiled_pipeline_type_change():
+    """Test that a rule changing the token type re-dispatches later rules"""
+    def number_to_identifier(token, context):
+        return Token(
+            token.id, TokenType.IDENTIFIER, f"n{token.value}",
+            token.position, token.line, token.column
+        )
+    
+    def quote_identifier(token, context):
+        return token.with_value(f"`{token.value}`")
+    
+    transformer = SQLTransformer()
+    transformer.add_rule(TransformationRule(
+        name="quote_identifier_early",
+        transform_func=quote_identifier,
+        target_types=[TokenType.IDENTIFIER],
+    ))
+    transformer.add_rule(TransformationRule(
+        name="number_to_identifier",
+        transform_func=number_to_identifier,
+        target_types=[TokenType.NUMBER],
+    ))
+    transformer.add_rule(TransformationRule(
+        name="quote_identifier_late",
+        transform_func=quote_identifier,
+        target_types=[TokenType.IDENTIFIER],
+    ))
+    
+    query = "SELECT a FROM t WHERE id=1"
+    result = transformer.transform(query)
+    assert result == transform_sequential(transformer, query)
+    assert result == "SELECT ``a`` FROM ``t`` WHERE ``id``=`n1`"
+    
+    print("✓ test_compiled_pipeline_type_change passed")
+
+
+def test_rules_hold_no_per_call_state():
+    """Test that transform() keeps reapplication tracking out of the rules"""
+    rule = create_keyword_wrap_rule()
+    transformer = SQLTransformer()
+    transformer.add_rule(rule)
+    
+    result = transformer.transform("SELECT * FROM users")
+    assert result == "/*!50000SELECT*/ * /*!50000FROM*/ users"
+    assert not rule.transformed_ids, "Per-call state leaked into the shared rule"
+    print("✓ test_rules_hold_no_per_call_state passed")
+
+
+def test_lru_cache():
+    """Test LRU eviction and hit/miss counters"""
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.put("c", 3)           # Evicts "b"
+    
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (2, 1, 2, 2)
+    print("✓ test_lru_cache passed")
+
+
+def test_result_cache():
+    """Test payload memoization in SQLTransformer"""
+    transformer = SQLTransformer(cache_size=8)
+    transformer.add_rule(create_keyword_wrap_rule())
+    transformer.add_rule(create_space_replace_rule())
+    
+    query = "SELECT * FROM users WHERE id=1"
+    first = transformer.transform(query)
+    second = transformer.transform(query)
+    assert first == second
+    assert transformer.cache_info().hits == 1
+    assert transformer.cache_info().misses == 1
+    
+    # Adding a rule invalidates cached results
+    transformer.add_rule(create_case_alternate_rule())
+    assert transformer.cache_info().currsize == 0
+    assert "sElEcT" in transformer.transform(query)
+    
+    # Caching disabled by default
+    assert SQLTransformer().cache_info() is None
+    print("✓ test_result_cache passed")
+
+
+def test_result_cache_bypassed_for_nondeterministic_rules():
+    """Test that a non-deterministic rule disables result caching"""
+    import random
+    
+    def random_case(token, context):
+        return token.with_value(''.join(
+            char.upper() if random.random() < 0.5 else char.lower()
+            for char in token.value
+        ))
+    
+    transformer = SQLTransformer(cache_size=8)
+    transformer.add_rule(TransformationRule(
+        name="random_case",
+        transform_func=random_case,
+        target_types=[TokenType.KEYWORD],
+        deterministic=False
+    ))
+    
+    for _ in range(3):
+        transformer.transform("SELECT * FROM users")
+    
+    info = transformer.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 0, 0)
+    print("✓ test_result_cache_bypassed_for_nondeterministic_rules passed")
+
+
+def test_token_cache_shared():
+    """Test that transformers and the context annotator share lexed payloads"""
+    configure_token_cache(16)
+    try:
+        query = "SELECT * FROM users WHERE id>=5"
+        
+        transformer = SQLTransformer()
+        transformer.add_rule(create_keyword_wrap_rule())
+        transformer.transform(query)
+        ASTTransformer().transform(query)
+        annotated = annotate_tokens_with_context(query)
+        
+        info = token_cache_info()
+        assert (info.misses, info.hits) == (1, 2), f"Payload lexed more than once: {info}"
+        assert SQLLexer.reconstruct([token for token, _ in annotated]) == query
+    finally:
+        configure_token_cache(TOKEN_CACHE_SIZE)
+    
+    print("✓ test_token_cache_shared passed")
+
+
+def test_transform_without_token_cache():
+    """Test that the streaming lexer path gives the same output as the cached one"""
+    transformer = SQLTransformer()
+    transformer.add_rule(create_keyword_wrap_rule())
+    transformer.add_rule(create_space_replace_rule())
+    transformer.add_rule(create_value_encode_rule())
+    transformer.add_rule(create_case_alternate_rule())
+    
+    cached = [transformer.transform(query) for query in CONFORMANCE_CORPUS]
+    configure_token_cache(0)
+    try:
+        streamed = [transformer.transform(query) for query in CONFORMANCE_CORPUS]
+    finally:
+        configure_token_cache(TOKEN_CACHE_SIZE)
+    
+    assert streamed == cached
+    print("✓ test_transform_without_token_cache passed")
+
+
+def test_transform_many():
+    """Test batch transformation order, deduplication and laziness"""
+    calls = []
+    
+    def tag_keyword(token, context):
+        calls.append(token.value)
+        return token.with_value(f'/*!50000{token.value}*/')
+    
+    transformer = SQLTransformer()
+    transformer.add_rule(TransformationRule(
+        name="tag_keyword",
+        transform_func=tag_keyword,
+        target_types=[TokenType.KEYWORD]
+    ))
+    
+    payloads = ["SELECT 1", "UNION SELECT 2", "SELECT 1", "", "SELECT 1"]
+    results = transformer.transform_many(iter(payloads))
+    assert not calls, "transform_many() should be lazy"
+    
+    results = list(results)
+    assert calls == ["SELECT", "UNION", "SELECT"], f"Duplicates transformed again: {calls}"
+    assert results == [transformer.transform(payload) for payload in payloads]
+    print("✓ test_transform_many passed")
+
+
+def test_transform_many_nondeterministic():
+    """Test that duplicates are not shared when a rule is nondeterministic"""
+    counter = iter(range(100))
+    
+    def number_keyword(token, context):
+        return token.with_value(f'{token.value}{next(counter)}')
+    
+    transformer = SQLTransformer()
+    transformer.add_rule(TransformationRule(
+        name="number_keyword",
+        transform_func=number_keyword,
+        target_types=[TokenType.KEYWORD],
+        deterministic=False
+    ))
+    
+    assert list(transformer.transform_many(["SELECT", "SELECT"])) == ["SELECT0", "SELECT1"]
+    print("✓ test_transform_many_nondeterministic passed")
+
+
+@register_transform('test_suffix')
+def add_suffix(token, context, suffix='_x'):
+    """Registered transform with a parameter (module-level, so picklable)"""
+    return token.with_value(token.value + suffix)
+
+
+def test_rule_specs():
+    """Test that spec-built transformers match the factory-built ones"""
+    import pickle
+    
+    specs = [KEYWORD_WRAP_SPEC, SPACE_REPLACE_SPEC, VALUE_ENCODE_SPEC, CASE_ALTERNATE_SPEC]
+    factories = [create_keyword_wrap_rule, create_space_replace_rule, create_value_encode_rule, create_case_alternate_rule]
+    
+    from_factories = SQLTransformer()
+    for factory in factories:
+        from_factories.add_rule(factory())
+    
+    # Specs and whole spec-built rules survive pickling
+    from_specs = SQLTransformer.from_specs(pickle.loads(pickle.dumps(specs)))
+    rule = pickle.loads(pickle.dumps(from_specs.rules[0]))
+    assert rule.spec == KEYWORD_WRAP_SPEC
+    assert from_specs.specs() == specs
+    
+    for query in CONFORMANCE_CORPUS:
+        assert from_specs.transform(query) == from_factories.transform(query), f"Mismatch for {query!r}"
+    
+    print("✓ test_rule_specs passed")
+
+
+def test_rule_spec_params():
+    """Test registered transforms with parameters, and unknown IDs"""
+    spec = RuleSpec(
+        name="suffix",
+        transform_id="test_suffix",
+        target_types=(TokenType.IDENTIFIER,),
+        params={'suffix': '_t'}
+    )
+    transformer = SQLTransformer.from_specs([spec])
+    assert transformer.transform("SELECT name FROM users") == "SELECT name_t FROM users_t"
+    
+    # Specs are hashable; dict params are stored as sorted pairs
+    assert spec.params == (('suffix', '_t'),)
+    assert spec == RuleSpec("suffix", "test_suffix", (TokenType.IDENTIFIER,), params=(('suffix', '_t'),))
+    assert hash(spec) == hash(RuleSpec("suffix", "test_suffix", (TokenType.IDENTIFIER,), params={'suffix': '_t'}))
+    assert len({KEYWORD_WRAP_SPEC, KEYWORD_WRAP_SPEC, spec}) == 2
+    
+    # List filters are stored as tuples
+    listed = RuleSpec(
+        "kw", "keyword_wrap", [TokenType.KEYWORD],
+        skip_types=[TokenType.STRING_LITERAL], allowed_clauses=[ClauseType.WHERE]
+    )
+    assert listed.target_types == (TokenType.KEYWORD,)
+    assert hash(listed) == hash(RuleSpec(
+        "kw", "keyword_wrap", (TokenType.KEYWORD,),
+        skip_types=(TokenType.STRING_LITERAL,), allowed_clauses=(ClauseType.WHERE,)
+    ))
+    assert SQLTransformer.from_specs([listed]).transform("SELECT 1 WHERE a") == "SELECT 1 /*!50000WHERE*/ a"
+    
+    try:
+        TransformationRule.from_spec(RuleSpec(name="bad", transform_id="no_such_transform", target_types=()))
+        assert False, "Should have raised ValueError"
+    except ValueError:
+        pass
+    
+    # Closure rules have no spec
+    closure = SQLTransformer()
+    closure.add_rule(TransformationRule("closure", lambda token, context: token, [TokenType.KEYWORD]))
+    try:
+        closure.specs()
+        assert False, "Should have raised ValueError"
+    except ValueError:
+        pass
+    
+    print("✓ test_rule_spec_params passed")
+
+
+def test_rule_type_filters():
+    """Test that rule filters are frozensets with a precomputed eligible set"""
+    import pickle
+    rule = create_value_encode_rule()
+    assert rule.target_types == frozenset([TokenType.OPERATOR])
+    assert rule.skip_types == frozenset([TokenType.STRING_LITERAL, TokenType.COMMENT])
+    assert rule.allowed_clauses == frozenset([ClauseType.WHERE, ClauseType.HAVING])
+    
+    overlapping = TransformationRule(
+        "overlapping", lambda token, context: token,
+        [TokenType.KEYWORD, TokenType.COMMENT], allowed_clauses=[]
+    )
+    assert overlapping.eligible_types == frozenset([TokenType.KEYWORD])
+    assert overlapping.allowed_clauses is None
+    assert list(SQLTransformer.from_specs([]).compile()) == []
+    
+    # Identity hashing survives pickling (members are singletons)
+    lookup = {TokenType.KEYWORD: 1, ClauseType.WHERE: 2}
+    assert lookup[pickle.loads(pickle.dumps(TokenType.KEYWORD))] == 1
+    assert lookup[pickle.loads(pickle.dumps(ClauseType.WHERE))] == 2
+    print("✓ test_rule_type_filters passed")
+
+
+def test_pure_rule_memo():
+    """Test that pure rules are memoized per value without changing output"""
+    specs = [KEYWORD_WRAP_SPEC, SPACE_REPLACE_SPEC, VALUE_ENCODE_SPEC, CASE_ALTERNATE_SPEC]
+    memoized = SQLTransformer.from_specs(specs)
+    plain = SQLTransformer()
+    for spec in specs:
+        rule = TransformationRule.from_spec(spec)
+        rule.pure = False
+        plain.add_rule(rule)
+    
+    for _ in range(2):  # Second round is served from the memos
+        for query in CONFORMANCE_CORPUS:
+            assert memoized.transform(query) == plain.transform(query), f"Memo changed {query!r}"
+    assert plain.memo_sizes() == {}
+    assert memoized.memo_sizes()['keyword_wrap'] > 0
+    
+    # Results that change the token type are returned but not remembered
+    calls = []
+    def to_identifier(token, context):
+        calls.append(token.value)
+        return Token(token.id, TokenType.IDENTIFIER, token.value.lower(), token.position, token.line, token.column)
+    
+    transformer = SQLTransformer()
+    transformer.add_rule(TransformationRule("to_identifier", to_identifier, [TokenType.KEYWORD], pure=True))
+    assert transformer.transform("SELECT SELECT") == "select select"
+    assert calls[-2:] == ["SELECT", "SELECT"] and transformer.memo_sizes() == {'to_identifier': 0}
+    assert transformer.chain_tables() == {TokenType.KEYWORD: {}}
+    
+    # Nondeterministic rules are never memoized
+    transformer = SQLTransformer()
+    transformer.add_rule(TransformationRule(
+        "random", to_identifier, [TokenType.KEYWORD], pure=True, deterministic=False
+    ))
+    transformer.compile()
+    assert transformer.memo_sizes() == {}
+    
+    # The memo is bounded
+    memo = ValueMemo(2)
+    memo.remember("a", "A")
+    memo.remember("b", "B")
+    memo.remember("c", "C")
+    assert dict(memo) == {"c": "C"}
+    print("✓ test_pure_rule_memo passed")
+
+
+def test_map_deduplicated():
+    """Test the batch helper behind the scripts' tamper_many()"""
+    calls = []
+    def tamper(payload, suffix=""):
+        calls.append(payload)
+        return payload + suffix
+    
+    results = map_deduplicated(tamper, ["a", "b", "a"], {"suffix": "!"})
+    assert calls == []  # Lazy
+    assert list(results) == ["a!", "b!", "a!"]
+    assert calls == ["a", "b"]
+    assert SQLTransformer.BATCH_DEDUPE_SIZE == BATCH_DEDUPE_SIZE
+    print("✓ test_map_deduplicated passed")
+
+
+def test_chain_tables():
+    """Test that chains of pure rules are tabled per token type"""
+    specs = [KEYWORD_WRAP_SPEC, SPACE_REPLACE_SPEC, VALUE_ENCODE_SPEC, CASE_ALTERNATE_SPEC]
+    transformer = SQLTransformer.from_specs(specs)
+    
+    # value_encode depends on the clause: operators are not tabled
+    tables = transformer.chain_tables()
+    assert set(tables) == {TokenType.KEYWORD, TokenType.WHITESPACE}
+    
+    # Every lexer keyword is precomputed through the whole keyword chain
+    keywords = tables[TokenType.KEYWORD]
+    assert len(keywords) == 2 * len(SQLLexer.KEYWORDS)
+    assert keywords['SELECT'] == transform_sequential(transformer, 'SELECT')
+    assert keywords['union'] == transform_sequential(transformer, 'union')
+    assert tables[TokenType.WHITESPACE] == {}
+    
+    # Other case variants and whitespace are added on first sight
+    query = "SeLeCt a\tFROM t WHERE b>=1"
+    assert transformer.transform(query) == transform_sequential(transformer, query)
+    tables = transformer.chain_tables()
+    assert 'SeLeCt' in tables[TokenType.KEYWORD]
+    assert tables[TokenType.WHITESPACE] == {' ': '/**/', '\t': '\t'}
+    
+    # A clause-limited rule in the chain disables its table
+    transformer.add_rule(TransformationRule(
+        "where_keywords", lambda token, context: token, [TokenType.KEYWORD],
+        allowed_clauses=[ClauseType.WHERE], pure=True
+    ))
+    transformer.compile()
+    assert TokenType.KEYWORD not in transformer.chain_tables()
+    
+    # The tables are in place before the compiled pipeline is published
+    class CheckedTransformer(SQLTransformer):
+        def _build_chain_tables(self, dispatch):
+            assert self._dispatch is None
+            return super()._build_chain_tables(dispatch)
+    
+    checked = CheckedTransformer.from_specs(specs)
+    assert checked.transform(query) == transformer.transform(query)
+    print("✓ test_chain_tables passed")
+
+
+def test_chain_tables_type_round_trip():
+    """Test that chains leaving their token type and coming back are not tabled"""
+    def and_to_identifier(token, context):
+        if token.value != 'AND':
+            return token
+        return Token(token.id, TokenType.IDENTIFIER, token.value, token.position, token.line, token.column)
+    
+    def tag_with_clause(token, context):
+        if token.value != 'AND':
+            return token
+        return Token(
+            token.id, TokenType.KEYWORD, f"{token.value}_{context.clause.name}",
+            token.position, token.line, token.column
+        )
+    
+    transformer = SQLTransformer()
+    transformer.add_rule(TransformationRule("a", and_to_identifier, [TokenType.KEYWORD], pure=True))
+    transformer.add_rule(TransformationRule("b", tag_with_clause, [TokenType.IDENTIFIER]))
+    
+    query = "SELECT a FROM t WHERE x=1 AND y=2"
+    expected = "SELECT a FROM t WHERE x=1 AND_WHERE y=2"
+    assert transform_sequential(transformer, query) == expected
+    assert transformer.transform(query) == expected
+    assert transformer.transform(query) == expected
+    assert 'AND' not in transformer.chain_tables()[TokenType.KEYWORD]
+    print("✓ test_chain_tables_type_round_trip passed")
+
+
+def test_adaptive_mode():
+    """Test that adaptive mode drops unreachable clause rules without changing output"""
+    where_identifiers = TransformationRule(
+        "where_identifiers", lambda token, context: token.with_value(f"`{token.value}`"),
+        [TokenType.IDENTIFIER], allowed_clauses=[ClauseType.WHERE]
+    )
+    assert where_identifiers.clause_keywords() == ('WHERE',)
+    assert create_keyword_wrap_rule().clause_keywords() is None
+    assert create_value_encode_rule().clause_keywords() == ('WHERE', 'HAVING')
+    
+    specs = [KEYWORD_WRAP_SPEC, SPACE_REPLACE_SPEC, VALUE_ENCODE_SPEC, CASE_ALTERNATE_SPEC]
+    plain = SQLTransformer.from_specs(specs)
+    adaptive = SQLTransformer.from_specs(specs, adaptive=True)
+    adaptive.add_rule(where_identifiers)
+    plain.add_rule(where_identifiers)
+    
+    queries = CONFORMANCE_CORPUS + [
+        "SELECT a>=b FROM t",
+        "SELECT a FROM t wHeRe b<>1",
+        "SELECT a FROM (SELECT b FROM t WHERE c=1) x",
+        "SELECT 'WHERE' FROM t",    # Keyword text in a string: rule kept, still no-op
+        "SELECT a FROM WHEREVER",   # Substring match: rule kept, still no-op
+        "SELECT a FROM t HAVİNG b=1",
+    ]
+    for query in queries:
+        assert adaptive.transform(query) == plain.transform(query), f"Adaptive mode differs on {query!r}"
+    
+    # Payloads without WHERE/HAVING ran without value_encode/where_identifiers
+    assert list(adaptive._filtered_dispatch) == [(2, 4)]
+    print("✓ test_adaptive_mode passed")
+
+
 def run_all_tests():
     """Run all transformer tests"""
     print("\n" + "=" * 70)
@@ -206,6 +717,24 @@ def run_all_tests():
         test_context_awareness,
         test_deterministic_output,
         test_no_reapplication,
+        test_compiled_pipeline_matches_sequential,
+        test_compiled_pipeline_type_change,
+        test_rules_hold_no_per_call_state,
+        test_lru_cache,
+        test_result_cache,
+        test_result_cache_bypassed_for_nondeterministic_rules,
+        test_token_cache_shared,
+        test_transform_without_token_cache,
+        test_transform_many,
+        test_transform_many_nondeterministic,
+        test_rule_specs,
+        test_rule_spec_params,
+        test_rule_type_filters,
+        test_pure_rule_memo,
+        test_map_deduplicated,
+        test_chain_tables,
+        test_chain_tables_type_round_trip,
+        test_adaptive_mode,
     ]
     
     passed = 0